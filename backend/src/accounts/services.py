@@ -7,11 +7,18 @@ from typing import Any
 
 import requests
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
+from accounts.zoom_client import get_client, token_cache
+
 logger = logging.getLogger(__name__)
 
 
+class ZoomApiError(Exception):
+    """A Zoom API call failed where no result dict can be returned (e.g. mid-iteration)."""
+
+
 class ZoomService:
     """
     Service for Zoom OAuth integration.
@@ -26,6 +33,17 @@ class ZoomService:
     BASE_URL = 'https://zoom.us/oauth'
     API_URL = 'https://api.zoom.us/v2'
 
+    # Copied back onto the caller's instance after a refresh under the row lock
+    CONNECTION_TOKEN_FIELDS = (
+        'access_token',
+        'refresh_token',
+        'token_expires_at',
+        'is_active',
+        'error_count',
+        'last_error',
+        'last_error_at',
+    )
+
     @property
     def client_id(self) -> str | None:
         return getattr(settings, 'ZOOM_CLIENT_ID', None)
@@ -118,7 +136,7 @@ class ZoomService:
                 'redirect_uri': self.redirect_uri,
             }
 
-            response = requests.post(token_url, auth=auth, data=data, timeout=30)
+            response = get_client().request('POST', token_url, auth=auth, data=data)
 
             if response.status_code != 200:
                 logger.error(f"Zoom token exchange failed: {response.text}")
@@ -147,6 +165,7 @@ class ZoomService:
                     'last_error': '',
                 },
             )
+            token_cache.set(connection)
 
             return {'success': True, 'connection': connection, 'created': created}
 
@@ -157,19 +176,52 @@ class ZoomService:
             logger.error(f"Zoom OAuth failed: {e}")
             return {'success': False, 'error': str(e)}
 
-    def refresh_tokens(self, connection) -> bool:
+    def refresh_tokens(self, connection, stale_token: str | None = None) -> bool:
         """
-        Refresh expired tokens.
+        Refresh the connection's tokens, once across concurrent workers.
+
+        The refresh runs under a per-connection lock in this process and a
+        row lock (select_for_update) across processes. A caller that gets the
+        lock after another worker refreshed finds a new, unexpired token and
+        reuses it. It does not refresh again, which would invalidate the
+        refresh token the other worker just stored.
 
         Args:
-            connection: ZoomConnection to refresh
+            connection: ZoomConnection to refresh (updated in place)
+            stale_token: The access token that needs replacing (defaults to
+                connection.access_token), e.g. one Zoom just rejected with 401
 
         Returns:
             True if successful
         """
+        from accounts.models import ZoomConnection
+
         if not self.is_configured:
             return False
 
+        stale_token = stale_token or connection.access_token
+        with token_cache.lock(connection.pk):
+            try:
+                with transaction.atomic():
+                    locked = ZoomConnection.objects.select_for_update().get(pk=connection.pk)
+                    if locked.access_token != stale_token and not locked.needs_refresh:
+                        refreshed = True  # Another worker already refreshed
+                    else:
+                        refreshed = self._request_token_refresh(locked)
+            except ZoomConnection.DoesNotExist:
+                token_cache.invalidate(connection.pk)
+                return False
+
+            for field in self.CONNECTION_TOKEN_FIELDS:
+                setattr(connection, field, getattr(locked, field))
+            if refreshed:
+                token_cache.set(connection)
+            else:
+                token_cache.invalidate(connection.pk)
+            return refreshed
+
+    def _request_token_refresh(self, connection) -> bool:
+        """Exchange the connection's refresh token for new tokens (caller holds the row lock)."""
         try:
             token_url = f"{self.BASE_URL}/token"
 
@@ -179,7 +231,7 @@ class ZoomService:
                 'refresh_token': connection.refresh_token,
             }
 
-            response = requests.post(token_url, auth=auth, data=data, timeout=30)
+            response = get_client().request('POST', token_url, auth=auth, data=data)
 
             if response.status_code != 200:
                 logger.error(f"Zoom token refresh failed: {response.text}")
@@ -224,6 +276,7 @@ class ZoomService:
                     pass  # Continue even if revoke fails
 
             connection.disconnect()
+            token_cache.invalidate(connection.pk)
             return True
 
         except ZoomConnection.DoesNotExist:
@@ -235,7 +288,9 @@ class ZoomService:
     def _get_zoom_user_info(self, access_token: str) -> dict | None:
         """Get Zoom user info."""
         try:
-            response = requests.get(f"{self.API_URL}/users/me", headers={'Authorization': f'Bearer {access_token}'}, timeout=30)
+            response = get_client().request(
+                'GET', f"{self.API_URL}/users/me", headers={'Authorization': f'Bearer {access_token}'}
+            )
 
             if response.status_code == 200:
                 return response.json()
@@ -250,8 +305,8 @@ class ZoomService:
     def _revoke_token(self, access_token: str):
         """Revoke OAuth token at Zoom."""
         try:
-            requests.post(
-                f"{self.BASE_URL}/revoke", auth=(self.client_id, self.client_secret), data={'token': access_token}, timeout=30
+            get_client().request(
+                'POST', f"{self.BASE_URL}/revoke", auth=(self.client_id, self.client_secret), data={'token': access_token}
             )
         except Exception as e:
             logger.error(f"Token revoke failed: {e}")
@@ -260,6 +315,9 @@ class ZoomService:
         """
         Get valid access token, refreshing if needed.
 
+        Served from token_cache until shortly before expiry; then one caller
+        refreshes (see refresh_tokens) and the rest reuse its token.
+
         Args:
             connection: ZoomConnection
 
@@ -269,7 +327,11 @@ class ZoomService:
         if not connection.is_active:
             return None
 
-        if connection.needs_refresh and not self.refresh_tokens(connection):
+        access_token = token_cache.get(connection)
+        if access_token:
+            return access_token
+
+        if not self.refresh_tokens(connection):
             return None
 
         connection.record_usage()
@@ -601,6 +663,9 @@ class ZoomService:
     def _make_zoom_request(self, method: str, path: str, connection, payload: dict[str, Any] | None = None, params: dict[str, Any] | None = None, retry_on_401: bool = True) -> dict[str, Any]:
         """
         Make an authenticated request to Zoom API with automatic 401 retry.
+
+        Goes through the connection's pooled client, which throttles to the
+        account's rate limit and backs off on 429 (see accounts.zoom_client).
         """
         access_token = self.get_access_token(connection)
         if not access_token:
@@ -613,16 +678,13 @@ class ZoomService:
         url = f"{self.API_URL}/{path.lstrip('/')}"
 
         try:
-            if method.upper() == 'POST':
-                response = requests.post(url, headers=headers, json=payload, params=params, timeout=30)
-            elif method.upper() == 'GET':
-                response = requests.get(url, headers=headers, params=params, timeout=30)
-            else:
+            if method.upper() not in ('POST', 'GET'):
                 return {'success': False, 'error': f'Unsupported method: {method}'}
+            response = get_client(connection).request(method.upper(), url, headers=headers, json=payload, params=params)
 
             if response.status_code == 401 and retry_on_401:
                 logger.warning("Zoom API returned 401. Forcing token refresh and retrying.")
-                if self.refresh_tokens(connection):
+                if self.refresh_tokens(connection, stale_token=access_token):
                     return self._make_zoom_request(method, path, connection, payload, params=params, retry_on_401=False)
 
             is_success = response.status_code in [200, 201]
@@ -675,10 +737,6 @@ class ZoomService:
                 return {'success': False, 'error': 'Event has no Zoom meeting'}
 
             connection = ZoomConnection.objects.get(user=event.owner, is_active=True)
-            access_token = self.get_access_token(connection)
-
-            if not access_token:
-                return {'success': False, 'error': 'Could not get Zoom access token'}
 
             payload = {
                 'email': email,
@@ -687,20 +745,16 @@ class ZoomService:
                 'auto_approve': True,
             }
 
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json',
-            }
-
-            response = requests.post(
-                f"{self.API_URL}/meetings/{event.zoom_meeting_id}/registrants", headers=headers, json=payload, timeout=30
-            )
+            # Rate-limited client: a burst of registrants waits for quota instead of failing
+            result = self._make_zoom_request('POST', f"meetings/{event.zoom_meeting_id}/registrants", connection, payload)
 
-            if response.status_code not in [201, 200]:
-                logger.error(f"Zoom add registrant failed: {response.status_code} - {response.text}")
-                return {'success': False, 'error': f"Zoom API error: {response.status_code}"}
+            if not result['success']:
+                if 'status_code' not in result:
+                    return {'success': False, 'error': result.get('error', 'Could not get Zoom access token')}
+                logger.error(f"Zoom add registrant failed: {result['status_code']} - {result['text']}")
+                return {'success': False, 'error': f"Zoom API error: {result['status_code']}"}
 
-            data = response.json()
+            data = result['data']
             connection.record_usage()
 
             logger.info(f"Added registrant {email} to Zoom meeting {event.zoom_meeting_id}")
@@ -717,10 +771,142 @@ class ZoomService:
             logger.error(f"Add meeting registrant failed: {e}")
             return {'success': False, 'error': str(e)}
 
-    def get_past_meeting_participants(self, user, meeting_id: str) -> dict[str, Any]:
+    def sync_meeting_registrants(self, event) -> dict[str, Any]:
+        """
+        Add every confirmed registration that has no Zoom registrant to the event's meeting.
+
+        Diffs confirmed registrations against zoom_registrant_id and submits the
+        rest through Zoom's batch registrants API, ZoomRegistrantSync.BATCH_SIZE
+        at a time. A batch Zoom rejects as a whole (e.g. one invalid email) is
+        resubmitted one registrant at a time, so failures are per registration.
+        Join URLs and errors are written back with bulk_update after each batch,
+        so a re-run only submits what is still missing.
+
+        Args:
+            event: Event instance with zoom_meeting_id
+
+        Returns:
+            {
+                'success': bool,
+                'added': int,
+                'failed': {registration_id: error},
+                'remaining': int (registrations not submitted because the sync stopped early),
+                'error': str (if the sync stopped early)
+            }
+        """
+        from accounts.models import ZoomConnection
+        from common.config import ZoomRegistrantSync
+        from registrations.models import Registration
+
+        summary = {'success': True, 'added': 0, 'failed': {}, 'remaining': 0}
+
+        if not event.zoom_meeting_id:
+            return {**summary, 'success': False, 'error': 'Event has no Zoom meeting'}
+        try:
+            connection = ZoomConnection.objects.get(user=event.owner, is_active=True)
+        except ZoomConnection.DoesNotExist:
+            return {**summary, 'success': False, 'error': 'No Zoom connection for event owner'}
+
+        pending = list(
+            Registration.objects.filter(
+                event=event, status=Registration.Status.CONFIRMED, zoom_registrant_id=''
+            ).order_by('pk')
+        )
+
+        batch_size = ZoomRegistrantSync.BATCH_SIZE
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            results, error = self._submit_registrant_batch(event, connection, batch)
+
+            now = timezone.now()
+            for registration in batch:
+                registration.zoom_add_attempt_count += 1
+                registration.updated_at = now
+                registrant = results.get(registration.id)
+                if isinstance(registrant, dict):
+                    registration.zoom_registrant_id = registrant['registrant_id']
+                    registration.zoom_registrant_join_url = registrant['join_url']
+                    registration.zoom_add_error = ''
+                    summary['added'] += 1
+                else:
+                    registration.zoom_add_error = registrant or error or 'Not returned by Zoom'
+                    summary['failed'][registration.id] = registration.zoom_add_error
+            Registration.objects.bulk_update(
+                batch,
+                ['zoom_registrant_id', 'zoom_registrant_join_url', 'zoom_add_attempt_count', 'zoom_add_error', 'updated_at'],
+            )
+
+            if error:
+                # Rate limited past what the client waits for, or no usable token
+                summary['remaining'] = len(pending) - start - len(batch)
+                summary.update(success=False, error=error)
+                break
+
+        if summary['added']:
+            connection.record_usage()
+        logger.info(
+            f"Synced Zoom registrants for meeting {event.zoom_meeting_id}: "
+            f"{summary['added']} added, {len(summary['failed'])} failed, {summary['remaining']} remaining"
+        )
+        return summary
+
+    def _submit_registrant_batch(self, event, connection, batch) -> tuple[dict, str | None]:
+        """
+        Submit one batch of registrations to Zoom.
+
+        Returns:
+            ({registration_id: {'registrant_id', 'join_url'} or error}, error that stops the sync)
+        """
+        payload = {
+            'auto_approve': True,
+            'registrants_confirmation_email': False,  # We handle emails ourselves
+            'registrants': [_registrant_payload(registration) for registration in batch],
+        }
+        result = self._make_zoom_request('POST', f"meetings/{event.zoom_meeting_id}/batch_registrants", connection, payload)
+
+        if result['success']:
+            by_email = {
+                (registrant.get('email') or '').lower(): registrant
+                for registrant in result['data'].get('registrants', [])
+            }
+            results = {}
+            for registration in batch:
+                registrant = by_email.get(registration.email)
+                if registrant and registrant.get('registrant_id'):
+                    results[registration.id] = {
+                        'registrant_id': registrant['registrant_id'],
+                        'join_url': registrant.get('join_url', ''),
+                    }
+            return results, None
+
+        if 'status_code' not in result or result['status_code'] in (401, 429):
+            return {}, result.get('error') or f"Zoom API error: {result.get('status_code')}"
+
+        # Rejected as a whole: find out which registrants Zoom objects to
+        logger.warning(f"Zoom batch registrants failed ({result['status_code']}), submitting {len(batch)} individually")
+        results = {}
+        for registration in batch:
+            single = self._make_zoom_request(
+                'POST', f"meetings/{event.zoom_meeting_id}/registrants", connection, _registrant_payload(registration)
+            )
+            if single['success']:
+                results[registration.id] = {
+                    'registrant_id': single['data'].get('id', ''),
+                    'join_url': single['data'].get('join_url', ''),
+                }
+            elif 'status_code' not in single or single['status_code'] in (401, 429):
+                return results, single.get('error') or f"Zoom API error: {single.get('status_code')}"
+            else:
+                results[registration.id] = single.get('error') or f"Zoom API error: {single['status_code']}"
+        return results, None
+
+    def get_past_meeting_participants(self, user, meeting_id: str, next_page_token: str = '') -> dict[str, Any]:
         """
         Get participants for a past meeting using the Reports API.
 
+        Returns one page (up to 300); pass data['next_page_token'] back for
+        the next, or use iter_past_meeting_participants().
+
         Requires scope: report:read:list_meeting_participants:admin
         (or classic scope: report:read:admin)
         """
@@ -731,7 +917,10 @@ class ZoomService:
 
             # Use report/meetings endpoint - works for all account types with proper scope
             path = f"report/meetings/{meeting_id}/participants"
-            result = self._make_zoom_request('GET', path, connection, params={'page_size': 300})
+            params = {'page_size': 300}
+            if next_page_token:
+                params['next_page_token'] = next_page_token
+            result = self._make_zoom_request('GET', path, connection, params=params)
 
             return result
 
@@ -741,6 +930,35 @@ class ZoomService:
             logger.error(f"Get meeting participants failed: {e}")
             return {'success': False, 'error': str(e)}
 
+    def iter_past_meeting_participants(self, user, meeting_id: str):
+        """
+        Yield every participant in a past meeting's report, one page in memory at a time.
+
+        Raises:
+            ZoomApiError: If a page can't be fetched
+        """
+        next_page_token = ''
+        while True:
+            result = self.get_past_meeting_participants(user, meeting_id, next_page_token=next_page_token)
+            if not result['success']:
+                raise ZoomApiError(result.get('error') or f"Zoom API error: {result.get('status_code')}")
+
+            yield from result['data'].get('participants', [])
+
+            next_page_token = result['data'].get('next_page_token', '')
+            if not next_page_token:
+                return
+
+
+def _registrant_payload(registration) -> dict[str, str]:
+    """Zoom registrant fields for a registration."""
+    name_parts = registration.full_name.split(' ', 1)
+    return {
+        'email': registration.email,
+        'first_name': name_parts[0] or 'Guest',
+        'last_name': name_parts[1] if len(name_parts) > 1 else '',
+    }
+
 
 # Singleton instance
 zoom_service = ZoomService()
@@ -25,11 +25,11 @@ class TestZoomService:
             is_active=True,
         )
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_create_meeting_success(self, mock_post, zoom_connection, completed_event, user):
         """Test successful meeting creation."""
         # Setup mocks
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.status_code = 201
         mock_response.json.return_value = {
             'id': 123456789,
@@ -73,10 +73,10 @@ class TestZoomService:
         assert result['success'] is False
         assert 'User does not have connected Zoom account' in result['error']
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_create_meeting_api_error(self, mock_post, zoom_connection, completed_event, user):
         """Test handling of Zoom API errors."""
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.status_code = 400
         mock_response.text = 'Bad Request'
         mock_response.json.return_value = {'message': 'Invalid duration'}
@@ -90,10 +90,10 @@ class TestZoomService:
         assert result['success'] is False
         assert 'Zoom: Invalid duration' in result['error']
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_refresh_tokens_success(self, mock_post, zoom_connection):
         """Test successful token refresh."""
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.status_code = 200
         mock_response.json.return_value = {
             'access_token': 'new_access_token',
@@ -114,10 +114,10 @@ class TestZoomService:
         assert zoom_connection.access_token == 'new_access_token'
         assert zoom_connection.refresh_token == 'new_refresh_token'
 
-    @patch('requests.post')
+    @patch('requests.Session.request')
     def test_refresh_tokens_failure(self, mock_post, zoom_connection):
         """Test handling of token refresh failure."""
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.status_code = 400
         mock_response.text = 'Invalid Grant'
         mock_post.return_value = mock_response
@@ -128,10 +128,47 @@ class TestZoomService:
         zoom_connection.refresh_from_db()
         assert 'Token refresh failed' in zoom_connection.last_error
 
-    @patch('requests.post')
+    def test_access_token_served_from_cache(self, zoom_connection, django_assert_num_queries):
+        """A token that isn't near expiry costs no queries or refreshes."""
+        with django_assert_num_queries(0):
+            assert zoom_service.get_access_token(zoom_connection) == 'test_access_token'
+
+    @patch('requests.Session.request')
+    def test_expiring_token_reuses_concurrent_refresh(self, mock_request, zoom_connection):
+        """A worker holding an expiring token picks up the one another worker refreshed, without calling Zoom."""
+        from accounts.models import ZoomConnection
+
+        ZoomConnection.objects.filter(pk=zoom_connection.pk).update(
+            access_token='refreshed_elsewhere', token_expires_at=timezone.now() + timezone.timedelta(hours=1)
+        )
+        zoom_connection.token_expires_at = timezone.now() + timezone.timedelta(minutes=1)
+
+        assert zoom_service.get_access_token(zoom_connection) == 'refreshed_elsewhere'
+        assert zoom_connection.access_token == 'refreshed_elsewhere'
+        mock_request.assert_not_called()
+
+    @patch('requests.Session.request')
+    def test_rejected_token_is_refreshed(self, mock_request, zoom_connection):
+        """A 401 forces a refresh even before expiry, and the new token replaces the cached one."""
+        mock_response = MagicMock(headers={})
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'access_token': 'new_access_token',
+            'refresh_token': 'new_refresh_token',
+            'expires_in': 3600,
+        }
+        mock_request.return_value = mock_response
+        assert zoom_service.get_access_token(zoom_connection) == 'test_access_token'
+
+        assert zoom_service.refresh_tokens(zoom_connection, stale_token='test_access_token') is True
+
+        mock_request.assert_called_once()
+        assert zoom_service.get_access_token(zoom_connection) == 'new_access_token'
+
+    @patch('requests.Session.request')
     def test_add_registrant_success(self, mock_post, zoom_connection, completed_event, user):
         """Test successful registrant addition."""
-        mock_response = MagicMock()
+        mock_response = MagicMock(headers={})
         mock_response.status_code = 201
         mock_response.json.return_value = {
             'id': 'reg-123',
@@ -155,3 +192,157 @@ class TestZoomService:
         args, kwargs = mock_post.call_args
         assert kwargs['json']['email'] == 'attendee@example.com'
         assert kwargs['json']['first_name'] == 'John'
+
+
+    @patch('requests.Session.request')
+    def test_sync_registrants_submits_missing_in_one_batch(self, mock_request, zoom_connection, completed_event, user):
+        """Only confirmed registrations without a registrant are sent, and join URLs are written back."""
+        from factories import RegistrationFactory
+
+        completed_event.owner = user
+        completed_event.zoom_meeting_id = '123456789'
+        completed_event.save()
+        first = RegistrationFactory(event=completed_event, guest=True, email='ada@example.com', full_name='Ada Lovelace')
+        second = RegistrationFactory(event=completed_event, guest=True, email='alan@example.com', full_name='Alan')
+        RegistrationFactory(event=completed_event, guest=True, zoom_registrant_id='existing')
+        RegistrationFactory(event=completed_event, guest=True, cancelled=True)
+
+        mock_response = MagicMock(headers={})
+        mock_response.status_code = 201
+        mock_response.json.return_value = {
+            'registrants': [
+                {'email': 'ada@example.com', 'registrant_id': 'r1', 'join_url': 'https://zoom.us/w/1?tk=a'},
+                {'email': 'Alan@example.com', 'registrant_id': 'r2', 'join_url': 'https://zoom.us/w/1?tk=b'},
+            ]
+        }
+        mock_request.return_value = mock_response
+
+        result = zoom_service.sync_meeting_registrants(completed_event)
+
+        assert result == {'success': True, 'added': 2, 'failed': {}, 'remaining': 0}
+        mock_request.assert_called_once()
+        args, kwargs = mock_request.call_args
+        assert args[1].endswith('meetings/123456789/batch_registrants')
+        assert kwargs['json']['registrants'] == [
+            {'email': 'ada@example.com', 'first_name': 'Ada', 'last_name': 'Lovelace'},
+            {'email': 'alan@example.com', 'first_name': 'Alan', 'last_name': ''},
+        ]
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert (first.zoom_registrant_id, first.zoom_registrant_join_url) == ('r1', 'https://zoom.us/w/1?tk=a')
+        assert second.zoom_registrant_id == 'r2'
+        assert second.zoom_add_attempt_count == 1
+
+    @patch('requests.Session.request')
+    def test_sync_registrants_reports_failures_per_registration(self, mock_request, zoom_connection, completed_event, user):
+        """A batch Zoom rejects is retried one by one, so only the bad registrant fails."""
+        from factories import RegistrationFactory
+
+        completed_event.owner = user
+        completed_event.zoom_meeting_id = '123456789'
+        completed_event.save()
+        good = RegistrationFactory(event=completed_event, guest=True, email='good@example.com')
+        bad = RegistrationFactory(event=completed_event, guest=True, email='bad@example.com')
+
+        def respond(status, body):
+            response = MagicMock(headers={}, status_code=status, text=str(body))
+            response.json.return_value = body
+            return response
+
+        mock_request.side_effect = [
+            respond(400, {'message': 'Invalid email'}),
+            respond(201, {'id': 'r1', 'join_url': 'https://zoom.us/w/1?tk=a'}),
+            respond(400, {'message': 'Invalid email'}),
+        ]
+
+        result = zoom_service.sync_meeting_registrants(completed_event)
+
+        assert result['added'] == 1
+        assert result['failed'] == {bad.id: 'Invalid email'}
+        good.refresh_from_db()
+        bad.refresh_from_db()
+        assert good.zoom_registrant_id == 'r1'
+        assert bad.zoom_registrant_id == ''
+        assert bad.zoom_add_error == 'Invalid email'
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+class TestZoomClient:
+    """Tests for the pooled, rate-limited Zoom HTTP client."""
+
+    def _response(self, status_code, headers=None):
+        return MagicMock(status_code=status_code, headers=headers or {})
+
+    @patch('requests.Session.request')
+    def test_retries_after_429(self, mock_request):
+        from accounts.zoom_client import ZoomClient
+
+        clock = FakeClock()
+        mock_request.side_effect = [self._response(429, {'Retry-After': '2'}), self._response(201)]
+
+        with patch('accounts.zoom_client.time', clock):
+            response = ZoomClient().request('POST', 'https://api.zoom.us/v2/meetings/1/registrants', json={})
+
+        assert response.status_code == 201
+        assert mock_request.call_count == 2
+        # The retry waited out Retry-After
+        assert clock.slept >= 2
+
+    @patch('requests.Session.request')
+    def test_daily_limit_is_returned(self, mock_request):
+        from accounts.zoom_client import ZoomClient
+
+        clock = FakeClock()
+        tomorrow = (timezone.now() + timezone.timedelta(days=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        mock_request.return_value = self._response(429, {'Retry-After': tomorrow})
+
+        with patch('accounts.zoom_client.time', clock):
+            response = ZoomClient().request('GET', 'https://api.zoom.us/v2/users/me')
+
+        assert response.status_code == 429
+        assert mock_request.call_count == 1
+        assert clock.slept == 0
+
+    def test_bucket_throttles_to_rate(self):
+        from accounts.zoom_client import TokenBucket
+
+        clock = FakeClock()
+        with patch('accounts.zoom_client.time', clock):
+            bucket = TokenBucket(rate=5, burst=5)
+            for _ in range(15):
+                bucket.acquire()
+
+        # 5 immediately, then 10 more at 5 per second
+        assert clock.slept == pytest.approx(2.0)
+
+    def test_rate_limit_headers_retune_bucket(self):
+        from accounts.zoom_client import ZoomClient
+
+        client = ZoomClient()
+        client._observe(
+            self._response(200, {'X-RateLimit-Type': 'QPS', 'X-RateLimit-Limit': '2', 'X-RateLimit-Remaining': '0'})
+        )
+
+        assert client.bucket.rate == 2
+        assert client.bucket.capacity == 2
+        assert client.bucket._tokens < 1
+
+    def test_client_is_shared_per_account(self):
+        from accounts.zoom_client import get_client
+
+        first, second = MagicMock(zoom_account_id='acct-1'), MagicMock(zoom_account_id='acct-1')
+        assert get_client(first) is get_client(second)
+        assert get_client(first) is not get_client(MagicMock(zoom_account_id='acct-2'))
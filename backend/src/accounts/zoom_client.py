@@ -0,0 +1,256 @@
+"""
+Pooled, rate-limited HTTP client for the Zoom API.
+
+Zoom rate limits are per account, so there is one ZoomClient per Zoom
+account (ZoomConnection), shared by every thread in the process. Each
+client keeps a requests.Session with keep-alive connections and a token
+bucket that is retuned from Zoom's X-RateLimit-* response headers. A 429
+pauses the bucket for everyone using the account until Retry-After (or an
+exponential backoff) has passed, then the request is retried.
+
+Access tokens are cached per connection (token_cache), so requests don't
+reload or refresh them; ZoomService.refresh_tokens keeps it current.
+
+Usage:
+    from accounts.zoom_client import get_client
+
+    response = get_client(connection).request('POST', url, headers=headers, json=payload)
+"""
+
+import email.utils
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.config import ZoomApiClient, ZoomConfig
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill at `rate` per second up to `burst` (or the rate, if lower);
+    acquire() blocks until one is available. pause() empties the bucket
+    until a deadline.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.capacity = min(burst, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                # Tolerance, so float rounding after a refill sleep can't leave 0.999... tokens forever
+                if now >= self._paused_until and self._tokens >= 1 - 1e-9:
+                    self._tokens = max(self._tokens - 1, 0.0)
+                    return waited
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """Hold every caller for at least `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+    def update(self, rate: float | None = None, remaining: int | None = None):
+        """Retune from rate-limit headers: a new rate, and/or the requests Zoom says are left."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if rate:
+                self.rate = rate
+                self.capacity = min(self.burst, rate)
+                self._tokens = min(self._tokens, self.capacity)
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed (caller holds the lock)."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class ZoomClient:
+    """
+    HTTP client for one Zoom account: keep-alive pool, token bucket, 429 backoff.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=ZoomApiClient.POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.bucket = TokenBucket(rate=ZoomApiClient.RATE_PER_SECOND, burst=ZoomApiClient.BURST)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, waiting for the rate limiter and retrying on 429.
+
+        A 429 whose Retry-After is beyond ZoomApiClient.MAX_WAIT_SECONDS (a
+        daily limit) is returned as is, for the caller's own retry policy.
+        """
+        kwargs.setdefault('timeout', ZoomApiClient.TIMEOUT_SECONDS)
+        for attempt in range(ZoomApiClient.MAX_429_RETRIES + 1):
+            self.bucket.acquire()
+            response = self.session.request(method, url, **kwargs)
+            self._observe(response)
+            if response.status_code != 429 or attempt == ZoomApiClient.MAX_429_RETRIES:
+                return response
+
+            wait = retry_after_seconds(response.headers.get('Retry-After'))
+            if wait is None:
+                wait = 2**attempt
+            if wait > ZoomApiClient.MAX_WAIT_SECONDS:
+                logger.warning(f"Zoom rate limit for {method} {url}: retry after {wait:.0f}s, not waiting")
+                return response
+
+            logger.info(f"Zoom rate limit for {method} {url}: retrying in {wait:.1f}s")
+            self.bucket.pause(wait)
+        return response
+
+    def _observe(self, response: requests.Response):
+        """Feed X-RateLimit-* headers into the token bucket."""
+        headers = response.headers
+        rate = remaining = None
+        if headers.get('X-RateLimit-Type', '').upper().startswith('QPS'):
+            rate = _int(headers.get('X-RateLimit-Limit'))
+        if headers.get('X-RateLimit-Remaining') is not None:
+            remaining = _int(headers.get('X-RateLimit-Remaining'))
+        if rate or remaining is not None:
+            self.bucket.update(rate=rate, remaining=remaining)
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse Retry-After as seconds, an HTTP date, or an ISO timestamp (Zoom's daily limits)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            when = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max((when - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+def _int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# One client per Zoom account, LRU-bounded
+_clients: OrderedDict[str, ZoomClient] = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_client(connection=None) -> ZoomClient:
+    """
+    Return the shared client for a ZoomConnection's account.
+
+    Without a connection (OAuth endpoints), returns a client shared by all
+    unauthenticated calls.
+    """
+    key = ''
+    if connection is not None:
+        key = connection.zoom_account_id or f'connection:{connection.pk}'
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = ZoomClient()
+            while len(_clients) > ZoomApiClient.MAX_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(key)
+        return client
+
+
+class TokenCache:
+    """
+    Per-process cache of ZoomConnection access tokens, LRU-bounded.
+
+    An entry is served until TOKEN_REFRESH_BUFFER_MINUTES before it expires,
+    so refreshes happen ahead of expiry rather than on a 401. lock() gives
+    one lock per connection, letting threads that all find the token stale
+    wait for a single refresh.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[str, datetime]] = OrderedDict()
+        self._locks: dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, connection) -> str | None:
+        """Return a cached access token that isn't due for refresh, else None."""
+        buffer = timedelta(minutes=ZoomConfig.TOKEN_REFRESH_BUFFER_MINUTES)
+        with self._lock:
+            entry = self._entries.get(connection.pk)
+            # The instance may have been loaded after another process refreshed
+            if connection.access_token and (entry is None or connection.token_expires_at > entry[1]):
+                entry = (connection.access_token, connection.token_expires_at)
+                self._store(connection.pk, entry)
+            if entry is None or datetime.now(UTC) >= entry[1] - buffer:
+                return None
+            self._entries.move_to_end(connection.pk)
+            return entry[0]
+
+    def set(self, connection):
+        """Cache the connection's current access token."""
+        with self._lock:
+            self._store(connection.pk, (connection.access_token, connection.token_expires_at))
+
+    def invalidate(self, connection_pk: int):
+        with self._lock:
+            self._entries.pop(connection_pk, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def lock(self, connection_pk: int) -> threading.Lock:
+        """The lock serializing refreshes of one connection in this process."""
+        with self._lock:
+            return self._locks.setdefault(connection_pk, threading.Lock())
+
+    def _store(self, connection_pk: int, entry: tuple[str, datetime]):
+        """Insert an entry and evict the least recently used (caller holds the lock)."""
+        self._entries[connection_pk] = entry
+        self._entries.move_to_end(connection_pk)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._locks.pop(evicted, None)
+
+
+token_cache = TokenCache(max_entries=ZoomConfig.TOKEN_CACHE_MAX_ENTRIES)
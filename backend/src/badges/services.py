@@ -7,7 +7,7 @@ from io import BytesIO
 from typing import Any
 
 from django.utils import timezone
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 logger = logging.getLogger(__name__)
 
@@ -49,44 +49,15 @@ class BadgeService:
         Render badge as Image by overlaying text on the template.
         """
         try:
-            # Download template image
-            template_bytes = self._download_template_image(template)
-            if not template_bytes:
+            # Decoded template image (cached per template version)
+            base_img = self._load_template_image(template)
+            if base_img is None:
                 logger.error("Could not download template image")
                 return b''
 
-            # Open image
-            with Image.open(BytesIO(template_bytes)) as base_img:
-                # Convert to RGBA to ensure alpha channel support
-                img = base_img.convert("RGBA")
-                draw = ImageDraw.Draw(img)
-
-                # Get field positions
-                positions = template.field_positions or {}
-
-                # Draw text fields
-                for field_name, field_data in positions.items():
-                    # Check if field is enabled (defaults to True for backward compatibility)
-                    if field_data.get('enabled', True) is False:
-                        continue
-
-                    text = data.get(field_name, '')
-                    if not text:
-                        continue
-
-                    x = field_data.get('x', 100)
-                    y = field_data.get('y', 100)
-                    font_size = field_data.get('fontSize', field_data.get('font_size', 24))
-                    color = field_data.get('color', '#000000')
-
-                    # Try to load font (default to basic compatible font if custom not found)
-                    try:
-                        # In a real app, you'd load custom fonts from files
-                        font = ImageFont.truetype("DejaVuSans.ttf", font_size)
-                    except OSError:
-                        font = ImageFont.load_default()
-
-                    draw.text((x, y), str(text), font=font, fill=color)
+            # Draw on a copy so the cached image stays pristine
+            with base_img.copy() as img:
+                self._load_layout(template).draw_image(ImageDraw.Draw(img), data)
 
                 # Save to buffer
                 output = BytesIO()
@@ -97,6 +68,36 @@ class BadgeService:
             logger.error(f"Badge rendering failed: {e}")
             return b''
 
+    def _load_layout(self, template):
+        """Return the template's field layout (fonts loaded), compiled once per template version."""
+        from common.overlay_layout import OverlayLayout
+        from common.template_cache import template_cache
+
+        def loader():
+            layout = OverlayLayout.for_image(template.field_positions)
+            return layout, 256 * (len(layout.slots) + 1)
+
+        return template_cache.get_or_load(('badge_layout', template.pk, template.updated_at), loader)
+
+    def _load_template_image(self, template):
+        """
+        Return the template as a decoded RGBA image, downloading and decoding it once per template version.
+
+        Callers must copy() the image before drawing on it.
+        """
+        from common.template_cache import template_cache
+
+        def loader():
+            template_bytes = self._download_template_image(template)
+            if not template_bytes:
+                return None, 0
+            with Image.open(BytesIO(template_bytes)) as base_img:
+                # Convert to RGBA to ensure alpha channel support
+                img = base_img.convert("RGBA")
+            return img, img.width * img.height * 4
+
+        return template_cache.get_or_load(('badge_template', template.pk, template.updated_at), loader)
+
     def _download_template_image(self, template) -> bytes | None:
         """Download template image from storage."""
         if not template.start_image:
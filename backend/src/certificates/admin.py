@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Certificate, CertificateStatusHistory, CertificateTemplate
+from .models import Certificate, CertificateBatch, CertificateStatusHistory, CertificateTemplate
 
 
 @admin.register(CertificateTemplate)
@@ -20,6 +20,15 @@ class CertificateAdmin(admin.ModelAdmin):
     readonly_fields = ('verification_code', 'short_code', 'certificate_data')
 
 
+@admin.register(CertificateBatch)
+class CertificateBatchAdmin(admin.ModelAdmin):
+    list_display = ('event', 'status', 'total_count', 'rendered_count', 'failed_count', 'created_at', 'completed_at')
+    list_filter = ('status',)
+    search_fields = ('event__title',)
+    ordering = ('-created_at',)
+    readonly_fields = ('total_count', 'rendered_count', 'failed_count', 'completed_at')
+
+
 @admin.register(CertificateStatusHistory)
 class CertificateStatusHistoryAdmin(admin.ModelAdmin):
     list_display = ('certificate', 'from_status', 'to_status', 'changed_by', 'created_at')
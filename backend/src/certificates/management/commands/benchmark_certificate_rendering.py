@@ -0,0 +1,106 @@
+import os
+import time
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+
+from certificates.models import CertificateTemplate
+from certificates.rendering import PdfRenderPool, PdfTemplate, compile_layout, render_overlay
+
+SAMPLE_FIELD_POSITIONS = {
+    'attendee_name': {'x': 300, 'y': 250, 'fontSize': 32, 'fontFamily': 'Helvetica-Bold'},
+    'event_title': {'x': 250, 'y': 320, 'fontSize': 20, 'fontFamily': 'Helvetica'},
+    'event_date': {'x': 250, 'y': 360, 'fontSize': 14},
+    'cpd_credits': {'x': 250, 'y': 400, 'fontSize': 14},
+    'organizer_name': {'x': 250, 'y': 440, 'fontSize': 14},
+    'issued_date': {'x': 600, 'y': 520, 'fontSize': 10},
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark certificate PDF rendering throughput (certificates/second) per render worker count"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200, help='Certificates to render per run')
+        parser.add_argument(
+            '--workers',
+            type=str,
+            default='',
+            help='Comma-separated worker counts to compare (default: 1, 2, 4 ... up to CPU count)',
+        )
+        parser.add_argument('--template', type=str, default='', help='Path to a template PDF (default: generated)')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        worker_counts = self._worker_counts(options['workers'])
+
+        if options['template']:
+            with open(options['template'], 'rb') as f:
+                template_bytes = f.read()
+        else:
+            template_bytes = self._sample_template()
+
+        # Unsaved template: the pool is preloaded, so nothing touches storage or the database
+        template = CertificateTemplate(pk=0, field_positions=SAMPLE_FIELD_POSITIONS)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Certificate Rendering Benchmark'))
+        self.stdout.write(f"Certificates per run: {count}")
+        self.stdout.write(f"CPU count: {os.cpu_count()}\n")
+        self.stdout.write(f"{'workers':>8}  {'seconds':>8}  {'certs/sec':>10}  {'speedup':>8}")
+
+        # Warm up reportlab/pypdf imports and font setup so the first run isn't penalised
+        pdf_template = PdfTemplate(template_bytes)
+        render_overlay(pdf_template, compile_layout(pdf_template, SAMPLE_FIELD_POSITIONS), self._sample_data(0))
+
+        baseline = None
+        for workers in worker_counts:
+            jobs = ((template, self._sample_data(i)) for i in range(count))
+
+            with PdfRenderPool(workers=workers) as pool:
+                pool.preload_template(template, template_bytes)
+                started = time.perf_counter()
+                failed = sum(1 for pdf_bytes in pool.render(jobs) if not pdf_bytes)
+                elapsed = time.perf_counter() - started
+
+            rate = count / elapsed if elapsed else 0
+            baseline = baseline or rate
+            line = f"{workers:>8}  {elapsed:>8.2f}  {rate:>10.1f}  {rate / baseline:>7.2f}x"
+            if failed:
+                line += self.style.ERROR(f"  ({failed} failed)")
+            self.stdout.write(line)
+
+    def _worker_counts(self, value: str) -> list[int]:
+        if value:
+            return [int(v) for v in value.split(',') if v.strip()]
+
+        counts = []
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            counts.append(workers)
+            workers *= 2
+        return counts
+
+    def _sample_template(self) -> bytes:
+        """Generate a landscape letter template with a border, similar to a typical uploaded design."""
+        from reportlab.lib.pagesizes import landscape, letter
+        from reportlab.pdfgen import canvas
+
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=landscape(letter))
+        width, height = landscape(letter)
+        c.setLineWidth(6)
+        c.rect(24, 24, width - 48, height - 48)
+        c.setFont('Helvetica-Bold', 40)
+        c.drawCentredString(width / 2, height - 120, 'Certificate of Attendance')
+        c.save()
+        return buffer.getvalue()
+
+    def _sample_data(self, index: int) -> dict:
+        return {
+            'attendee_name': f"Attendee {index:05d}",
+            'event_title': 'Annual Clinical Update Webinar',
+            'event_date': '2025-12-20',
+            'cpd_credits': '2.0',
+            'organizer_name': 'Sample Organizer',
+            'issued_date': '2025-12-22',
+        }
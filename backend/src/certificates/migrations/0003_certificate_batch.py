@@ -0,0 +1,76 @@
+# Generated by Django 6.0 on 2026-10-16 20:26
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0002_initial'),
+        ('events', '0005_add_zoom_error_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last modified')),
+                (
+                    'uuid',
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text='Public identifier for external use',
+                        unique=True,
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[('rendering', 'Rendering'), ('completed', 'Completed')],
+                        db_index=True,
+                        default='rendering',
+                        max_length=20,
+                    ),
+                ),
+                (
+                    'send_emails',
+                    models.BooleanField(default=False, help_text='Email each certificate once its PDF is uploaded'),
+                ),
+                ('total_count', models.PositiveIntegerField(default=0, help_text='Certificates to render')),
+                ('rendered_count', models.PositiveIntegerField(default=0, help_text='PDFs rendered and uploaded')),
+                ('failed_count', models.PositiveIntegerField(default=0, help_text='PDFs that failed to render or upload')),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                (
+                    'created_by',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='certificate_batches',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    'event',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='certificate_batches', to='events.event'
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Certificate Batch',
+                'verbose_name_plural': 'Certificate Batches',
+                'db_table': 'certificate_batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -1,5 +1,5 @@
 """
-Certificates app models - CertificateTemplate, Certificate, CertificateStatusHistory.
+Certificates app models - CertificateTemplate, Certificate, CertificateBatch, CertificateStatusHistory.
 """
 
 import secrets
@@ -465,6 +465,69 @@ class Certificate(SoftDeleteModel):
         return self.certificate_data
 
 
+class CertificateBatch(BaseModel):
+    """
+    Progress of a bulk certificate issuance.
+
+    Certificate rows are created in one pass by CertificateService.issue_bulk;
+    PDF rendering and upload are fanned out to chunked tasks which report
+    their progress back here.
+    """
+
+    class Status(models.TextChoices):
+        RENDERING = 'rendering', 'Rendering'
+        COMPLETED = 'completed', 'Completed'
+
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='certificate_batches')
+    created_by = models.ForeignKey(
+        'accounts.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='certificate_batches'
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RENDERING, db_index=True)
+    send_emails = models.BooleanField(default=False, help_text="Email each certificate once its PDF is uploaded")
+
+    # Progress (updated by render tasks)
+    total_count = models.PositiveIntegerField(default=0, help_text="Certificates to render")
+    rendered_count = models.PositiveIntegerField(default=0, help_text="PDFs rendered and uploaded")
+    failed_count = models.PositiveIntegerField(default=0, help_text="PDFs that failed to render or upload")
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'certificate_batches'
+        ordering = ['-created_at']
+        verbose_name = 'Certificate Batch'
+        verbose_name_plural = 'Certificate Batches'
+
+    def __str__(self):
+        return f"Batch {self.get_short_uuid()}: {self.rendered_count + self.failed_count}/{self.total_count}"
+
+    @property
+    def progress_percent(self):
+        """Percentage of certificates processed (rendered or failed)."""
+        if self.total_count == 0:
+            return 100
+        return int(((self.rendered_count + self.failed_count) / self.total_count) * 100)
+
+    def record_progress(self, rendered=0, failed=0):
+        """
+        Atomically add a chunk's results and complete the batch when all are processed.
+
+        Safe to call concurrently from parallel render tasks.
+        """
+        from django.db.models import F
+
+        CertificateBatch.objects.filter(pk=self.pk).update(
+            rendered_count=F('rendered_count') + rendered,
+            failed_count=F('failed_count') + failed,
+            updated_at=timezone.now(),
+        )
+        CertificateBatch.objects.filter(
+            pk=self.pk,
+            status=self.Status.RENDERING,
+            total_count__lte=F('rendered_count') + F('failed_count'),
+        ).update(status=self.Status.COMPLETED, completed_at=timezone.now())
+        self.refresh_from_db(fields=['rendered_count', 'failed_count', 'status', 'completed_at', 'updated_at'])
+
+
 class CertificateStatusHistory(BaseModel):
     """
     Audit log of certificate status changes.
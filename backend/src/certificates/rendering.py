@@ -0,0 +1,415 @@
+"""
+Certificate PDF rendering engine.
+
+Rendering is CPU-bound reportlab/pypdf work, so it is kept free of Django
+model and ORM access: render_overlay() takes a parsed PdfTemplate, a
+precompiled OverlayLayout and plain data and can run in a worker process. PdfRenderPool fans a stream of
+(template, data) jobs out to a process pool with bounded in-flight work.
+
+Parsed templates live in the per-process template cache (common.template_cache),
+so each process downloads and parses a given template version once.
+
+Usage:
+    with PdfRenderPool(workers=4) as pool:
+        for pdf_bytes in pool.render((template, data) for data in rows):
+            ...
+
+    # Or the long-lived pool shared by every task in the process
+    for pdf_bytes in shared_render_pool().render(jobs):
+        ...
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from common.overlay_layout import OverlayLayout
+from common.template_cache import template_cache
+
+logger = logging.getLogger(__name__)
+
+
+def template_cache_key(template) -> tuple:
+    """Cache key for a certificate template version."""
+    return ('certificate_template', template.pk, template.updated_at)
+
+
+class PdfTemplate:
+    """
+    A template PDF parsed once and reused across renders.
+
+    Each render clones the first page into a fresh writer, so the parsed
+    reader is never mutated and can be shared between threads.
+    """
+
+    def __init__(self, content: bytes):
+        from pypdf import PdfReader
+
+        self.content = content
+        self.reader = PdfReader(BytesIO(content))
+        self.page_count = len(self.reader.pages)
+        if self.page_count:
+            mediabox = self.reader.pages[0].mediabox
+            self.page_width = float(mediabox.width)
+            self.page_height = float(mediabox.height)
+        else:
+            self.page_width = self.page_height = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache_size(self) -> int:
+        """Approximate memory held: raw bytes plus the parsed object tree."""
+        return len(self.content) * 2
+
+    def new_writer(self):
+        """Return (writer, page) with the first template page copied into a new PdfWriter."""
+        from pypdf import PdfWriter
+
+        writer = PdfWriter()
+        return writer, self.add_to(writer)
+
+    def add_to(self, writer):
+        """
+        Append a copy of the first template page to writer and return it.
+
+        Repeated calls on the same writer share the template's fonts and
+        images, so only each page's own content is added.
+        """
+        with self._lock:  # pypdf lazily resolves objects while cloning
+            return writer.add_page(self.reader.pages[0])
+
+    @classmethod
+    def load(cls, content: bytes | None) -> 'PdfTemplate | None':
+        """Parse template bytes, returning None if there is nothing usable to parse."""
+        if not content:
+            return None
+        try:
+            return cls(content)
+        except Exception as e:
+            logger.error(f"Failed to parse template PDF: {e}")
+            return None
+
+
+def load_cached_template(key, content: bytes | None) -> PdfTemplate | None:
+    """Return the parsed template for key from the process cache, parsing content on a miss."""
+
+    def loader():
+        pdf_template = PdfTemplate.load(content)
+        return pdf_template, pdf_template.cache_size if pdf_template else 0
+
+    return template_cache.get_or_load(key, loader)
+
+
+def compile_layout(template: PdfTemplate | None, field_positions: dict | None, default_font_size: int = 12) -> OverlayLayout:
+    """Compile field positions against the template's page size (blank A4 when there is no template)."""
+    from reportlab.lib.pagesizes import A4
+
+    page_size = (template.page_width, template.page_height) if template and template.page_count else A4
+    return OverlayLayout.for_pdf(field_positions, page_size, default_font_size=default_font_size)
+
+
+def render_overlay(template: PdfTemplate | None, layout: OverlayLayout, data: dict) -> bytes:
+    """
+    Overlay certificate data onto the first page of a template PDF.
+
+    Falls back to a blank A4 canvas when there is no template PDF.
+
+    Args:
+        template: Parsed template PDF (or None)
+        layout: Field layout compiled for this template (see compile_layout)
+        data: Dict of {field_name: value}
+
+    Returns:
+        PDF bytes, or b'' if rendering failed
+    """
+    try:
+        from pypdf import PdfReader
+        from reportlab.pdfgen import canvas
+
+        if template and template.page_count == 0:
+            logger.error("Template PDF has no pages")
+            return b''
+        if not template:
+            logger.warning("No template PDF, generating on blank canvas")
+
+        # Create overlay with text
+        overlay_buffer = BytesIO()
+        c = canvas.Canvas(overlay_buffer, pagesize=(layout.page_width, layout.page_height))
+        layout.draw_pdf(c, data)
+        c.save()
+        overlay_buffer.seek(0)
+
+        if not template:
+            # Return blank canvas with text
+            return overlay_buffer.getvalue()
+
+        # Merge a copy of the template page with the overlay
+        overlay_reader = PdfReader(overlay_buffer)
+        writer, page = template.new_writer()
+        page.merge_page(overlay_reader.pages[0])
+
+        output = BytesIO()
+        writer.write(output)
+        return output.getvalue()
+
+    except ImportError as e:
+        logger.error(f"PDF library not installed: {e}")
+        return b''
+    except Exception as e:
+        logger.error(f"PDF rendering failed: {e}")
+        return b''
+
+
+def render_overlay_page(layout: OverlayLayout, data: dict):
+    """Render just the text overlay as a single pypdf page."""
+    from pypdf import PdfReader
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(layout.page_width, layout.page_height))
+    layout.draw_pdf(c, data)
+    c.showPage()
+    c.save()
+    buffer.seek(0)
+    return PdfReader(buffer).pages[0]
+
+
+def write_merged_pdf(jobs: Iterable[tuple], output) -> int:
+    """
+    Write one PDF with a page per (PdfTemplate | None, OverlayLayout, data) job.
+
+    Template pages are cloned into a single writer, so a template's fonts and
+    images are stored once however many pages use it. The whole document is
+    held in memory until it is written to output: each page adds its
+    overlay, so memory grows with the page count.
+
+    Returns:
+        Number of pages written
+    """
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    pages = 0
+    for template, layout, data in jobs:
+        if template and template.page_count == 0:
+            logger.error("Template PDF has no pages")
+            continue
+
+        overlay = render_overlay_page(layout, data)
+        if template:
+            template.add_to(writer).merge_page(overlay)
+        else:
+            writer.add_page(overlay)
+        pages += 1
+
+    writer.write(output)
+    return pages
+
+
+class _ZipStreamSink:
+    """Write-only file object that hands zipfile output back in chunks."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Build a ZIP archive from (filename, content) entries, yielding it as it is written.
+
+    Only the current entry is held in memory. Entries are stored uncompressed
+    since PDFs are already compressed.
+    """
+    sink = _ZipStreamSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for filename, content in entries:
+            archive.writestr(filename, content)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def render_in_worker(template_key, template_path: str | None, layout: OverlayLayout, data: dict) -> bytes:
+    """
+    Process-pool entry point: render one job in a worker process.
+
+    Jobs carry the template's cache key and the path of the pool's copy of
+    its bytes; the file is only read and parsed on this worker's first job
+    for that template version.
+    """
+    template = None
+    if template_path:
+
+        def loader():
+            with open(template_path, 'rb') as f:
+                pdf_template = PdfTemplate.load(f.read())
+            return pdf_template, pdf_template.cache_size if pdf_template else 0
+
+        template = template_cache.get_or_load(template_key, loader)
+    return render_overlay(template, layout, data)
+
+
+class PdfRenderPool:
+    """
+    Render certificate PDFs on a pool of worker processes.
+
+    Jobs are (template, certificate_data) pairs. Templates come from the
+    process-wide template cache and are written once per version to the
+    pool's temporary directory; jobs only carry the cache key and file path,
+    and each worker parses a template version once into its own cache, so
+    template bytes aren't pickled per job and workers never touch the
+    database. Results are yielded in job order.
+
+    Backpressure: at most max_pending jobs are in flight; the job iterator is
+    only advanced as results are consumed, so a lazy queryset or generator of
+    jobs is never materialised in memory.
+
+    With a single worker, jobs are rendered in-process with no pool overhead.
+
+    Bulk issuance renders one chunk per task; use shared_render_pool() there
+    so worker processes, and the templates they have parsed, outlive a chunk.
+    """
+
+    def __init__(self, workers: int | None = None, max_pending: int | None = None):
+        from common.config import CertificateIssuance
+
+        self.workers = workers or CertificateIssuance.RENDER_WORKERS
+        self.max_pending = max_pending or self.workers * CertificateIssuance.RENDER_QUEUE_DEPTH
+        self._executor = None
+        self._templates = {}
+        self._template_dir = None
+        self._template_files = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """Start worker processes (a no-op with a single worker or once started)."""
+        if self.workers > 1 and not self._executor:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        """Shut down worker processes and remove the template files shipped to them."""
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._template_dir:
+            shutil.rmtree(self._template_dir, ignore_errors=True)
+            self._template_dir = None
+            self._template_files.clear()
+
+    def _template_file(self, key, pdf_template: PdfTemplate | None) -> str | None:
+        """Path of the file workers load a template version from, written on first use."""
+        if pdf_template is None:
+            return None
+        if key not in self._template_files:
+            if not self._template_dir:
+                self._template_dir = tempfile.mkdtemp(prefix='certificate-templates-')
+            path = os.path.join(self._template_dir, f'{len(self._template_files)}.pdf')
+            with open(path, 'wb') as f:
+                f.write(pdf_template.content)
+            self._template_files[key] = path
+        return self._template_files[key]
+
+    def preload_template(self, template, template_bytes: bytes | None):
+        """Seed the pool with template bytes that are already in hand (skips the download)."""
+        key = template_cache_key(template)
+        pdf_template = load_cached_template(key, template_bytes)
+        self._templates[key] = (pdf_template, compile_layout(pdf_template, template.field_positions))
+
+    def _template_args(self, template, loaded: dict) -> tuple:
+        """
+        Resolve a template to (key, PdfTemplate, OverlayLayout), loading once per render() call.
+
+        Templates are memoized per call rather than per pool, so a long-lived
+        pool doesn't pin every template version it has seen; the process-wide
+        template cache keeps them warm between calls.
+        """
+        if template is None:
+            return None, None, compile_layout(None, {})
+
+        key = template_cache_key(template)
+        if key in self._templates:
+            return (key, *self._templates[key])
+        if key not in loaded:
+            from certificates.services import certificate_service
+
+            pdf_template = certificate_service._load_template(template)
+            loaded[key] = (pdf_template, certificate_service._load_layout(template, pdf_template))
+        return (key, *loaded[key])
+
+    def render(self, jobs: Iterable[tuple]) -> Iterator[bytes]:
+        """
+        Render a stream of (template, certificate_data) jobs.
+
+        Yields:
+            PDF bytes per job, in order (b'' for jobs that failed to render)
+        """
+        loaded = {}
+        if not self._executor:
+            for template, data in jobs:
+                _, pdf_template, layout = self._template_args(template, loaded)
+                yield render_overlay(pdf_template, layout, data)
+            return
+
+        pending = deque()
+        try:
+            for template, data in jobs:
+                key, pdf_template, layout = self._template_args(template, loaded)
+                path = self._template_file(key, pdf_template)
+                pending.append(self._executor.submit(render_in_worker, key, path, layout, data))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        except BrokenProcessPool:
+            # A worker died; drop the executor so start() can replace it
+            self.close()
+            raise
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_render_pool() -> PdfRenderPool:
+    """
+    The process-wide PdfRenderPool, started on first use and shut down at exit.
+
+    Reused by every render_batch chunk and export in the process, so worker
+    processes are spawned once rather than per chunk. A pool whose workers
+    died is replaced.
+    """
+    global _shared_pool
+
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = PdfRenderPool()
+            atexit.register(_shared_pool.close)
+        _shared_pool.start()
+        return _shared_pool
@@ -3,6 +3,9 @@ Certificate services for PDF generation and delivery.
 """
 
 import logging
+import tempfile
+from collections import deque
+from collections.abc import Iterator
 from typing import Any
 
 from django.utils import timezone
@@ -32,8 +35,8 @@ class CertificateService:
             PDF bytes or None if failed
         """
         try:
-            # Build certificate data
-            data = certificate.build_certificate_data()
+            # Prefer the issuance snapshot; build one for certificates that predate it
+            data = certificate.certificate_data or certificate.build_certificate_data()
             if not data:
                 return None
 
@@ -56,88 +59,41 @@ class CertificateService:
         """
         Render certificate as PDF by overlaying text on the template.
 
-        Uses PyPDF2 to merge text overlay onto the template PDF.
+        Uses pypdf to merge a reportlab text overlay onto the template PDF
+        (see certificates.rendering.render_overlay).
         """
-        try:
-            from io import BytesIO
-
-            from reportlab.lib.colors import black
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-
-            # Try to get template PDF for overlay
-            template_bytes = self._download_template(template)
-
-            if template_bytes:
-                # Use PyPDF2 to overlay text on template
-                from pypdf import PdfReader, PdfWriter
-
-                template_reader = PdfReader(BytesIO(template_bytes))
-                if len(template_reader.pages) == 0:
-                    logger.error("Template PDF has no pages")
-                    return b''
-
-                template_page = template_reader.pages[0]
-                page_width = float(template_page.mediabox.width)
-                page_height = float(template_page.mediabox.height)
-            else:
-                # Fallback to blank A4 page
-                logger.warning("No template PDF, generating on blank canvas")
-                page_width, page_height = A4
-                template_page = None
-
-            # Create overlay with text
-            overlay_buffer = BytesIO()
-            c = canvas.Canvas(overlay_buffer, pagesize=(page_width, page_height))
+        from certificates.rendering import render_overlay
 
-            # Get field positions from template
-            positions = template.field_positions or {}
+        pdf_template = self._load_template(template)
+        return render_overlay(pdf_template, self._load_layout(template, pdf_template), data)
 
-            # Draw text fields
-            for field_name, field_data in positions.items():
-                text = data.get(field_name, '')
-                if not text:
-                    continue
-
-                x = field_data.get('x', 100)
-                y = page_height - field_data.get('y', 100)  # Convert from top-left to PDF coords
-                font_size = field_data.get('fontSize', field_data.get('font_size', 12))
-                font_family = field_data.get('fontFamily', field_data.get('font', 'Helvetica'))
-
-                try:
-                    c.setFont(font_family, font_size)
-                except KeyError:
-                    c.setFont('Helvetica', font_size)
+    def _load_template(self, template):
+        """
+        Return the parsed template PDF, downloading and parsing it once per template version.
 
-                c.setFillColor(black)
-                c.drawString(x, y, str(text))
+        Returns:
+            certificates.rendering.PdfTemplate, or None if there is no usable template file
+        """
+        from certificates.rendering import PdfTemplate, template_cache_key
+        from common.template_cache import template_cache
 
-            c.save()
-            overlay_buffer.seek(0)
+        def loader():
+            pdf_template = PdfTemplate.load(self._download_template(template))
+            return pdf_template, pdf_template.cache_size if pdf_template else 0
 
-            if template_page:
-                # Merge template with overlay
-                overlay_reader = PdfReader(overlay_buffer)
-                overlay_page = overlay_reader.pages[0]
-                template_page.merge_page(overlay_page)
+        return template_cache.get_or_load(template_cache_key(template), loader)
 
-                # Write result
-                writer = PdfWriter()
-                writer.add_page(template_page)
+    def _load_layout(self, template, pdf_template):
+        """Return the template's field layout, compiled once per template version."""
+        from certificates.rendering import compile_layout
+        from common.template_cache import template_cache
 
-                output = BytesIO()
-                writer.write(output)
-                return output.getvalue()
-            else:
-                # Return blank canvas with text
-                return overlay_buffer.getvalue()
+        def loader():
+            layout = compile_layout(pdf_template, template.field_positions)
+            return layout, 256 * (len(layout.slots) + 1)
 
-        except ImportError as e:
-            logger.error(f"PDF library not installed: {e}")
-            return b''
-        except Exception as e:
-            logger.error(f"PDF rendering failed: {e}")
-            return b''
+        key = ('certificate_layout', template.pk, template.updated_at, pdf_template is not None)
+        return template_cache.get_or_load(key, loader)
 
     def generate_template_preview(self, template, field_positions: dict, sample_data: dict) -> bytes | None:
         """
@@ -154,63 +110,37 @@ class CertificateService:
         try:
             from io import BytesIO
 
-            from pypdf import PdfReader, PdfWriter
-            from reportlab.lib.colors import black
-            from reportlab.lib.pagesizes import A4, letter
+            from pypdf import PdfReader
             from reportlab.pdfgen import canvas
 
-            # Get template PDF
-            template_bytes = self._download_template(template)
-            if not template_bytes:
+            from certificates.rendering import compile_layout
+
+            # Get parsed template PDF
+            pdf_template = self._load_template(template)
+            if not pdf_template:
                 logger.warning("No template PDF, generating blank preview")
                 return self._generate_blank_preview(field_positions, sample_data)
 
-            # Read template PDF
-            template_reader = PdfReader(BytesIO(template_bytes))
-            if len(template_reader.pages) == 0:
+            if pdf_template.page_count == 0:
                 logger.error("Template PDF has no pages")
                 return None
 
-            template_page = template_reader.pages[0]
-            page_width = float(template_page.mediabox.width)
-            page_height = float(template_page.mediabox.height)
+            # Field positions come from the editor (possibly unsaved), so compile them per preview
+            layout = compile_layout(pdf_template, field_positions, default_font_size=24)
 
             # Create overlay with text
             overlay_buffer = BytesIO()
-            c = canvas.Canvas(overlay_buffer, pagesize=(page_width, page_height))
-
-            # Draw text at field positions
-            for field_name, position in (field_positions or {}).items():
-                text = sample_data.get(field_name, '')
-                if not text:
-                    continue
-
-                x = position.get('x', 100)
-                y = page_height - position.get('y', 100)  # Convert from top-left to PDF coords
-                font_size = position.get('fontSize', 24)
-                font_family = position.get('fontFamily', 'Helvetica')
-
-                try:
-                    c.setFont(font_family, font_size)
-                except KeyError:
-                    c.setFont('Helvetica', font_size)
-
-                c.setFillColor(black)
-                c.drawString(x, y, str(text))
-
+            c = canvas.Canvas(overlay_buffer, pagesize=(layout.page_width, layout.page_height))
+            layout.draw_pdf(c, sample_data)
             c.save()
             overlay_buffer.seek(0)
 
-            # Merge template with overlay
+            # Merge a copy of the template page with the overlay
             overlay_reader = PdfReader(overlay_buffer)
-            overlay_page = overlay_reader.pages[0]
-
-            template_page.merge_page(overlay_page)
+            writer, template_page = pdf_template.new_writer()
+            template_page.merge_page(overlay_reader.pages[0])
 
             # Write result
-            writer = PdfWriter()
-            writer.add_page(template_page)
-
             output = BytesIO()
             writer.write(output)
             return output.getvalue()
@@ -257,6 +187,8 @@ class CertificateService:
         from reportlab.lib.pagesizes import letter
         from reportlab.pdfgen import canvas
 
+        from common.overlay_layout import OverlayLayout
+
         buffer = BytesIO()
         c = canvas.Canvas(buffer, pagesize=letter)
         width, height = letter
@@ -265,16 +197,9 @@ class CertificateService:
         c.setFillColorRGB(0.95, 0.95, 0.95)
         c.rect(0, 0, width, height, fill=True)
 
-        # Draw text at field positions
-        for field_name, position in (field_positions or {}).items():
-            text = sample_data.get(field_name, field_name)
-            x = position.get('x', 100)
-            y = height - position.get('y', 100)
-            font_size = position.get('fontSize', 24)
-
-            c.setFillColorRGB(0, 0, 0)
-            c.setFont('Helvetica', font_size)
-            c.drawString(x, y, str(text))
+        # Draw text at field positions, labelling fields without sample data
+        layout = OverlayLayout.for_pdf(field_positions, letter, default_font_size=24)
+        layout.draw_pdf(c, sample_data, placeholders=True)
 
         c.save()
         return buffer.getvalue()
@@ -290,10 +215,28 @@ class CertificateService:
         Returns:
             URL of uploaded PDF or None
         """
+        url = self._store_pdf(certificate, pdf_bytes)
+        if not url:
+            return None
+
+        certificate.file_url = url
+        certificate.file_generated_at = timezone.now()
+        certificate.save(update_fields=['file_url', 'file_generated_at', 'updated_at'])
+        return url
+
+    def _store_pdf(self, certificate, pdf_bytes: bytes) -> str | None:
+        """
+        Write PDF bytes to GCS, falling back to local media storage.
+
+        Does not touch the certificate row, so batch rendering can persist
+        file URLs with a single bulk_update.
+
+        Returns:
+            URL of stored PDF or None
+        """
         import os
 
         from django.conf import settings
-        from django.utils import timezone
 
         try:
             # Try GCS first if configured
@@ -317,9 +260,6 @@ class CertificateService:
             )
 
             if url:
-                certificate.file_url = url
-                certificate.file_generated_at = timezone.now()
-                certificate.save(update_fields=['file_url', 'file_generated_at', 'updated_at'])
                 logger.info(f"Certificate PDF uploaded to GCS: {path}")
                 return url
 
@@ -341,13 +281,8 @@ class CertificateService:
 
             # Build URL using MEDIA_URL
             media_url = getattr(settings, 'MEDIA_URL', '/media/')
-            url = f"{media_url}certificates/{filename}"
-
-            certificate.file_url = url
-            certificate.file_generated_at = timezone.now()
-            certificate.save(update_fields=['file_url', 'file_generated_at', 'updated_at'])
             logger.info(f"Certificate PDF saved locally: {filepath}")
-            return url
+            return f"{media_url}certificates/{filename}"
 
         except Exception as e:
             logger.error(f"Certificate PDF local save failed: {e}")
@@ -467,38 +402,278 @@ class CertificateService:
             logger.error(f"Certificate issuance failed: {e}")
             return {'success': False, 'error': str(e)}
 
-    def issue_bulk(self, event, registrations: list | None = None, issued_by=None) -> dict[str, Any]:
+    def get_eligible_registrations(self, event):
+        """
+        Registrations for an event that should receive a certificate.
+
+        Confirmed, not deleted, attendance eligible (or overridden) and not yet issued.
+        """
+        from django.db.models import Q
+
+        from registrations.models import Registration
+
+        return (
+            Registration.objects.filter(event=event, status=Registration.Status.CONFIRMED, deleted_at__isnull=True)
+            .filter(Q(attendance_eligible=True) | Q(attendance_override=True))
+            .exclude(certificate_issued=True)
+            .select_related('event', 'event__owner')
+        )
+
+    def issue_bulk(self, event, registrations=None, issued_by=None, template=None, send_emails: bool = False) -> dict[str, Any]:
         """
         Issue certificates in bulk for an event.
 
+        Unlike calling issue_certificate per registration, this does one quota
+        check for the whole batch, creates certificate rows with bulk_create and
+        bumps registration, event and subscription counters with set-based
+        UPDATEs. PDF rendering and upload are fanned out to chunked
+        render_certificate_batch tasks tracked by a CertificateBatch.
+
         Args:
             event: Event to issue certificates for
             registrations: Specific registrations (or all eligible)
-            issued_by: User issuing certificates
+            issued_by: User issuing certificates (defaults to event owner)
+            template: Template to use (optional, uses event default)
+            send_emails: Email each certificate once its PDF is uploaded
 
         Returns:
-            Dict with success count and errors
+            Dict with counts, errors, issued certificate UUIDs and batch UUID
         """
+        from django.db import transaction
+        from django.db.models import F
+
+        from billing.models import Subscription
+        from certificates.models import Certificate, CertificateBatch
+        from common.config import CertificateIssuance
+        from events.models import Event
         from registrations.models import Registration
 
         if registrations is None:
-            # Get all eligible registrations
-            registrations = Registration.objects.filter(
-                event=event, status='attended', attendance_eligible=True, certificate_issued=False
+            registrations = self.get_eligible_registrations(event)
+        if hasattr(registrations, 'select_related'):
+            registrations = registrations.select_related('event', 'event__owner')
+        registrations = list(registrations)
+
+        results = {
+            'total': len(registrations),
+            'success': 0,
+            'skipped': 0,
+            'failed': 0,
+            'errors': [],
+            'issued': [],
+            'batch_id': None,
+        }
+
+        def fail(regs, error, **extra):
+            results['failed'] += len(regs)
+            results['errors'].extend({'registration_id': str(reg.uuid), 'error': error, **extra} for reg in regs)
+
+        template = template or event.certificate_template
+        if not template:
+            fail(registrations, 'No certificate template configured')
+            return results
+
+        issued_by = issued_by or event.owner
+        now = timezone.now()
+        with transaction.atomic():
+            # Lock the subscription row so concurrent batches can't spend the same allowance
+            subscription = getattr(event.owner, 'subscription', None)
+            if subscription:
+                subscription = Subscription.objects.select_for_update().get(pk=subscription.pk)
+
+            # Lock the registrations before looking for their certificates, so a concurrent
+            # batch for the same registrations waits here and then sees the rows it created
+            list(Registration.objects.select_for_update().filter(pk__in=[reg.pk for reg in registrations]).values_list('pk'))
+
+            # One query for certificates that already exist (including revoked/deleted,
+            # which still hold the one-to-one slot on the registration)
+            existing = dict(
+                Certificate.all_objects.filter(registration__in=registrations).values_list('registration_id', 'status')
+            )
+            to_issue = []
+            for reg in registrations:
+                if reg.pk not in existing:
+                    to_issue.append(reg)
+                elif existing[reg.pk] == Certificate.Status.ACTIVE:
+                    results['skipped'] += 1
+                else:
+                    fail([reg], 'A revoked certificate already exists for this registration')
+
+            # One quota check for the whole batch; issue up to the remaining allowance
+            if subscription:
+                limit = subscription.limits.get('certificates_per_month')
+                if limit is not None:
+                    remaining = max(0, limit - subscription.certificates_issued_this_period)
+                    if len(to_issue) > remaining:
+                        fail(
+                            to_issue[remaining:],
+                            f"Certificate limit reached ({limit} per month). "
+                            "Please upgrade your plan to issue more certificates.",
+                            limit_exceeded=True,
+                        )
+                        to_issue = to_issue[:remaining]
+
+            if not to_issue:
+                return results
+
+            certificates = []
+            for reg in to_issue:
+                certificate = Certificate(
+                    registration=reg, template=template, status=Certificate.Status.ACTIVE, issued_by=issued_by
+                )
+                certificate.build_certificate_data()
+                certificates.append(certificate)
+
+            Certificate.objects.bulk_create(certificates, batch_size=CertificateIssuance.BULK_CREATE_BATCH_SIZE)
+
+            count = len(certificates)
+            Registration.objects.filter(pk__in=[reg.pk for reg in to_issue]).update(
+                certificate_issued=True, certificate_issued_at=now, updated_at=now
             )
+            Event.objects.filter(pk=event.pk).update(certificate_count=F('certificate_count') + count, updated_at=now)
+            if subscription:
+                Subscription.objects.filter(pk=subscription.pk).update(
+                    certificates_issued_this_period=F('certificates_issued_this_period') + count, updated_at=now
+                )
 
-        results = {'total': len(registrations), 'success': 0, 'failed': 0, 'errors': []}
+            batch = CertificateBatch.objects.create(
+                event=event, created_by=issued_by, total_count=count, send_emails=send_emails
+            )
 
-        for reg in registrations:
-            result = self.issue_certificate(reg, issued_by=issued_by)
-            if result['success']:
-                results['success'] += 1
-            else:
-                results['failed'] += 1
-                results['errors'].append({'registration_id': str(reg.uuid), 'error': result.get('error', 'Unknown error')})
+        results['success'] = len(certificates)
+        results['issued'] = [str(c.uuid) for c in certificates]
+        results['batch_id'] = str(batch.uuid)
+
+        # Fan out PDF rendering and upload
+        from certificates.tasks import render_certificate_batch
+
+        certificate_ids = [c.pk for c in certificates]
+        chunk_size = CertificateIssuance.RENDER_CHUNK_SIZE
+        for start in range(0, len(certificate_ids), chunk_size):
+            render_certificate_batch.delay(batch.id, certificate_ids[start : start + chunk_size])
 
         return results
 
+    def render_batch(self, batch, certificate_ids: list[int]) -> dict[str, int]:
+        """
+        Render and upload PDFs for one chunk of a bulk issuance.
+
+        PDFs are rendered on the process's shared PdfRenderPool, sized by
+        CERTIFICATE_RENDER_WORKERS and reused across chunks.
+        File URLs are persisted with a single bulk_update and progress is
+        recorded on the batch.
+
+        Args:
+            batch: CertificateBatch the chunk belongs to
+            certificate_ids: Certificate IDs in this chunk
+
+        Returns:
+            Dict with rendered and failed counts
+        """
+        from certificates.models import Certificate
+
+        certificates = list(
+            Certificate.objects.filter(pk__in=certificate_ids).select_related('template', 'registration', 'registration__event')
+        )
+
+        from certificates.rendering import shared_render_pool
+
+        rendered = []
+        jobs = ((c.template, c.certificate_data or c.build_certificate_data()) for c in certificates)
+        for certificate, pdf_bytes in zip(certificates, shared_render_pool().render(jobs), strict=True):
+            url = self._store_pdf(certificate, pdf_bytes) if pdf_bytes else None
+            if not url:
+                continue
+
+            certificate.file_url = url
+            certificate.file_generated_at = certificate.updated_at = timezone.now()
+            rendered.append(certificate)
+
+        Certificate.objects.bulk_update(rendered, ['file_url', 'file_generated_at', 'updated_at'])
+
+        failed = len(certificate_ids) - len(rendered)
+        batch.record_progress(rendered=len(rendered), failed=failed)
+
+        if batch.send_emails:
+            from certificates.tasks import send_certificate_email
+
+            for certificate in rendered:
+                send_certificate_email.delay(certificate.id)
+
+        return {'rendered': len(rendered), 'failed': failed}
+
+    def export_certificates(self, certificates, export_format: str = 'zip') -> Iterator[bytes]:
+        """
+        Stream a set of certificates as one ZIP of PDFs or one merged PDF.
+
+        PDFs are re-rendered from each certificate's data snapshot using the
+        cached template and layout, so no stored files are fetched and each
+        template is parsed once. ZIP exports hold one entry at a time: entries
+        are yielded as they are written. A merged PDF is assembled in memory
+        before any of it is sent (template resources are shared across pages,
+        but every page's overlay is held until the end), so callers only
+        offer it up to EXPORT_MERGED_PDF_MAX_CERTIFICATES certificates; the
+        written file is spooled to disk past EXPORT_SPOOL_MAX_BYTES.
+
+        Args:
+            certificates: Certificate queryset (iterated in chunks)
+            export_format: 'zip' or 'pdf'
+
+        Returns:
+            Iterator of byte chunks
+        """
+        from certificates.rendering import compile_layout, shared_render_pool, stream_zip, write_merged_pdf
+        from common.config import CertificateIssuance
+
+        rows = certificates.select_related('template', 'registration', 'registration__event__owner').iterator(
+            chunk_size=CertificateIssuance.RENDER_CHUNK_SIZE
+        )
+
+        if export_format == 'pdf':
+            layouts = {}
+
+            def pages():
+                for certificate in rows:
+                    template = certificate.template
+                    key = (template.pk, template.updated_at) if template else None
+                    if key not in layouts:
+                        pdf_template = self._load_template(template) if template else None
+                        layout = self._load_layout(template, pdf_template) if template else compile_layout(None, {})
+                        layouts[key] = (pdf_template, layout)
+                    yield (*layouts[key], certificate.certificate_data or certificate.build_certificate_data())
+
+            with tempfile.SpooledTemporaryFile(max_size=CertificateIssuance.EXPORT_SPOOL_MAX_BYTES) as output:
+                write_merged_pdf(pages(), output)
+                output.seek(0)
+                while chunk := output.read(CertificateIssuance.EXPORT_CHUNK_SIZE):
+                    yield chunk
+            return
+
+        def entries():
+            # The pool pulls jobs lazily, so certificates queue up here in render order
+            in_flight = deque()
+
+            def jobs():
+                for certificate in rows:
+                    in_flight.append(certificate)
+                    yield certificate.template, certificate.certificate_data or certificate.build_certificate_data()
+
+            for pdf_bytes in shared_render_pool().render(jobs()):
+                certificate = in_flight.popleft()
+                if not pdf_bytes:
+                    logger.error(f"Export skipped certificate {certificate.uuid}: rendering failed")
+                    continue
+                yield self._export_filename(certificate), pdf_bytes
+
+        yield from stream_zip(entries())
+
+    def _export_filename(self, certificate) -> str:
+        """Unique, filesystem-safe name for a certificate inside an export archive."""
+        from django.utils.text import slugify
+
+        name = slugify(certificate.attendee_name) or 'certificate'
+        return f"{name}-{certificate.short_code or certificate.uuid}.pdf"
+
     def send_certificate_email(self, certificate) -> bool:
         """
         Send certificate email to attendee.
@@ -5,7 +5,7 @@ Cloud tasks for certificates.
 import contextlib
 import logging
 
-from common.cloud_tasks import task
+from common.cloud_tasks import chunk_task, map_queryset, task
 
 logger = logging.getLogger(__name__)
 
@@ -61,13 +61,38 @@ def bulk_issue_certificates(event_id: int, issued_by_id: int = None):
                 issued_by = User.objects.get(id=issued_by_id)
 
         result = certificate_service.issue_bulk(event, issued_by=issued_by)
-        logger.info(f"Bulk issued certificates for event {event_id}: {result}")
+        logger.info(
+            f"Bulk issued certificates for event {event_id}: "
+            f"{result['success']} issued, {result['skipped']} skipped, {result['failed']} failed"
+        )
         return result
 
     except Event.DoesNotExist:
         return {'error': 'Event not found'}
 
 
+@task()
+def render_certificate_batch(batch_id: int, certificate_ids: list[int]):
+    """
+    Render and upload PDFs for one chunk of a bulk certificate issuance.
+    """
+    from certificates.models import CertificateBatch
+    from certificates.services import certificate_service
+
+    try:
+        batch = CertificateBatch.objects.get(id=batch_id)
+    except CertificateBatch.DoesNotExist:
+        logger.error(f"Certificate batch {batch_id} not found")
+        return {'rendered': 0, 'failed': 0, 'error': 'Batch not found'}
+
+    result = certificate_service.render_batch(batch, certificate_ids)
+    logger.info(
+        f"Rendered certificate batch {batch.uuid} chunk: {result['rendered']} rendered, {result['failed']} failed "
+        f"({batch.rendered_count + batch.failed_count}/{batch.total_count})"
+    )
+    return result
+
+
 @task()
 def issue_certificate_for_registration(registration_id: int, issued_by_id: int = None):
     """
@@ -102,12 +127,14 @@ def auto_issue_certificates(event_id: int):
     Automatically issue certificates for all eligible registrations.
     Called after event completion.
 
+    Eligible registrations are fanned out to issue_certificate_chunk tasks,
+    each issuing its chunk with issue_bulk.
+
     Args:
         event_id: ID of the completed event
     """
     from certificates.services import certificate_service
     from events.models import Event
-    from registrations.models import Registration
 
     try:
         event = Event.objects.get(id=event_id)
@@ -117,40 +144,31 @@ def auto_issue_certificates(event_id: int):
             logger.warning(f"Event {event_id} is not completed, skipping auto-issue")
             return {'issued': 0, 'skipped': 0}
 
-        if not event.certificate_enabled:
+        if not event.certificates_enabled:
             logger.info(f"Certificates not enabled for event {event_id}")
             return {'issued': 0, 'skipped': 0}
 
-        # Get eligible registrations (attended and meeting attendance threshold)
-        registrations = Registration.objects.filter(
-            event=event, status='attended', certificate_issued=False, deleted_at__isnull=True
-        )
+        job = map_queryset(certificate_service.get_eligible_registrations(event), issue_certificate_chunk, event.id)
 
-        issued = 0
-        skipped = 0
-
-        for reg in registrations:
-            # Check attendance eligibility
-            if not reg.attendance_eligible:
-                skipped += 1
-                continue
-
-            try:
-                result = certificate_service.issue_certificate(registration=reg, issued_by=event.owner)  # Auto-issued by owner
-                if result.get('success'):
-                    issued += 1
-                    # Queue certificate email
-                    if result.get('certificate'):
-                        send_certificate_email.delay(result['certificate'].id)
-                else:
-                    skipped += 1
-            except Exception as e:
-                logger.error(f"Failed to issue certificate for registration {reg.id}: {e}")
-                skipped += 1
-
-        logger.info(f"Auto-issued {issued} certificates for event {event_id} ({skipped} skipped)")
-        return {'issued': issued, 'skipped': skipped}
+        logger.info(f"Auto-issuing certificates for {job.total_items} registrations of event {event_id} (job {job.uuid})")
+        return {'issued': 0, 'skipped': 0, **job.results, 'job_id': str(job.uuid), 'chunks': job.total_chunks}
 
     except Event.DoesNotExist:
         logger.error(f"Event {event_id} not found")
         return {'issued': 0, 'skipped': 0, 'error': 'Event not found'}
+
+
+@chunk_task()
+def issue_certificate_chunk(first_id: int, last_id: int, event_id: int):
+    """
+    Issue certificates for one chunk of an event's eligible registrations.
+    """
+    from certificates.services import certificate_service
+    from events.models import Event
+
+    event = Event.objects.select_related('owner').get(id=event_id)
+    registrations = certificate_service.get_eligible_registrations(event).filter(pk__range=(first_id, last_id))
+
+    # Auto-issued by owner; PDFs and emails are fanned out per batch
+    result = certificate_service.issue_bulk(event, registrations=registrations, issued_by=event.owner, send_emails=True)
+    return {'issued': result['success'], 'skipped': result['skipped'] + result['failed']}
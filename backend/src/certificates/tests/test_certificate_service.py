@@ -2,6 +2,7 @@
 Tests for CertificateService.
 """
 
+import os
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -11,9 +12,7 @@ from certificates.services import certificate_service
 
 @pytest.mark.django_db
 class TestCertificateService:
-    def test_issue_certificate_success(
-        self, certificate_template, attended_registration, organizer
-    ):
+    def test_issue_certificate_success(self, certificate_template, attended_registration, organizer):
         """Test successful certificate issuance."""
         # Ensure eligible
         attended_registration.attendance_eligible = True
@@ -26,8 +25,9 @@ class TestCertificateService:
             cert.save()
             return 'http://example.com/cert.pdf'
 
-        with patch.object(certificate_service, 'generate_pdf', return_value=b'pdf-content'), patch.object(
-            certificate_service, 'upload_pdf', side_effect=mock_upload
+        with (
+            patch.object(certificate_service, 'generate_pdf', return_value=b'pdf-content'),
+            patch.object(certificate_service, 'upload_pdf', side_effect=mock_upload),
         ):
             result = certificate_service.issue_certificate(
                 attended_registration, template=certificate_template, issued_by=organizer
@@ -54,9 +54,7 @@ class TestCertificateService:
         assert result.get('already_issued') is True
         assert result['certificate'].uuid == certificate.uuid
 
-    def test_issue_certificate_limit_reached(
-        self, certificate_template, attended_registration, organizer
-    ):
+    def test_issue_certificate_limit_reached(self, certificate_template, attended_registration, organizer):
         """Test subscription limit enforcement."""
         # Mock subscription on owner
         mock_sub = MagicMock()
@@ -71,7 +69,7 @@ class TestCertificateService:
         # Depending on how subscription is implemented (OneToOne usually),
         # let's try to mock the attribute on the user instance provided by the fixture
         with patch.object(type(organizer), 'subscription', mock_sub, create=True):
-             result = certificate_service.issue_certificate(
+            result = certificate_service.issue_certificate(
                 attended_registration, template=certificate_template, issued_by=organizer
             )
 
@@ -84,9 +82,7 @@ class TestCertificateService:
         attended_registration.event.certificate_template = None
         attended_registration.event.save()
 
-        result = certificate_service.issue_certificate(
-            attended_registration, template=None, issued_by=organizer
-        )
+        result = certificate_service.issue_certificate(attended_registration, template=None, issued_by=organizer)
 
         assert result['success'] is False
         assert 'No certificate template' in result['error']
@@ -131,3 +127,229 @@ class TestCertificateService:
         # Should return a local URL
         assert result.startswith('/media/certificates/')
         assert result.endswith('.pdf')
+
+
+@pytest.mark.django_db
+class TestBulkCertificateIssuance:
+    def _eligible_registrations(self, event, count):
+        from factories import RegistrationFactory
+
+        return [
+            RegistrationFactory(event=event, status='confirmed', attended=True, attendance_eligible=True) for _ in range(count)
+        ]
+
+    def test_issue_bulk_creates_certificates_and_counters(self, completed_event, certificate_template, organizer):
+        """Bulk issuance creates rows, flags registrations and bumps counters once."""
+        from certificates.models import Certificate, CertificateBatch
+
+        completed_event.certificate_template = certificate_template
+        completed_event.save()
+        regs = self._eligible_registrations(completed_event, 5)
+        subscription = organizer.subscription
+        subscription.refresh_from_db()
+        issued_before = subscription.certificates_issued_this_period
+
+        with patch.object(certificate_service, '_store_pdf', return_value='gs://bucket/cert.pdf'):
+            result = certificate_service.issue_bulk(completed_event)
+
+        assert result['success'] == 5
+        assert result['failed'] == 0
+        assert Certificate.objects.filter(registration__in=regs, status='active').count() == 5
+        for reg in regs:
+            reg.refresh_from_db()
+            assert reg.certificate_issued is True
+
+        subscription.refresh_from_db()
+        assert subscription.certificates_issued_this_period == issued_before + 5
+
+        # Render stage ran (sync mode) and recorded progress
+        batch = CertificateBatch.objects.get(uuid=result['batch_id'])
+        assert batch.status == CertificateBatch.Status.COMPLETED
+        assert batch.rendered_count == 5
+        assert not Certificate.objects.filter(registration__in=regs, file_url='').exists()
+
+    def test_issue_bulk_skips_existing(self, certificate, certificate_template):
+        """Registrations with an active certificate are skipped, not duplicated."""
+        event = certificate.registration.event
+        result = certificate_service.issue_bulk(event, registrations=[certificate.registration], template=certificate_template)
+
+        assert result['success'] == 0
+        assert result['skipped'] == 1
+        assert result['batch_id'] is None
+
+    def test_issue_bulk_sees_certificates_issued_while_it_waited(self, completed_event, certificate_template, organizer):
+        """A concurrent batch that issues first (while this one waits on the locks) is skipped, not duplicated."""
+        from billing.models import Subscription
+        from factories import CertificateFactory
+
+        regs = self._eligible_registrations(completed_event, 3)
+        select_for_update = Subscription.objects.select_for_update
+
+        def issued_concurrently(*args, **kwargs):
+            CertificateFactory(registration=regs[0], template=certificate_template)
+            return select_for_update(*args, **kwargs)
+
+        with (
+            patch.object(Subscription.objects, 'select_for_update', side_effect=issued_concurrently),
+            patch.object(certificate_service, 'render_batch', return_value={'rendered': 0, 'failed': 0}),
+        ):
+            result = certificate_service.issue_bulk(completed_event, registrations=regs, template=certificate_template)
+
+        assert (result['success'], result['skipped'], result['failed']) == (2, 1, 0)
+
+    def test_issue_bulk_partial_quota(self, completed_event, certificate_template, organizer):
+        """Only the remaining monthly allowance is issued; the rest report limit_exceeded."""
+        regs = self._eligible_registrations(completed_event, 3)
+        subscription = organizer.subscription
+        limits = {'certificates_per_month': subscription.certificates_issued_this_period + 2}
+
+        with (
+            patch.object(type(subscription), 'limits', limits),
+            patch.object(certificate_service, 'render_batch', return_value={'rendered': 0, 'failed': 0}),
+        ):
+            result = certificate_service.issue_bulk(completed_event, registrations=regs, template=certificate_template)
+
+        assert result['success'] == 2
+        assert result['failed'] == 1
+        assert result['errors'][0]['limit_exceeded'] is True
+
+
+class TestPdfRenderPool:
+    def test_renders_jobs_in_order_across_workers(self):
+        """Process pool yields one PDF per job, in job order, with bounded in-flight work."""
+        from io import BytesIO
+
+        from pypdf import PdfReader
+
+        from certificates.models import CertificateTemplate
+        from certificates.rendering import PdfRenderPool
+
+        template = CertificateTemplate(pk=0, field_positions={'attendee_name': {'x': 100, 'y': 100}})
+        jobs = ((template, {'attendee_name': f"Attendee {i}"}) for i in range(6))
+
+        with PdfRenderPool(workers=2, max_pending=2) as pool:
+            pool.preload_template(template, None)
+            results = list(pool.render(jobs))
+
+        assert len(results) == 6
+        for i, pdf_bytes in enumerate(results):
+            assert pdf_bytes.startswith(b'%PDF')
+            assert f"Attendee {i}" in PdfReader(BytesIO(pdf_bytes)).pages[0].extract_text()
+
+    def test_template_bytes_are_not_shipped_per_job(self):
+        """Jobs carry the template key and file path; the bytes are written once per pool."""
+        from io import BytesIO
+
+        from pypdf import PdfReader
+        from reportlab.pdfgen import canvas
+
+        from certificates.models import CertificateTemplate
+        from certificates.rendering import PdfRenderPool
+
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer)
+        c.showPage()
+        c.save()
+        template = CertificateTemplate(pk=0, field_positions={'attendee_name': {'x': 100, 'y': 100}})
+        jobs = [(template, {'attendee_name': f"Attendee {i}"}) for i in range(4)]
+
+        with PdfRenderPool(workers=2, max_pending=2) as pool:
+            pool.preload_template(template, buffer.getvalue())
+            submitted = []
+            submit = pool._executor.submit
+            pool._executor.submit = lambda fn, *args: submitted.append(args) or submit(fn, *args)
+            results = list(pool.render(jobs))
+            template_dir = pool._template_dir
+
+        assert len(results) == 4
+        assert "Attendee 3" in PdfReader(BytesIO(results[3])).pages[0].extract_text()
+        assert not any(isinstance(arg, bytes) for args in submitted for arg in args)
+        assert len({args[1] for args in submitted}) == 1
+        assert not os.path.exists(template_dir)
+
+    def test_shared_pool_keeps_its_workers_across_renders(self, monkeypatch):
+        """Bulk issuance chunks reuse one pool per process instead of spawning workers per chunk."""
+        from certificates import rendering
+        from certificates.models import CertificateTemplate
+        from common.config import CertificateIssuance
+
+        monkeypatch.setattr(rendering, '_shared_pool', None)
+        monkeypatch.setattr(CertificateIssuance, 'RENDER_WORKERS', 2)
+        template = CertificateTemplate(pk=0, field_positions={'attendee_name': {'x': 100, 'y': 100}})
+
+        pool = rendering.shared_render_pool()
+        try:
+            pool.preload_template(template, None)
+            assert len(list(pool.render([(template, {'attendee_name': 'First chunk'})]))) == 1
+            executor = pool._executor
+
+            assert rendering.shared_render_pool() is pool
+            assert len(list(pool.render([(template, {'attendee_name': 'Second chunk'})]))) == 1
+            assert pool._executor is executor
+        finally:
+            pool.close()
+
+
+class TestTemplateCache:
+    def _template_pdf(self) -> bytes:
+        from io import BytesIO
+
+        from reportlab.pdfgen import canvas
+
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer)
+        c.showPage()
+        c.save()
+        return buffer.getvalue()
+
+    def test_template_downloaded_once_per_version(self, certificate_template):
+        """Repeated renders reuse the parsed template until the template is edited."""
+        from common.template_cache import template_cache
+
+        template_cache.clear()
+        certificate_template.field_positions = {'attendee_name': {'x': 100, 'y': 100}}
+        with patch.object(certificate_service, '_download_template', return_value=self._template_pdf()) as mock_download:
+            for i in range(3):
+                assert certificate_service._render_pdf(certificate_template, {'attendee_name': f"A {i}"}).startswith(b'%PDF')
+            assert mock_download.call_count == 1
+
+            certificate_template.save()  # bumps updated_at
+            certificate_service._render_pdf(certificate_template, {'attendee_name': 'B'})
+            assert mock_download.call_count == 2
+
+    def test_evicts_least_recently_used_over_budget(self):
+        from common.template_cache import TemplateCache
+
+        cache = TemplateCache(max_bytes=10)
+        cache.get_or_load('a', lambda: ('A', 4))
+        cache.get_or_load('b', lambda: ('B', 4))
+        cache.get_or_load('a', lambda: ('unused', 4))  # hit: 'a' becomes most recent
+        cache.get_or_load('c', lambda: ('C', 4))
+
+        assert cache.get_or_load('a', lambda: ('reloaded', 4)) == 'A'
+        assert cache.get_or_load('b', lambda: ('reloaded', 4)) == 'reloaded'
+        assert cache.stats()['size_bytes'] <= 10
+
+
+class TestOverlayLayout:
+    def test_compiles_fonts_and_pdf_coordinates_once(self):
+        """Layout resolves fonts and converts top-left coordinates up front, in editor order."""
+        from common.overlay_layout import OverlayLayout
+
+        layout = OverlayLayout.for_pdf(
+            {
+                'attendee_name': {'x': 50, 'y': 100, 'fontSize': 30, 'fontFamily': 'NoSuchFont'},
+                'event_title': {'x': 50, 'y': 200, 'font': 'Helvetica-Bold'},
+                'hidden': {'x': 0, 'y': 0, 'enabled': False},
+            },
+            page_size=(600, 800),
+        )
+
+        assert [slot.name for slot in layout.slots] == ['attendee_name', 'event_title']
+        name, title = layout.slots
+        assert (name.x, name.y, name.font, name.font_size) == (50, 700, 'Helvetica', 30)
+        assert (title.y, title.font, title.font_size) == (600, 'Helvetica-Bold', 12)
+
+        canvas = MagicMock()
+        layout.draw_pdf(canvas, {'attendee_name': 'Jane Doe', 'event_title': ''})
+        canvas.drawString.assert_called_once_with(50, 700, 'Jane Doe')
@@ -6,6 +6,7 @@ Endpoints tested:
 - POST /api/v1/events/{event_uuid}/certificates/issue/
 - POST /api/v1/events/{event_uuid}/certificates/{uuid}/revoke/
 - GET /api/v1/events/{event_uuid}/certificates/summary/
+- GET /api/v1/events/{event_uuid}/certificates/export/
 - GET /api/v1/certificates/ (my certificates)
 - GET /api/v1/certificates/{uuid}/
 - GET /api/v1/certificates/{uuid}/download/
@@ -72,6 +73,37 @@ class TestEventCertificateViewSet:
         # Bulk issuance may return different status
         assert response.status_code in [status.HTTP_200_OK, status.HTTP_201_CREATED]
 
+    @pytest.mark.parametrize('by_uuid', [False, True])
+    def test_issue_queries_stay_flat(self, organizer_client, organizer, certificate_template, by_uuid):
+        """Issuing to 12 registrations costs the same queries as issuing to 3."""
+        from unittest.mock import patch
+
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from factories import EventFactory, RegistrationFactory
+
+        queries = []
+        for count in (3, 12):
+            event = EventFactory(
+                owner=organizer, status='completed', certificates_enabled=True, certificate_template=certificate_template
+            )
+            regs = RegistrationFactory.create_batch(
+                count, event=event, status='confirmed', attended=True, attendance_eligible=True
+            )
+            payload = {'registration_uuids': [str(r.uuid) for r in regs]} if by_uuid else {'issue_all_eligible': True}
+
+            with (
+                patch('certificates.tasks.render_certificate_batch.delay'),
+                CaptureQueriesContext(connection) as captured,
+            ):
+                response = organizer_client.post(f'{self.get_endpoint(event)}issue/', payload, format='json')
+
+            assert response.data['issued_count'] == count
+            queries.append(len(captured))
+
+        assert queries[0] == queries[1]
+
     def test_revoke_certificate(self, organizer_client, certificate, completed_event):
         """Organizer can revoke a certificate."""
         endpoint = f'/api/v1/events/{certificate.registration.event.uuid}/certificates/{certificate.uuid}/revoke/'
@@ -122,6 +154,53 @@ class TestCertificateSummary:
 # =============================================================================
 
 
+@pytest.mark.django_db
+class TestCertificateExport:
+    """Tests for streaming event certificate export."""
+
+    def test_export_zip(self, organizer_client, certificate, completed_event):
+        """Organizer can download all certificates as a ZIP of PDFs."""
+        import io
+        import zipfile
+
+        response = organizer_client.get(f'/api/v1/events/{completed_event.uuid}/certificates/export/')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/zip'
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        names = archive.namelist()
+        assert names == [f'{names[0].rsplit("-", 1)[0]}-{certificate.short_code}.pdf']
+        assert archive.read(names[0]).startswith(b'%PDF')
+
+    def test_export_merged_pdf(self, organizer_client, certificate, completed_event):
+        """Organizer can download all certificates as one merged PDF."""
+        import io
+
+        from pypdf import PdfReader
+
+        response = organizer_client.get(f'/api/v1/events/{completed_event.uuid}/certificates/export/?file_format=pdf')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/pdf'
+        assert len(PdfReader(io.BytesIO(b''.join(response.streaming_content))).pages) == 1
+
+    def test_large_event_merged_pdf_refused(self, organizer_client, certificate, completed_event, monkeypatch):
+        """Merged PDFs are built in memory, so events past the limit must export a ZIP."""
+        from common.config import CertificateIssuance
+
+        monkeypatch.setattr(CertificateIssuance, 'EXPORT_MERGED_PDF_MAX_CERTIFICATES', 0)
+
+        response = organizer_client.get(f'/api/v1/events/{completed_event.uuid}/certificates/export/?file_format=pdf')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['error']['code'] == 'EXPORT_TOO_LARGE'
+
+        response = organizer_client.get(f'/api/v1/events/{completed_event.uuid}/certificates/export/?file_format=zip')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_export_invalid_format(self, organizer_client, certificate, completed_event):
+        response = organizer_client.get(f'/api/v1/events/{completed_event.uuid}/certificates/export/?file_format=docx')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.django_db
 class TestMyCertificateViewSet:
     """Tests for attendee certificate viewing."""
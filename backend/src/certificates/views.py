@@ -274,6 +274,8 @@ class EventCertificateViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     lookup_field = 'uuid'
 
+    EXPORT_CONTENT_TYPES = {'zip': 'application/zip', 'pdf': 'application/pdf'}
+
     def get_queryset(self):
         event_uuid = self.kwargs.get('event_uuid')
         return Certificate.objects.filter(
@@ -307,44 +309,33 @@ class EventCertificateViewSet(viewsets.ModelViewSet):
         if not event.certificates_enabled:
             return error_response('Certificates not enabled for this event.', code='NOT_ENABLED')
 
-        issued = []
-        skipped = []
+        from .services import certificate_service
 
         if serializer.validated_data.get('issue_all_eligible'):
             # Issue to all eligible registrations
-            registrations = (
-                Registration.objects.filter(event=event, status='confirmed', deleted_at__isnull=True)
-                .filter(Q(attendance_eligible=True) | Q(attendance_override=True))
-                .exclude(certificate_issued=True)
-            )
+            registrations = list(certificate_service.get_eligible_registrations(event))
         elif serializer.validated_data.get('registration_uuids'):
-            registrations = Registration.objects.filter(
-                event=event, uuid__in=serializer.validated_data['registration_uuids'], deleted_at__isnull=True
+            registrations = list(
+                Registration.objects.filter(
+                    event=event, uuid__in=serializer.validated_data['registration_uuids'], deleted_at__isnull=True
+                ).select_related('event', 'event__owner')
             )
         else:
             registrations = []
 
+        # Check eligibility and whether already issued
+        eligible = []
+        skipped = []
         for reg in registrations:
-            # Check eligibility
-            if not reg.can_receive_certificate:
-                skipped.append(str(reg.uuid))
-                continue
-
-            # Check if already issued
-            if reg.certificate_issued:
-                skipped.append(str(reg.uuid))
-                continue
-
-            # Issue certificate using service
-            from .services import certificate_service
-
-            result = certificate_service.issue_certificate(registration=reg, issued_by=request.user)
-
-            if result['success']:
-                issued.append(str(result['certificate'].uuid))
+            if reg.can_receive_certificate and not reg.certificate_issued:
+                eligible.append(reg)
             else:
                 skipped.append(str(reg.uuid))
-                # logger.warning(f"Failed to issue certificate for {reg.uuid}: {result.get('error')}")
+
+        # Issue certificates in one batch; PDFs are rendered in the background
+        result = certificate_service.issue_bulk(event, registrations=eligible, issued_by=request.user)
+        issued = result['issued']
+        skipped.extend(error['registration_id'] for error in result['errors'])
 
         return Response(
             {
@@ -352,6 +343,7 @@ class EventCertificateViewSet(viewsets.ModelViewSet):
                 'skipped_count': len(skipped),
                 'issued': issued,
                 'skipped': skipped,
+                'batch_id': result['batch_id'],
             }
         )
 
@@ -378,6 +370,56 @@ class EventCertificateViewSet(viewsets.ModelViewSet):
 
         return Response(serializers.CertificateDetailSerializer(certificate).data)
 
+    @swagger_auto_schema(
+        operation_summary="Export certificates",
+        operation_description=(
+            "Download every active certificate for the event as a ZIP of PDFs (file_format=zip, default) "
+            "or as one merged PDF (file_format=pdf). A ZIP is streamed as it is generated; a merged PDF "
+            "is assembled before it is sent, so events with more certificates than the merged-PDF limit "
+            "must use ZIP."
+        ),
+        responses={200: 'application/zip or application/pdf', 400: '{"error": {}}'},
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request, event_uuid=None):
+        """Stream all active certificates for the event as one file."""
+        from django.http import StreamingHttpResponse
+        from django.utils.text import slugify
+
+        from common.config import CertificateIssuance
+        from events.models import Event
+
+        from .services import certificate_service
+
+        export_format = request.query_params.get('file_format', 'zip')
+        if export_format not in self.EXPORT_CONTENT_TYPES:
+            return error_response('file_format must be "zip" or "pdf".', code='INVALID_FORMAT')
+
+        try:
+            event = Event.objects.get(uuid=event_uuid, owner=request.user)
+        except Event.DoesNotExist:
+            return error_response('Event not found.', code='NOT_FOUND', status_code=status.HTTP_404_NOT_FOUND)
+
+        certificates = self.get_queryset().filter(status='active').order_by('created_at', 'id')
+        if not certificates.exists():
+            return error_response('No issued certificates to export.', code='NO_CERTIFICATES')
+
+        # A merged PDF is built in memory; large events are only exported as a streamed ZIP
+        if export_format == 'pdf' and certificates.count() > CertificateIssuance.EXPORT_MERGED_PDF_MAX_CERTIFICATES:
+            return error_response(
+                f'Events with more than {CertificateIssuance.EXPORT_MERGED_PDF_MAX_CERTIFICATES} certificates '
+                'can only be exported as a ZIP (file_format=zip).',
+                code='EXPORT_TOO_LARGE',
+            )
+
+        response = StreamingHttpResponse(
+            certificate_service.export_certificates(certificates, export_format),
+            content_type=self.EXPORT_CONTENT_TYPES[export_format],
+        )
+        filename = f"{slugify(event.title) or 'event'}-certificates.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
     @swagger_auto_schema(
         operation_summary="Certificate summary",
         operation_description="Get aggregate statistics for event certificates.",
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import FanOutJob, QueuedTask
+
+
+@admin.register(QueuedTask)
+class QueuedTaskAdmin(admin.ModelAdmin):
+    list_display = ('task_name', 'queue', 'status', 'attempts', 'max_attempts', 'available_at', 'locked_by')
+    list_filter = ('status', 'queue')
+    search_fields = ('task_name', 'last_error')
+    ordering = ('available_at',)
+    readonly_fields = ('attempts', 'locked_by', 'last_error')
+
+
+@admin.register(FanOutJob)
+class FanOutJobAdmin(admin.ModelAdmin):
+    list_display = ('task_name', 'status', 'total_items', 'total_chunks', 'completed_chunks', 'failed_chunks', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('task_name',)
+    ordering = ('-created_at',)
+    readonly_fields = ('reported_chunks', 'results', 'errors', 'completed_at')
@@ -0,0 +1,77 @@
+"""
+Attendance interval engine.
+
+Zoom reports attendance as join/leave segments per participant. Segments
+from one attendee can overlap (two devices, a reconnect while the old
+connection lingers), so summing their durations over-counts. This module
+merges an attendee's segments, clips them to the session window and returns
+the minutes actually covered.
+
+Used for event registrations (AttendanceRecord), EventSession attendance
+(SessionAttendance) and course sessions (CourseSessionAttendance).
+
+Usage:
+    minutes = covered_minutes([(join, leave), ...], window=(starts_at, ends_at))
+    minutes = covered_minutes_within([(join, leave), ...], event.attendance_windows)
+"""
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+Interval = tuple[datetime, datetime | None]
+
+
+def merge_intervals(intervals: Iterable[Interval], window: tuple | None = None) -> list[tuple[datetime, datetime]]:
+    """
+    Sort and merge overlapping or touching intervals in O(n log n).
+
+    Open intervals (no leave time yet) are ignored. With a window
+    (start, end), intervals are clipped to it first; either bound may be None.
+
+    Returns:
+        Disjoint (start, end) intervals in order
+    """
+    window_start, window_end = window or (None, None)
+    clipped = []
+    for start, end in intervals:
+        if start is None or end is None:
+            continue
+        if window_start is not None and start < window_start:
+            start = window_start
+        if window_end is not None and end > window_end:
+            end = window_end
+        if end > start:
+            clipped.append((start, end))
+
+    clipped.sort()
+    merged = []
+    for start, end in clipped:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def covered_duration(intervals: Iterable[Interval], window: tuple | None = None) -> timedelta:
+    """Total time covered by the union of intervals within the window."""
+    return sum((end - start for start, end in merge_intervals(intervals, window)), timedelta())
+
+
+def covered_minutes(intervals: Iterable[Interval], window: tuple | None = None) -> int:
+    """Whole minutes covered by the union of intervals within the window."""
+    return int(covered_duration(intervals, window).total_seconds() // 60)
+
+
+def covered_minutes_within(intervals: Iterable[Interval], windows: Iterable[tuple]) -> int:
+    """
+    Whole minutes covered by the union of intervals within the union of windows.
+
+    For attendance spread over several windows, e.g. a multi-session event's
+    sessions; windows that overlap (grace periods running into the next
+    session) count their shared time once.
+    """
+    merged = merge_intervals(intervals)
+    covered = sum((covered_duration(merged, window) for window in merge_intervals(windows)), timedelta())
+    return int(covered.total_seconds() // 60)
@@ -1,9 +1,19 @@
+import heapq
+import itertools
 import json
 import logging
-from datetime import datetime
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache, wraps
 
 from django.conf import settings
 from django.urls import reverse
+from django.utils import timezone
 from google.cloud import tasks_v2
 
 logger = logging.getLogger(__name__)
@@ -11,11 +21,156 @@ logger = logging.getLogger(__name__)
 # Registry to store task functions by name
 _TASK_REGISTRY = {}
 
+# Process-wide Cloud Tasks client (gRPC channel), created on first enqueue
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> tasks_v2.CloudTasksClient:
+    """
+    Return the shared Cloud Tasks client.
+
+    The client owns a gRPC channel and is safe to use from multiple threads,
+    so one per process avoids a connection handshake on every enqueue.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Use emulator if configured
+                if getattr(settings, 'CLOUD_TASKS_EMULATOR_HOST', ''):
+                    import os
+
+                    os.environ['CLOUD_TASKS_EMULATOR_HOST'] = settings.CLOUD_TASKS_EMULATOR_HOST
+                _client = tasks_v2.CloudTasksClient()
+    return _client
+
+
+@lru_cache(maxsize=8)
+def _handler_url(site_url: str) -> str:
+    """Absolute URL of the task handler (where this Django app handles tasks)."""
+    return f"{site_url}{reverse('common:cloud_task_handler')}"
+
+
+class RetryPolicy:
+    """
+    Declarative exponential backoff for app-level task retries.
+
+    Attach to a task with @task(retry=RetryPolicy(...)) and re-enqueue with
+    task.retry(attempt, *args, **kwargs), where attempt is the number of
+    retries already made (0 for the first failure).
+
+    Delays: backoff_base * backoff_factor ** attempt, capped at max_backoff,
+    with up to `jitter` (fraction) added so retries don't arrive in lockstep.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 60,
+        backoff_factor: float = 2,
+        max_backoff: float = 3600,
+        jitter: float = 0.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def should_retry(self, attempt: int) -> bool:
+        """True while fewer than max_retries retries have been made."""
+        return attempt < self.max_retries
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry number attempt + 1."""
+        delay = min(self.backoff_base * self.backoff_factor**attempt, self.max_backoff)
+        if self.jitter:
+            delay += delay * random.uniform(0, self.jitter)
+        return delay
+
+
+class LocalTimerQueue:
+    """
+    In-process stand-in for Cloud Tasks schedule_time, used in sync mode.
+
+    Scheduled tasks wait in a heap until their ETA. A daemon thread runs them
+    as they fall due (unless CLOUD_TASKS_LOCAL_TIMER is off, as in tests,
+    where run_due() is called explicitly). Pending tasks are lost on restart.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
+    def push(self, eta: datetime, cloud_task, args, kwargs):
+        with self._condition:
+            heapq.heappush(self._heap, (eta, next(self._counter), cloud_task, args, kwargs))
+            self._condition.notify()
+        if getattr(settings, 'CLOUD_TASKS_LOCAL_TIMER', True):
+            self._ensure_thread()
+
+    def pop_due(self, now: datetime | None = None) -> list:
+        """Remove and return (task, args, kwargs) for every entry due at now."""
+        now = now or timezone.now()
+        due = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, cloud_task, args, kwargs = heapq.heappop(self._heap)
+                due.append((cloud_task, args, kwargs))
+        return due
+
+    def run_due(self, now: datetime | None = None) -> int:
+        """Run every task that is due; returns how many ran."""
+        due = self.pop_due(now)
+        for cloud_task, args, kwargs in due:
+            try:
+                cloud_task.func(*args, **kwargs)
+            except Exception as e:
+                logger.exception(f"Scheduled task {cloud_task.name} failed: {e}")
+        return len(due)
+
+    def clear(self):
+        with self._condition:
+            self._heap.clear()
+
+    def _ensure_thread(self):
+        with self._condition:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run_forever, name='cloud-tasks-timer', daemon=True)
+            self._thread.start()
+
+    def _run_forever(self):
+        from django.db import close_old_connections
+
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                wait = (self._heap[0][0] - timezone.now()).total_seconds()
+                if wait > 0:
+                    self._condition.wait(timeout=wait)
+                    continue
+            self.run_due()
+            close_old_connections()
+
+
+# Singleton timer queue for sync mode
+local_timer_queue = LocalTimerQueue()
+
 
 class CloudTask:
-    def __init__(self, func, queue='default'):
+    def __init__(self, func, queue='default', retry=None):
         self.func = func
         self.queue = queue
+        self.retry_policy = retry
         self.name = f"{func.__module__}.{func.__name__}"
         _TASK_REGISTRY[self.name] = self
 
@@ -24,35 +179,171 @@ class CloudTask:
         return self.func(*args, **kwargs)
 
     def delay(self, *args, **kwargs):
-        """Push the task to Google Cloud Tasks."""
-        if getattr(settings, 'CLOUD_TASKS_SYNC', False):
-            # Sync mode: execute immediately instead of queueing
-            logger.info(f"Sync mode: Executing task {self.name} immediately.")
-            return self.func(*args, **kwargs)
+        """Enqueue the task on the configured backend (Cloud Tasks by default)."""
+        return get_backend().enqueue(self, args, kwargs)
+
+    def schedule(self, eta: datetime, /, *args, **kwargs):
+        """
+        Schedule task for execution at eta.
+
+        Sets schedule_time on the Cloud Task. In sync mode, tasks due now run
+        inline and future ones go on the local timer queue.
+        """
+        if timezone.is_naive(eta):
+            eta = timezone.make_aware(eta)
+        return get_backend().enqueue(self, args, kwargs, eta=eta)
+
+    def delay_for(self, seconds: float, /, *args, **kwargs):
+        """Schedule task to run after a delay in seconds."""
+        return self.schedule(timezone.now() + timedelta(seconds=seconds), *args, **kwargs)
+
+    def retry(self, attempt: int, /, *args, **kwargs) -> bool:
+        """
+        Re-enqueue the task after this task's retry policy backoff.
+
+        Args:
+            attempt: Retries already made (0 for the first failure)
+
+        Returns:
+            True if a retry was scheduled, False if retries are exhausted
+        """
+        policy = self.retry_policy or RetryPolicy()
+        if not policy.should_retry(attempt):
+            return False
+
+        backoff_seconds = policy.backoff(attempt)
+        logger.info(f"Scheduling retry {attempt + 1}/{policy.max_retries} of {self.name} in {backoff_seconds:.0f}s")
+        self.delay_for(backoff_seconds, *args, **kwargs)
+        return True
 
-        # Use emulator if configured
-        if hasattr(settings, 'CLOUD_TASKS_EMULATOR_HOST') and settings.CLOUD_TASKS_EMULATOR_HOST:
-            import os
+    def delay_many(self, arg_list: Iterable, max_workers: int | None = None, **kwargs) -> dict:
+        """
+        Enqueue one task per item in arg_list.
 
-            os.environ['CLOUD_TASKS_EMULATOR_HOST'] = settings.CLOUD_TASKS_EMULATOR_HOST
-            client = tasks_v2.CloudTasksClient()
+        With Cloud Tasks, tasks are created concurrently on a bounded thread
+        pool sharing the process-wide client; the iterable is consumed lazily.
+        In sync mode they run inline, one after another.
+
+        Args:
+            arg_list: Positional args per task (a tuple, or a single value)
+            max_workers: Concurrent create_task calls (default TaskEnqueue.WORKERS)
+            **kwargs: Keyword args passed to every task
+
+        Returns:
+            Dict with total, enqueued, and failed ([{'args', 'error'}] per item)
+        """
+        calls = (item if isinstance(item, tuple) else (item,) for item in arg_list)
+        return get_backend().enqueue_many(self, calls, kwargs, max_workers=max_workers)
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+class EnqueueResults(dict):
+    """delay_many result: {'total', 'enqueued', 'failed': [{'args', 'error'}]}."""
+
+    def __init__(self, task_name: str):
+        super().__init__(total=0, enqueued=0, failed=[])
+        self.task_name = task_name
+
+    def record(self, args: tuple, error: Exception | None = None):
+        self['total'] += 1
+        if error is None:
+            self['enqueued'] += 1
         else:
-            client = tasks_v2.CloudTasksClient()
+            logger.error(f"Failed to enqueue {self.task_name}{args}: {error}")
+            self['failed'].append({'args': args, 'error': str(error)})
+
+
+class TaskBackend:
+    """
+    Where CloudTask.delay / schedule / delay_many send work.
+
+    Selected with the TASK_BACKEND setting: 'cloud_tasks', 'sync', 'database'
+    or a dotted path to a TaskBackend subclass. When unset, CLOUD_TASKS_SYNC
+    picks between 'sync' and 'cloud_tasks'.
+    """
+
+    def enqueue(self, cloud_task: CloudTask, args: tuple, kwargs: dict, eta: datetime | None = None):
+        raise NotImplementedError
 
-        project = settings.GCP_PROJECT_ID
-        location = settings.GCP_LOCATION
-        queue = self.queue
+    def enqueue_many(self, cloud_task: CloudTask, calls: Iterable[tuple], kwargs: dict, max_workers=None) -> dict:
+        """Default: enqueue one at a time, recording per-item failures."""
+        results = EnqueueResults(cloud_task.name)
+        for args in calls:
+            try:
+                self.enqueue(cloud_task, args, kwargs)
+                results.record(args)
+            except Exception as e:
+                results.record(args, e)
+        return results
 
-        parent = client.queue_path(project, location, queue)
 
-        # Construct the task payload
-        payload = {'task': self.name, 'args': args, 'kwargs': kwargs}
+class SyncBackend(TaskBackend):
+    """Run tasks inline in the caller; future ETAs wait on the local timer queue."""
+
+    def enqueue(self, cloud_task, args, kwargs, eta=None):
+        if eta is None or eta <= timezone.now():
+            # Sync mode: execute immediately instead of queueing
+            logger.info(f"Sync mode: Executing task {cloud_task.name} immediately.")
+            return cloud_task.func(*args, **kwargs)
+
+        logger.info(f"Sync mode: Scheduling task {cloud_task.name} locally for {eta.isoformat()}")
+        local_timer_queue.push(eta, cloud_task, args, kwargs)
+        return None
+
+
+class CloudTasksBackend(TaskBackend):
+    """Push tasks to Google Cloud Tasks, which POSTs them back to the task handler."""
+
+    def enqueue(self, cloud_task, args, kwargs, eta=None):
+        return self._create_task(cloud_task, args, kwargs, schedule_time=eta)
+
+    def enqueue_many(self, cloud_task, calls, kwargs, max_workers=None):
+        from common.config import TaskEnqueue
+
+        results = EnqueueResults(cloud_task.name)
+        workers = max_workers or TaskEnqueue.WORKERS
+        parent = get_client().queue_path(settings.GCP_PROJECT_ID, settings.GCP_LOCATION, cloud_task.queue)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cloud-tasks-enqueue') as executor:
+            pending = deque()
+
+            def collect():
+                args, future = pending.popleft()
+                try:
+                    future.result()
+                    results.record(args)
+                except Exception as e:
+                    results.record(args, e)
+
+            for args in calls:
+                pending.append((args, executor.submit(self._create_task, cloud_task, args, kwargs, parent=parent, log=False)))
+                if len(pending) >= workers * TaskEnqueue.WINDOW_PER_WORKER:
+                    collect()
+            while pending:
+                collect()
+
+        logger.info(f"Enqueued {results['enqueued']}/{results['total']} {cloud_task.name} tasks")
+        return results
+
+    def _create_task(
+        self, cloud_task, args, kwargs, schedule_time: datetime | None = None, parent: str | None = None, log=True
+    ):
+        """Create the Cloud Task, optionally with a schedule_time."""
+        client = get_client()
+        parent = parent or client.queue_path(settings.GCP_PROJECT_ID, settings.GCP_LOCATION, cloud_task.queue)
+
+        # Construct the task payload; enqueued_at/eta let the handler measure queue delay
+        payload = {'task': cloud_task.name, 'args': args, 'kwargs': kwargs, 'enqueued_at': time.time()}
+        if schedule_time:
+            payload['eta'] = schedule_time.timestamp()
         json_payload = json.dumps(payload)
 
-        # Calculate the target URL (where this Django app handles tasks)
         # Assumes the app is deployed at SITE_URL
-        relative_url = reverse('common:cloud_task_handler')
-        url = f"{settings.SITE_URL}{relative_url}"
+        url = _handler_url(settings.SITE_URL)
 
         task = {
             'http_request': {
@@ -66,25 +357,29 @@ class CloudTask:
             }
         }
 
+        if schedule_time:
+            from google.protobuf import timestamp_pb2
+
+            timestamp = timestamp_pb2.Timestamp()
+            timestamp.FromDatetime(schedule_time)
+            task['schedule_time'] = timestamp
+
         try:
             response = client.create_task(request={"parent": parent, "task": task})
-            logger.info(f"Created task {response.name}")
+            if log:
+                logger.info(f"Created task {response.name}")
             return response
         except Exception as e:
-            logger.error(f"Failed to create cloud task: {e}")
+            if log:
+                logger.error(f"Failed to create cloud task: {e}")
             raise
 
-    def schedule(self, eta: datetime, *args, **kwargs):
-        """Schedule task for later execution."""
-        # Similar to delay but adds schedule_time to the task object
-        pass  # To be implemented if needed
-
 
-def task(queue='default'):
-    """Decorator to register a function as a Cloud Task."""
+def task(queue='default', retry: RetryPolicy | None = None):
+    """Decorator to register a function as a Cloud Task, optionally with a retry policy."""
 
     def decorator(func):
-        return CloudTask(func, queue=queue)
+        return CloudTask(func, queue=queue, retry=retry)
 
     return decorator
 
@@ -92,3 +387,131 @@ def task(queue='default'):
 def get_task(name):
     """Retrieve a task by name."""
     return _TASK_REGISTRY.get(name)
+
+
+# =============================================================================
+# Chunked fan-out
+# =============================================================================
+
+
+def chunk_task(queue='default', retry: RetryPolicy | None = None):
+    """
+    Decorator for the child task of map_queryset.
+
+    The function is called with (first_id, last_id, *args, **kwargs) and
+    should process its own queryset filtered to pk__range=(first_id, last_id).
+    Its return value (a dict of counts) is added to the FanOutJob. With a
+    retry policy, a chunk that raises is re-enqueued after its backoff; an
+    exception marks the chunk failed, without failing the rest of the job,
+    once retries are exhausted (or straight away without a policy).
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def run_chunk(job_id: int, index: int, first_id: int, last_id: int, *args, chunk_attempt: int = 0, **kwargs):
+            from common.models import FanOutJob
+
+            try:
+                job = FanOutJob.objects.get(pk=job_id)
+            except FanOutJob.DoesNotExist:
+                logger.error(f"Fan-out job {job_id} not found")
+                return None
+
+            try:
+                result = func(first_id, last_id, *args, **kwargs)
+            except Exception as e:
+                retry_args = (job_id, index, first_id, last_id, *args)
+                if retry and child.retry(chunk_attempt, *retry_args, chunk_attempt=chunk_attempt + 1, **kwargs):
+                    logger.warning(f"Chunk {index} ({first_id}-{last_id}) of {job.task_name} failed, retrying: {e}")
+                    return None
+                logger.exception(f"Chunk {index} ({first_id}-{last_id}) of {job.task_name} failed: {e}")
+                job.record_chunk(index, error=str(e))
+                return None
+
+            job.record_chunk(index, result)
+            return result
+
+        child = CloudTask(run_chunk, queue=queue, retry=retry)
+        return child
+
+    return decorator
+
+
+def id_ranges(queryset, chunk_size: int):
+    """Yield (first_id, last_id, count) for consecutive chunks of the queryset's primary keys."""
+    from common.config import FanOut
+
+    first_id = last_id = None
+    count = 0
+    ids = queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=FanOut.ID_SCAN_BATCH_SIZE)
+    for pk in ids:
+        if count == 0:
+            first_id = pk
+        last_id = pk
+        count += 1
+        if count == chunk_size:
+            yield first_id, last_id, count
+            count = 0
+    if count:
+        yield first_id, last_id, count
+
+
+def map_queryset(queryset, child: CloudTask, *args, chunk_size: int | None = None, **kwargs):
+    """
+    Fan work over a queryset out to one child task per chunk of rows.
+
+    The queryset's primary keys are split into contiguous ranges of
+    chunk_size rows, a FanOutJob is created to track them, and child (a
+    @chunk_task) is enqueued once per range with delay_many. Only ids cross
+    the queue, so the child re-applies its own filters within its range.
+
+    Args:
+        queryset: Rows to process
+        child: @chunk_task to run per chunk
+        *args, **kwargs: Passed to every chunk after (first_id, last_id)
+        chunk_size: Rows per chunk (default FanOut.CHUNK_SIZE)
+
+    Returns:
+        The FanOutJob (already completed in sync mode)
+    """
+    from common.config import FanOut
+    from common.models import FanOutJob
+
+    ranges = list(id_ranges(queryset, chunk_size or FanOut.CHUNK_SIZE))
+    job = FanOutJob.objects.create(
+        task_name=child.name,
+        total_items=sum(count for _, _, count in ranges),
+        total_chunks=len(ranges),
+        status=FanOutJob.Status.RUNNING if ranges else FanOutJob.Status.COMPLETED,
+        completed_at=None if ranges else timezone.now(),
+    )
+
+    results = child.delay_many(
+        ((job.id, index, first_id, last_id, *args) for index, (first_id, last_id, _) in enumerate(ranges)), **kwargs
+    )
+    for failure in results['failed']:
+        # Chunks that never reached the queue still count toward completion
+        job.record_chunk(failure['args'][1], error=f"Enqueue failed: {failure['error']}")
+
+    logger.info(f"Fanned out {job.total_items} rows to {job.total_chunks} {child.name} chunks (job {job.uuid})")
+    job.refresh_from_db()
+    return job
+
+
+TASK_BACKENDS = {
+    'sync': 'common.cloud_tasks.SyncBackend',
+    'cloud_tasks': 'common.cloud_tasks.CloudTasksBackend',
+    'database': 'common.task_queue.DatabaseBackend',
+}
+
+_backends = {}
+
+
+def get_backend() -> TaskBackend:
+    """Return the configured task backend (see TaskBackend)."""
+    name = getattr(settings, 'TASK_BACKEND', '') or ('sync' if getattr(settings, 'CLOUD_TASKS_SYNC', False) else 'cloud_tasks')
+    if name not in _backends:
+        from django.utils.module_loading import import_string
+
+        _backends[name] = import_string(TASK_BACKENDS.get(name, name))()
+    return _backends[name]
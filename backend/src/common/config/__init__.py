@@ -29,13 +29,20 @@ from .accounts import (
     JwtConfig,
     TokenExpiry,
     TokenLength,
+    ZoomApiClient,
     ZoomConfig,
+    ZoomRegistrantSync,
 )
 
 # API configuration
 from .api import (
+    CertificateIssuance,
     CertificateTemplateDimensions,
+    FanOut,
     Pagination,
+    RenderCache,
+    TaskEnqueue,
+    TaskQueue,
     ThrottleRates,
     UploadLimits,
     VerificationCodes,
@@ -51,9 +58,14 @@ from .billing import (
 
 # Events configuration
 from .events import (
+    AttendanceReconciliation,
     AttendanceThresholds,
+    ContactSync,
+    EventCounters,
     EventDuplication,
     EventDuration,
+    RegistrationImport,
+    SeatAdmission,
     SessionDefaults,
 )
 
@@ -61,6 +73,7 @@ from .events import (
 from .integrations import (
     ErrorTruncation,
     FeedbackRatings,
+    MeetingResolution,
     TimeConstants,
     WebhookConfig,
 )
@@ -86,11 +99,18 @@ __all__ = [
     'AttendanceThresholds',
     'SessionDefaults',
     'EventDuplication',
+    'AttendanceReconciliation',
+    'EventCounters',
+    'SeatAdmission',
+    'ContactSync',
+    'RegistrationImport',
     # Accounts
     'TokenExpiry',
     'TokenLength',
     'JwtConfig',
     'ZoomConfig',
+    'ZoomApiClient',
+    'ZoomRegistrantSync',
     # Learning
     'ScoringDefaults',
     'AssignmentDefaults',
@@ -98,6 +118,7 @@ __all__ = [
     'ModuleDefaults',
     # Integrations
     'WebhookConfig',
+    'MeetingResolution',
     'ErrorTruncation',
     'FeedbackRatings',
     'TimeConstants',
@@ -107,4 +128,9 @@ __all__ = [
     'UploadLimits',
     'CertificateTemplateDimensions',
     'VerificationCodes',
+    'CertificateIssuance',
+    'RenderCache',
+    'TaskEnqueue',
+    'TaskQueue',
+    'FanOut',
 ]
@@ -82,10 +82,44 @@ class ZoomConfig:
 
     - TOKEN_REFRESH_BUFFER_MINUTES: Refresh tokens this many minutes before expiry
     - MAX_ERROR_COUNT: Number of errors before deactivating connection
+    - TOKEN_CACHE_MAX_ENTRIES: Connections whose access token is cached per process
     """
 
     TOKEN_REFRESH_BUFFER_MINUTES: int = _validate_positive(5, 'ZoomConfig.TOKEN_REFRESH_BUFFER_MINUTES')
     MAX_ERROR_COUNT: int = _validate_positive(5, 'ZoomConfig.MAX_ERROR_COUNT')
+    TOKEN_CACHE_MAX_ENTRIES: int = _validate_positive(1024, 'ZoomConfig.TOKEN_CACHE_MAX_ENTRIES')
+
+
+class ZoomApiClient:
+    """
+    Pooled, rate-limited Zoom API client (accounts.zoom_client).
+
+    - POOL_MAXSIZE: Keep-alive connections per Zoom account
+    - TIMEOUT_SECONDS: Per-request timeout
+    - RATE_PER_SECOND: Starting request rate per account, until Zoom's rate-limit headers say otherwise
+    - BURST: Requests that may go out back to back before the rate applies
+    - MAX_429_RETRIES: Retries of a rate-limited request before returning the 429
+    - MAX_WAIT_SECONDS: Longest Retry-After honored in-process; longer (daily limits) returns the 429
+    - MAX_CLIENTS: Accounts with a cached client before LRU eviction
+    """
+
+    POOL_MAXSIZE: int = _validate_positive(10, 'ZoomApiClient.POOL_MAXSIZE')
+    TIMEOUT_SECONDS: int = _validate_positive(30, 'ZoomApiClient.TIMEOUT_SECONDS')
+    RATE_PER_SECOND: int = _validate_positive(10, 'ZoomApiClient.RATE_PER_SECOND')
+    BURST: int = _validate_positive(10, 'ZoomApiClient.BURST')
+    MAX_429_RETRIES: int = _validate_positive(3, 'ZoomApiClient.MAX_429_RETRIES')
+    MAX_WAIT_SECONDS: int = _validate_positive(60, 'ZoomApiClient.MAX_WAIT_SECONDS')
+    MAX_CLIENTS: int = _validate_positive(256, 'ZoomApiClient.MAX_CLIENTS')
+
+
+class ZoomRegistrantSync:
+    """
+    Bulk registrant sync (ZoomService.sync_meeting_registrants).
+
+    - BATCH_SIZE: Registrants per batch_registrants call (Zoom accepts at most 30)
+    """
+
+    BATCH_SIZE: int = _validate_positive(30, 'ZoomRegistrantSync.BATCH_SIZE')
 
 
 # =============================================================================
@@ -97,4 +131,6 @@ __all__ = [
     'TokenLength',
     'JwtConfig',
     'ZoomConfig',
+    'ZoomApiClient',
+    'ZoomRegistrantSync',
 ]
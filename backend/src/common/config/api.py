@@ -7,8 +7,13 @@ Centralizes all API-related magic numbers including:
 - Upload limits
 - Certificate template dimensions
 - Verification code settings
+- Certificate issuance batching
+- Template render cache
+- Task enqueueing and database task queue
 """
 
+import os
+
 from django.core.exceptions import ImproperlyConfigured
 
 # =============================================================================
@@ -122,6 +127,101 @@ class VerificationCodes:
     URL_TOKEN_LENGTH: int = _validate_positive(16, 'VerificationCodes.URL_TOKEN_LENGTH')
 
 
+# =============================================================================
+# Certificate Issuance Configuration
+# =============================================================================
+
+
+class CertificateIssuance:
+    """
+    Bulk certificate issuance settings.
+
+    - BULK_CREATE_BATCH_SIZE: Rows per INSERT when creating certificates in bulk
+    - RENDER_CHUNK_SIZE: Certificates rendered and uploaded per fan-out task
+    - RENDER_WORKERS: PDF render worker processes per instance (1 = render in-process)
+    - RENDER_QUEUE_DEPTH: Jobs in flight per render worker before the producer blocks
+    - EXPORT_CHUNK_SIZE: Bytes per chunk when streaming an event export
+    - EXPORT_SPOOL_MAX_BYTES: Merged-PDF exports larger than this are spooled to disk
+    - EXPORT_MERGED_PDF_MAX_CERTIFICATES: Largest event exported as one merged PDF (larger ones must use ZIP)
+    """
+
+    BULK_CREATE_BATCH_SIZE: int = _validate_positive(500, 'CertificateIssuance.BULK_CREATE_BATCH_SIZE')
+    RENDER_CHUNK_SIZE: int = _validate_positive(50, 'CertificateIssuance.RENDER_CHUNK_SIZE')
+    RENDER_WORKERS: int = _validate_positive(int(os.environ.get('CERTIFICATE_RENDER_WORKERS', 1)), 'CERTIFICATE_RENDER_WORKERS')
+    RENDER_QUEUE_DEPTH: int = _validate_positive(2, 'CertificateIssuance.RENDER_QUEUE_DEPTH')
+    EXPORT_CHUNK_SIZE: int = _validate_positive(64 * 1024, 'CertificateIssuance.EXPORT_CHUNK_SIZE')
+    EXPORT_SPOOL_MAX_BYTES: int = _validate_positive(16 * 1024 * 1024, 'CertificateIssuance.EXPORT_SPOOL_MAX_BYTES')
+    EXPORT_MERGED_PDF_MAX_CERTIFICATES: int = _validate_positive(500, 'CertificateIssuance.EXPORT_MERGED_PDF_MAX_CERTIFICATES')
+
+
+# =============================================================================
+# Template Render Cache
+# =============================================================================
+
+
+class RenderCache:
+    """
+    Per-process cache of downloaded and parsed certificate/badge templates.
+
+    - TEMPLATE_MAX_BYTES: Approximate memory budget for cached templates before LRU eviction
+    - FONT_MAX_ENTRIES: Loaded (font, size) pairs kept for badge rendering
+    """
+
+    TEMPLATE_MAX_BYTES: int = _validate_positive(
+        int(os.environ.get('TEMPLATE_CACHE_MAX_BYTES', 64 * 1024 * 1024)), 'TEMPLATE_CACHE_MAX_BYTES'
+    )
+    FONT_MAX_ENTRIES: int = _validate_positive(64, 'RenderCache.FONT_MAX_ENTRIES')
+
+
+# =============================================================================
+# Task Enqueueing
+# =============================================================================
+
+
+class TaskEnqueue:
+    """
+    Bulk task enqueueing (CloudTask.delay_many).
+
+    - WORKERS: Concurrent create_task calls per delay_many
+    - WINDOW_PER_WORKER: Enqueues in flight per worker before the producer waits
+    """
+
+    WORKERS: int = _validate_positive(int(os.environ.get('CLOUD_TASKS_ENQUEUE_WORKERS', 16)), 'CLOUD_TASKS_ENQUEUE_WORKERS')
+    WINDOW_PER_WORKER: int = _validate_positive(4, 'TaskEnqueue.WINDOW_PER_WORKER')
+
+
+class TaskQueue:
+    """
+    Database task queue (TASK_BACKEND='database') and run_task_worker.
+
+    - VISIBILITY_TIMEOUT_SECONDS: A claimed task is retried by another worker if not finished in time
+    - MAX_ATTEMPTS: Claims before a failing task is dead-lettered
+    - RETRY_BACKOFF_SECONDS: Base backoff for failed tasks without their own RetryPolicy
+    - POLL_INTERVAL_SECONDS: Worker sleep when the queue is empty
+    - BULK_ENQUEUE_BATCH_SIZE: Rows per INSERT for delay_many
+    """
+
+    VISIBILITY_TIMEOUT_SECONDS: int = _validate_positive(
+        int(os.environ.get('TASK_QUEUE_VISIBILITY_TIMEOUT', 600)), 'TASK_QUEUE_VISIBILITY_TIMEOUT'
+    )
+    MAX_ATTEMPTS: int = _validate_positive(int(os.environ.get('TASK_QUEUE_MAX_ATTEMPTS', 5)), 'TASK_QUEUE_MAX_ATTEMPTS')
+    RETRY_BACKOFF_SECONDS: int = _validate_positive(30, 'TaskQueue.RETRY_BACKOFF_SECONDS')
+    POLL_INTERVAL_SECONDS: int = _validate_positive(1, 'TaskQueue.POLL_INTERVAL_SECONDS')
+    BULK_ENQUEUE_BATCH_SIZE: int = _validate_positive(500, 'TaskQueue.BULK_ENQUEUE_BATCH_SIZE')
+
+
+class FanOut:
+    """
+    Chunked fan-out of event-wide tasks (cloud_tasks.map_queryset).
+
+    - CHUNK_SIZE: Rows per child task; keep one chunk well inside the request timeout
+    - ID_SCAN_BATCH_SIZE: Primary keys fetched per round trip while splitting into ranges
+    """
+
+    CHUNK_SIZE: int = _validate_positive(int(os.environ.get('FANOUT_CHUNK_SIZE', 200)), 'FANOUT_CHUNK_SIZE')
+    ID_SCAN_BATCH_SIZE: int = _validate_positive(2000, 'FanOut.ID_SCAN_BATCH_SIZE')
+
+
 # =============================================================================
 # Exports
 # =============================================================================
@@ -132,4 +232,9 @@ __all__ = [
     'UploadLimits',
     'CertificateTemplateDimensions',
     'VerificationCodes',
+    'CertificateIssuance',
+    'RenderCache',
+    'TaskEnqueue',
+    'TaskQueue',
+    'FanOut',
 ]
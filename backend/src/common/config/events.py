@@ -6,6 +6,8 @@ Centralizes all event-related magic numbers including:
 - Attendance thresholds for certificates
 - Session defaults
 - Event duplication settings
+- Attendance reconciliation batching
+- Registration admission, contact sync and bulk import
 """
 
 from django.core.exceptions import ImproperlyConfigured
@@ -106,6 +108,77 @@ class EventDuplication:
     DAYS_OFFSET: int = _validate_positive(7, 'EventDuplication.DAYS_OFFSET')
 
 
+# =============================================================================
+# Attendance Reconciliation
+# =============================================================================
+
+
+class AttendanceReconciliation:
+    """
+    Settings for attendance calculation and set-based reconciliation (AttendanceMatcher.match_attendance).
+
+    - BULK_UPDATE_BATCH_SIZE: Registrations written per bulk_update query
+    - WINDOW_GRACE_MINUTES: Minutes after a session's scheduled end that still count (overruns)
+    - REPORT_IMPORT_CHUNK_SIZE: Participant report segments upserted per chunk (AttendanceMatcher.import_participant_report)
+    - REPORT_IMPORT_DELAY_MINUTES: Wait after meeting.ended before importing the report (Zoom builds it after the meeting)
+    """
+
+    BULK_UPDATE_BATCH_SIZE: int = _validate_positive(500, 'AttendanceReconciliation.BULK_UPDATE_BATCH_SIZE')
+    WINDOW_GRACE_MINUTES: int = _validate_non_negative(30, 'AttendanceReconciliation.WINDOW_GRACE_MINUTES')
+    REPORT_IMPORT_CHUNK_SIZE: int = _validate_positive(500, 'AttendanceReconciliation.REPORT_IMPORT_CHUNK_SIZE')
+    REPORT_IMPORT_DELAY_MINUTES: int = _validate_non_negative(30, 'AttendanceReconciliation.REPORT_IMPORT_DELAY_MINUTES')
+
+
+class EventCounters:
+    """
+    Drift repair for Event's denormalized registration counters (events.tasks.recount_event_counters).
+
+    - RECOUNT_RECENT_DAYS: Recount non-draft events starting within this many days back (and all upcoming ones)
+    """
+
+    RECOUNT_RECENT_DAYS: int = _validate_positive(30, 'EventCounters.RECOUNT_RECENT_DAYS')
+
+
+class SeatAdmission:
+    """
+    Admission control for capacity-limited events (registrations.admission).
+
+    - HOLD_MINUTES: How long a new unpaid (pending) registration holds its seat
+    - PROMOTION_HOLD_HOURS: How long a paid-event waitlist promotion holds its seat for payment
+    """
+
+    HOLD_MINUTES: int = _validate_positive(15, 'SeatAdmission.HOLD_MINUTES')
+    PROMOTION_HOLD_HOURS: int = _validate_positive(48, 'SeatAdmission.PROMOTION_HOLD_HOURS')
+
+
+class ContactSync:
+    """
+    Registration side effects on the organizer's contacts, drained from the outbox (contacts.outbox).
+
+    - BATCH_SIZE: Outbox entries applied per drain round
+    - COALESCE_SECONDS: Delay before an organizer's drain runs, so a burst of registrations lands in one batch
+    - MAX_ATTEMPTS: Failed drain rounds after which an entry is left for inspection
+    """
+
+    BATCH_SIZE: int = _validate_positive(500, 'ContactSync.BATCH_SIZE')
+    COALESCE_SECONDS: int = _validate_positive(10, 'ContactSync.COALESCE_SECONDS')
+    MAX_ATTEMPTS: int = _validate_positive(5, 'ContactSync.MAX_ATTEMPTS')
+
+
+class RegistrationImport:
+    """
+    Bulk attendee import from a CSV/JSON file (registrations.imports).
+
+    - CHUNK_SIZE: Rows validated, deduplicated and inserted together
+    - MAX_ROWS: Rows read from one file; the rest are reported as not imported
+    - MAX_REPORTED_ROWS: Skipped and failed rows listed in the response (all are counted)
+    """
+
+    CHUNK_SIZE: int = _validate_positive(500, 'RegistrationImport.CHUNK_SIZE')
+    MAX_ROWS: int = _validate_positive(20000, 'RegistrationImport.MAX_ROWS')
+    MAX_REPORTED_ROWS: int = _validate_positive(1000, 'RegistrationImport.MAX_REPORTED_ROWS')
+
+
 # =============================================================================
 # Exports
 # =============================================================================
@@ -115,4 +188,9 @@ __all__ = [
     'AttendanceThresholds',
     'SessionDefaults',
     'EventDuplication',
+    'AttendanceReconciliation',
+    'EventCounters',
+    'SeatAdmission',
+    'ContactSync',
+    'RegistrationImport',
 ]
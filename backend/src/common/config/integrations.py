@@ -32,10 +32,28 @@ class WebhookConfig:
 
     - LOG_RETENTION_DAYS: How long to keep webhook logs before cleanup
     - MAX_RETRY_ATTEMPTS: Maximum times to retry failed webhook processing
+    - BATCH_SIZE: Zoom logs claimed per drain round (ZOOM_WEBHOOK_INGESTION='batched')
+    - COALESCE_SECONDS: Delay before a meeting's drain runs, so a burst of webhooks lands in one batch
     """
 
     LOG_RETENTION_DAYS: int = _validate_positive(90, 'WebhookConfig.LOG_RETENTION_DAYS')
     MAX_RETRY_ATTEMPTS: int = _validate_positive(3, 'WebhookConfig.MAX_RETRY_ATTEMPTS')
+    BATCH_SIZE: int = _validate_positive(500, 'WebhookConfig.BATCH_SIZE')
+    COALESCE_SECONDS: int = _validate_positive(5, 'WebhookConfig.COALESCE_SECONDS')
+
+
+class MeetingResolution:
+    """
+    Per-process cache of Zoom meeting ID -> Event/CourseSession (integrations.meeting_resolver).
+
+    - MAX_ENTRIES: Meeting IDs kept before LRU eviction
+    - TTL_SECONDS: How long a resolved meeting is trusted (bounds staleness across processes)
+    - NEGATIVE_TTL_SECONDS: How long an unknown meeting ID is remembered
+    """
+
+    MAX_ENTRIES: int = _validate_positive(10000, 'MeetingResolution.MAX_ENTRIES')
+    TTL_SECONDS: int = _validate_positive(300, 'MeetingResolution.TTL_SECONDS')
+    NEGATIVE_TTL_SECONDS: int = _validate_positive(60, 'MeetingResolution.NEGATIVE_TTL_SECONDS')
 
 
 # =============================================================================
@@ -101,6 +119,7 @@ class TimeConstants:
 
 __all__ = [
     'WebhookConfig',
+    'MeetingResolution',
     'ErrorTruncation',
     'FeedbackRatings',
     'TimeConstants',
@@ -0,0 +1,82 @@
+"""
+Coalesced F() deltas for denormalized counter columns.
+
+Instead of recounting related rows, callers report what changed:
+
+    from common.counters import counter_deltas
+
+    counter_deltas.add(Event, event.pk, registration_count=1, waitlist_count=-1)
+
+A delta is applied once the surrounding transaction commits, so rolled-back
+work never reaches the counters. Inside counter_deltas.coalesce(), which
+wraps every request (CoalesceCounterDeltasMiddleware) and every task run
+(run_instrumented), committed deltas are summed per row and written with one
+UPDATE per row when the block exits. Elsewhere each one is written at commit.
+
+Deltas can drift from the truth (queryset updates bypass them), so counters
+kept this way should also have a periodic full recount.
+"""
+
+import logging
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+logger = logging.getLogger(__name__)
+
+
+class CounterDeltas:
+    """
+    Per-thread buffer of counter deltas, keyed by (model, pk).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def add(self, model, pk, **deltas: int):
+        """Queue deltas (field=change) for one row, applied when the current transaction commits."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            transaction.on_commit(partial(self._committed, model, pk, deltas))
+
+    @contextmanager
+    def coalesce(self):
+        """Hold committed deltas until the block exits, then write one UPDATE per row. Nests."""
+        if getattr(self._local, 'pending', None) is not None:
+            yield
+            return
+
+        self._local.pending = defaultdict(Counter)
+        try:
+            yield
+        finally:
+            pending, self._local.pending = self._local.pending, None
+            for (model, pk), deltas in pending.items():
+                self._apply(model, pk, deltas)
+
+    def _committed(self, model, pk, deltas: dict):
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            self._apply(model, pk, deltas)
+        else:
+            pending[(model, pk)].update(deltas)
+
+    def _apply(self, model, pk, deltas: dict):
+        """One UPDATE for a row's summed deltas; counters never go below zero."""
+        updates = {field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items() if delta}
+        if not updates:
+            return
+        try:
+            model._base_manager.filter(pk=pk).update(**updates)
+        except Exception:
+            # Counters are repaired by the periodic recount; never fail the request or task over them
+            logger.exception(f"Failed to apply counter deltas {dict(deltas)} to {model.__name__} {pk}")
+
+
+# Singleton instance
+counter_deltas = CounterDeltas()
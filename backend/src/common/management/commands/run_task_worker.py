@@ -0,0 +1,45 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from common.task_queue import TaskWorker, requeue_dead
+
+
+class Command(BaseCommand):
+    help = "Run workers for the database task queue (TASK_BACKEND='database')"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Concurrent worker threads')
+        parser.add_argument(
+            '--queue',
+            action='append',
+            dest='queues',
+            default=[],
+            help='Queue to consume (repeatable; default: all queues)',
+        )
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds to sleep when no task is due')
+        parser.add_argument('--drain', action='store_true', help='Exit once no task is due instead of polling')
+        parser.add_argument('--requeue-dead', action='store_true', help='Move dead-lettered tasks back to the queue first')
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            count = requeue_dead(options['queues'])
+            self.stdout.write(f"Requeued {count} dead-lettered tasks")
+
+        worker = TaskWorker(
+            concurrency=options['workers'],
+            queues=options['queues'],
+            poll_interval=options['poll_interval'],
+        )
+
+        # Finish in-flight tasks on SIGTERM (e.g. container shutdown)
+        signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Task Worker'))
+        self.stdout.write(f"Worker: {worker.name}")
+        self.stdout.write(f"Threads: {worker.concurrency}")
+        self.stdout.write(f"Queues: {', '.join(options['queues']) or 'all'}")
+
+        worker.run(drain=options['drain'])
+
+        self.stdout.write(self.style.SUCCESS(f"Stopped after {worker.processed} tasks"))
@@ -0,0 +1,21 @@
+"""
+Request middleware.
+"""
+
+from common.counters import counter_deltas
+
+
+class CoalesceCounterDeltasMiddleware:
+    """
+    Coalesce counter deltas (common.counters) for the whole request.
+
+    Several changes to one row's counters in a request become a single
+    UPDATE, written after the response is produced.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with counter_deltas.coalesce():
+            return self.get_response(request)
@@ -0,0 +1,62 @@
+# Generated by Django 6.0 on 2026-10-16 20:44
+
+import uuid
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last modified')),
+                (
+                    'uuid',
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text='Public identifier for external use',
+                        unique=True,
+                    ),
+                ),
+                ('task_name', models.CharField(max_length=255)),
+                ('queue', models.CharField(default='default', max_length=100)),
+                ('args', models.JSONField(blank=True, default=list)),
+                ('kwargs', models.JSONField(blank=True, default=dict)),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[('pending', 'Pending'), ('running', 'Running'), ('dead', 'Dead Letter')],
+                        default='pending',
+                        max_length=20,
+                    ),
+                ),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Times the task has been claimed')),
+                ('max_attempts', models.PositiveIntegerField(default=5)),
+                (
+                    'available_at',
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text='Not claimable before this time (ETA, retry backoff or visibility timeout)',
+                    ),
+                ),
+                ('locked_by', models.CharField(blank=True, help_text='Worker that last claimed the task', max_length=100)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'queued_tasks',
+                'ordering': ['available_at', 'id'],
+                'indexes': [models.Index(fields=['queue', 'status', 'available_at'], name='queued_task_queue_9ae2a8_idx')],
+            },
+        ),
+    ]
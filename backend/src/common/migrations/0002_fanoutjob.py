@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-16 20:50
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FanOutJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last modified')),
+                (
+                    'uuid',
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text='Public identifier for external use',
+                        unique=True,
+                    ),
+                ),
+                ('task_name', models.CharField(help_text='Child task run per chunk', max_length=255)),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[('running', 'Running'), ('completed', 'Completed')],
+                        db_index=True,
+                        default='running',
+                        max_length=20,
+                    ),
+                ),
+                ('total_items', models.PositiveIntegerField(default=0)),
+                ('total_chunks', models.PositiveIntegerField(default=0)),
+                ('completed_chunks', models.PositiveIntegerField(default=0)),
+                ('failed_chunks', models.PositiveIntegerField(default=0)),
+                ('reported_chunks', models.JSONField(blank=True, default=list, help_text='Chunk indexes already recorded')),
+                ('results', models.JSONField(blank=True, default=dict, help_text='Sum of numeric chunk results')),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'fan_out_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -2,6 +2,8 @@
 Abstract base models for the CPD Events platform.
 
 All models in other apps should inherit from these base classes.
+Also holds QueuedTask, the table behind the database task backend, and
+FanOutJob, the parent record of chunked fan-out tasks.
 """
 
 import uuid
@@ -162,3 +164,114 @@ class SoftDeleteModel(BaseModel):
     def is_deleted(self):
         """Return True if record is soft-deleted."""
         return self.deleted_at is not None
+
+
+class QueuedTask(BaseModel):
+    """
+    A task waiting in the durable database queue (TASK_BACKEND='database').
+
+    Rows are claimed by `manage.py run_task_worker`. A claimed row becomes
+    invisible to other workers until available_at (its visibility timeout)
+    passes; if the worker dies, the task is claimed again. Succeeded tasks are
+    deleted; tasks that fail max_attempts times are kept as DEAD for
+    inspection and can be requeued.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        DEAD = 'dead', 'Dead Letter'
+
+    task_name = models.CharField(max_length=255)
+    queue = models.CharField(max_length=100, default='default')
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0, help_text="Times the task has been claimed")
+    max_attempts = models.PositiveIntegerField(default=5)
+    available_at = models.DateTimeField(
+        default=timezone.now, help_text="Not claimable before this time (ETA, retry backoff or visibility timeout)"
+    )
+    locked_by = models.CharField(max_length=100, blank=True, help_text="Worker that last claimed the task")
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'queued_tasks'
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['queue', 'status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+
+class FanOutJob(BaseModel):
+    """
+    Parent record of a chunked fan-out (cloud_tasks.map_queryset).
+
+    The work is split into primary-key ranges, one child task per range.
+    Each child reports back with record_chunk(), which adds its result to the
+    aggregate and completes the job once every chunk has reported.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+
+    task_name = models.CharField(max_length=255, help_text="Child task run per chunk")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING, db_index=True)
+
+    # Progress (updated by chunk tasks)
+    total_items = models.PositiveIntegerField(default=0)
+    total_chunks = models.PositiveIntegerField(default=0)
+    completed_chunks = models.PositiveIntegerField(default=0)
+    failed_chunks = models.PositiveIntegerField(default=0)
+    reported_chunks = models.JSONField(default=list, blank=True, help_text="Chunk indexes already recorded")
+    results = models.JSONField(default=dict, blank=True, help_text="Sum of numeric chunk results")
+    errors = models.JSONField(default=list, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'fan_out_jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.task_name}: {self.completed_chunks + self.failed_chunks}/{self.total_chunks}"
+
+    @property
+    def progress_percent(self):
+        """Percentage of chunks processed (completed or failed)."""
+        if self.total_chunks == 0:
+            return 100
+        return int(((self.completed_chunks + self.failed_chunks) / self.total_chunks) * 100)
+
+    def record_chunk(self, index: int, result=None, error: str | None = None):
+        """
+        Add one chunk's outcome and complete the job when all chunks have reported.
+
+        Numeric values in a dict result are summed into results. Safe to call
+        concurrently; a chunk redelivered by the queue is only counted once.
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            job = FanOutJob.objects.select_for_update().get(pk=self.pk)
+            if index not in job.reported_chunks:
+                job.reported_chunks.append(index)
+                if error is None:
+                    job.completed_chunks += 1
+                    for key, value in (result if isinstance(result, dict) else {}).items():
+                        if isinstance(value, int | float) and not isinstance(value, bool):
+                            job.results[key] = job.results.get(key, 0) + value
+                else:
+                    job.failed_chunks += 1
+                    job.errors.append({'chunk': index, 'error': error})
+
+                if job.completed_chunks + job.failed_chunks >= job.total_chunks:
+                    job.status = self.Status.COMPLETED
+                    job.completed_at = timezone.now()
+                job.save()
+
+        self.refresh_from_db()
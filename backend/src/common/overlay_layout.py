@@ -0,0 +1,144 @@
+"""
+Precompiled text overlay layouts for certificate and badge rendering.
+
+Templates store field positions as editor JSON ({field: {x, y, fontSize, ...}},
+top-left origin). Compiling that JSON once per template version resolves
+fonts, converts coordinates and fixes the draw order, so rendering an
+attendee only substitutes strings into the slots.
+
+Usage:
+    layout = OverlayLayout.for_pdf(template.field_positions, page_size=(width, height))
+    layout.draw_pdf(canvas, data)
+
+    layout = OverlayLayout.for_image(template.field_positions)
+    layout.draw_image(ImageDraw.Draw(img), data)
+"""
+
+from typing import Any, NamedTuple
+
+DEFAULT_X = 100
+DEFAULT_Y = 100
+PDF_FALLBACK_FONT = 'Helvetica'
+IMAGE_FONT = 'DejaVuSans.ttf'
+
+
+class FieldSlot(NamedTuple):
+    """A single text field with everything needed to draw it resolved."""
+
+    name: str
+    x: float
+    y: float
+    font: Any  # PDF: registered font name; image: loaded Pillow font
+    font_size: int
+    color: str | None
+
+
+class OverlayLayout(NamedTuple):
+    """
+    Immutable, ordered list of text slots for one template version.
+
+    PDF layouts carry absolute PDF coordinates (bottom-left origin) for the
+    page size they were compiled against; image layouts keep pixel
+    coordinates. Layouts hold only plain values for PDFs, so they can be sent
+    to render worker processes.
+    """
+
+    page_width: float | None
+    page_height: float | None
+    slots: tuple[FieldSlot, ...]
+
+    @classmethod
+    def for_pdf(cls, field_positions: dict | None, page_size: tuple, default_font_size: int = 12) -> 'OverlayLayout':
+        """
+        Compile field positions for drawing on a reportlab canvas.
+
+        Args:
+            field_positions: Dict of {field_name: {x, y, fontSize, fontFamily}}
+            page_size: (width, height) of the page in points
+            default_font_size: Size used when a field has none
+        """
+        from reportlab.pdfbase import pdfmetrics
+
+        page_width, page_height = (float(v) for v in page_size)
+        slots = []
+        for name, position in _enabled_fields(field_positions):
+            font_family = position.get('fontFamily', position.get('font', PDF_FALLBACK_FONT))
+            try:
+                pdfmetrics.getFont(font_family)
+            except KeyError:
+                font_family = PDF_FALLBACK_FONT
+
+            slots.append(
+                FieldSlot(
+                    name=name,
+                    x=position.get('x', DEFAULT_X),
+                    y=page_height - position.get('y', DEFAULT_Y),  # Convert from top-left to PDF coords
+                    font=font_family,
+                    font_size=position.get('fontSize', position.get('font_size', default_font_size)),
+                    color=None,
+                )
+            )
+        return cls(page_width=page_width, page_height=page_height, slots=tuple(slots))
+
+    @classmethod
+    def for_image(cls, field_positions: dict | None, default_font_size: int = 24) -> 'OverlayLayout':
+        """
+        Compile field positions for drawing on a Pillow image.
+
+        Args:
+            field_positions: Dict of {field_name: {x, y, fontSize, color, enabled}}
+            default_font_size: Size used when a field has none
+        """
+        from common.template_cache import load_font
+
+        slots = []
+        for name, position in _enabled_fields(field_positions):
+            font_size = position.get('fontSize', position.get('font_size', default_font_size))
+            slots.append(
+                FieldSlot(
+                    name=name,
+                    x=position.get('x', DEFAULT_X),
+                    y=position.get('y', DEFAULT_Y),
+                    # In a real app, you'd load custom fonts from files
+                    font=load_font(IMAGE_FONT, font_size),
+                    font_size=font_size,
+                    color=position.get('color', '#000000'),
+                )
+            )
+        return cls(page_width=None, page_height=None, slots=tuple(slots))
+
+    def draw_pdf(self, canvas, data: dict, placeholders: bool = False):
+        """
+        Draw data onto a reportlab canvas.
+
+        Args:
+            canvas: reportlab Canvas sized to (page_width, page_height)
+            data: Dict of {field_name: value}; empty values are skipped
+            placeholders: Draw the field name when a value is missing (previews)
+        """
+        from reportlab.lib.colors import black
+
+        canvas.setFillColor(black)
+        for slot in self.slots:
+            text = data.get(slot.name, slot.name if placeholders else '')
+            if not text:
+                continue
+            canvas.setFont(slot.font, slot.font_size)
+            canvas.drawString(slot.x, slot.y, str(text))
+
+    def draw_image(self, draw, data: dict):
+        """Draw data onto a Pillow ImageDraw; empty values are skipped."""
+        for slot in self.slots:
+            text = data.get(slot.name, '')
+            if not text:
+                continue
+            draw.text((slot.x, slot.y), str(text), font=slot.font, fill=slot.color)
+
+
+def _enabled_fields(field_positions: dict | None):
+    """Yield (name, position) in editor order, skipping fields switched off with enabled=False."""
+    for name, position in (field_positions or {}).items():
+        # Defaults to enabled for backward compatibility
+        if position.get('enabled', True) is False:
+            continue
+        yield name, position
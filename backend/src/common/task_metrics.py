@@ -0,0 +1,172 @@
+"""
+Task execution instrumentation.
+
+Every task run by the Cloud Tasks handler or the database queue worker goes
+through run_instrumented(), which measures:
+- duration (wall clock, ms)
+- queue delay: time from enqueue (or ETA, for scheduled tasks) to start
+- database queries executed
+- failures (exception class)
+
+Each run is logged as one JSON line on the 'common.task_metrics' logger, for
+log-based metrics across instances. Totals and latency histograms are also
+kept per process and served by TaskMetricsView.
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from django.db import connection
+
+from common.counters import counter_deltas
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) for duration and queue-delay histograms; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000, 900000, 3600000)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus style: counts per upper bound, plus sum and count)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        labels = [str(b) for b in self.buckets] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 1),
+            'mean': round(self.sum / self.count, 1) if self.count else None,
+            'buckets': dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class TaskStats:
+    """Aggregates for one task name."""
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.errors = {}
+        self.duration_ms = Histogram()
+        self.queue_delay_ms = Histogram()
+
+    def snapshot(self) -> dict:
+        return {
+            'runs': self.runs,
+            'failures': self.failures,
+            'failure_rate': round(self.failures / self.runs, 4) if self.runs else 0,
+            'queries': self.queries,
+            'max_queries': self.max_queries,
+            'errors': dict(self.errors),
+            'duration_ms': self.duration_ms.snapshot(),
+            'queue_delay_ms': self.queue_delay_ms.snapshot(),
+        }
+
+
+class TaskMetrics:
+    """Per-process task metrics registry."""
+
+    def __init__(self):
+        self._stats: dict[str, TaskStats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, name: str, duration_ms: float, queue_delay_ms: float | None, queries: int, error: str | None):
+        with self._lock:
+            stats = self._stats.setdefault(name, TaskStats())
+            stats.runs += 1
+            stats.queries += queries
+            stats.max_queries = max(stats.max_queries, queries)
+            stats.duration_ms.observe(duration_ms)
+            if queue_delay_ms is not None:
+                stats.queue_delay_ms.observe(queue_delay_ms)
+            if error:
+                stats.failures += 1
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'since': self.started_at,
+                'tasks': {name: stats.snapshot() for name, stats in sorted(self._stats.items())},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+
+# Singleton instance
+task_metrics = TaskMetrics()
+
+
+class _QueryCounter:
+    """connection.execute_wrapper that counts queries without recording SQL."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_instrumented(cloud_task, args, kwargs, enqueued_at: float | None = None, source: str = 'cloud_tasks'):
+    """
+    Run a task's function, recording duration, queue delay, query count and failure.
+
+    Args:
+        cloud_task: CloudTask to run
+        args, kwargs: Task arguments
+        enqueued_at: Epoch seconds the task became runnable (enqueue time or ETA)
+        source: Where the task was dispatched from, for the log line
+
+    Returns:
+        The task's return value (exceptions are recorded and re-raised)
+    """
+    started = time.time()
+    queue_delay_ms = max(0.0, (started - enqueued_at) * 1000) if enqueued_at else None
+    counter = _QueryCounter()
+    error = None
+
+    try:
+        # Counter deltas from the whole run are written once, at the end (common.counters)
+        with connection.execute_wrapper(counter), counter_deltas.coalesce():
+            return cloud_task.func(*args, **kwargs)
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        duration_ms = (time.time() - started) * 1000
+        task_metrics.record(cloud_task.name, duration_ms, queue_delay_ms, counter.count, error)
+        logger.info(
+            json.dumps(
+                {
+                    'event': 'task_run',
+                    'task': cloud_task.name,
+                    'queue': cloud_task.queue,
+                    'source': source,
+                    'status': 'error' if error else 'success',
+                    'error': error,
+                    'duration_ms': round(duration_ms, 1),
+                    'queue_delay_ms': round(queue_delay_ms, 1) if queue_delay_ms is not None else None,
+                    'queries': counter.count,
+                }
+            )
+        )
@@ -0,0 +1,267 @@
+"""
+Durable database task queue.
+
+A stand-in for Cloud Tasks outside GCP (TASK_BACKEND='database'): delay()
+and schedule() insert QueuedTask rows and `manage.py run_task_worker` runs
+them on N worker threads, so requests never block on task execution.
+
+Delivery is at-least-once, like Cloud Tasks:
+- Claiming a task hides it for VISIBILITY_TIMEOUT_SECONDS; if the worker
+  dies, the task becomes claimable again when the timeout lapses.
+- A task that raises is retried with backoff (the task's RetryPolicy, or
+  RETRY_BACKOFF_SECONDS doubling).
+- After MAX_ATTEMPTS claims, the task is dead-lettered (status DEAD) and
+  kept for inspection; requeue_dead() puts dead tasks back in the queue.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common.cloud_tasks import EnqueueResults, RetryPolicy, TaskBackend, get_task
+from common.config import TaskQueue
+from common.models import QueuedTask
+from common.task_metrics import run_instrumented
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseBackend(TaskBackend):
+    """Insert tasks into the QueuedTask table."""
+
+    def enqueue(self, cloud_task, args, kwargs, eta=None):
+        return QueuedTask.objects.create(
+            task_name=cloud_task.name,
+            queue=cloud_task.queue,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=TaskQueue.MAX_ATTEMPTS,
+            available_at=eta or timezone.now(),
+        )
+
+    def enqueue_many(self, cloud_task, calls, kwargs, max_workers=None):
+        results = EnqueueResults(cloud_task.name)
+        now = timezone.now()
+        batch = []
+
+        def flush():
+            try:
+                QueuedTask.objects.bulk_create(
+                    [
+                        QueuedTask(
+                            task_name=cloud_task.name,
+                            queue=cloud_task.queue,
+                            args=list(args),
+                            kwargs=kwargs,
+                            max_attempts=TaskQueue.MAX_ATTEMPTS,
+                            available_at=now,
+                        )
+                        for args in batch
+                    ]
+                )
+                for args in batch:
+                    results.record(args)
+            except Exception as e:
+                for args in batch:
+                    results.record(args, e)
+            batch.clear()
+
+        for args in calls:
+            batch.append(args)
+            if len(batch) >= TaskQueue.BULK_ENQUEUE_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+
+        logger.info(f"Enqueued {results['enqueued']}/{results['total']} {cloud_task.name} tasks")
+        return results
+
+
+def claim_next(worker_id: str, queues: list[str] | None = None) -> QueuedTask | None:
+    """
+    Claim the next due task, hiding it from other workers for the visibility timeout.
+
+    Uses SELECT ... FOR UPDATE SKIP LOCKED where supported, plus a
+    compare-and-swap UPDATE so two workers can never claim the same row.
+
+    Returns:
+        The claimed QueuedTask (attempts already incremented), or None
+    """
+    now = timezone.now()
+    due = QueuedTask.objects.filter(
+        status__in=[QueuedTask.Status.PENDING, QueuedTask.Status.RUNNING],
+        available_at__lte=now,
+        attempts__lt=F('max_attempts'),
+    )
+    if queues:
+        due = due.filter(queue__in=queues)
+
+    with transaction.atomic():
+        candidate = due.select_for_update(skip_locked=True).order_by('available_at', 'id').first()
+        if candidate is None:
+            return None
+
+        claimed = QueuedTask.objects.filter(
+            pk=candidate.pk, attempts=candidate.attempts, available_at=candidate.available_at
+        ).update(
+            status=QueuedTask.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            available_at=now + timedelta(seconds=TaskQueue.VISIBILITY_TIMEOUT_SECONDS),
+            locked_by=worker_id,
+            updated_at=now,
+        )
+    if not claimed:
+        return None  # Another worker won the race
+
+    due_at = candidate.available_at
+    candidate.refresh_from_db()
+    candidate.due_at = due_at  # When it became runnable, for queue-delay metrics
+    return candidate
+
+
+def dead_letter_expired() -> int:
+    """Dead-letter tasks whose final attempt timed out (the worker died or hung)."""
+    return QueuedTask.objects.filter(
+        status=QueuedTask.Status.RUNNING,
+        available_at__lte=timezone.now(),
+        attempts__gte=F('max_attempts'),
+    ).update(
+        status=QueuedTask.Status.DEAD,
+        last_error='Visibility timeout expired on final attempt',
+        updated_at=timezone.now(),
+    )
+
+
+def execute(queued_task: QueuedTask) -> bool:
+    """
+    Run a claimed task and record the outcome.
+
+    Success deletes the row. Failure schedules a retry with backoff, or
+    dead-letters the task once it has used max_attempts. Outcomes are only
+    recorded while this worker still holds the claim.
+
+    Returns:
+        True if the task succeeded
+    """
+    # Only touch the row if no other worker re-claimed it after our visibility timeout
+    ours = QueuedTask.objects.filter(pk=queued_task.pk, attempts=queued_task.attempts, locked_by=queued_task.locked_by)
+
+    cloud_task = get_task(queued_task.task_name)
+    if cloud_task is None:
+        logger.error(f"Task not found: {queued_task.task_name}")
+        ours.update(status=QueuedTask.Status.DEAD, last_error='Task not found', updated_at=timezone.now())
+        return False
+
+    due_at = getattr(queued_task, 'due_at', queued_task.created_at)
+    try:
+        run_instrumented(cloud_task, queued_task.args, queued_task.kwargs, enqueued_at=due_at.timestamp(), source='database')
+    except Exception as e:
+        logger.exception(f"Task {queued_task.task_name} failed (attempt {queued_task.attempts}/{queued_task.max_attempts})")
+        now = timezone.now()
+        if queued_task.attempts >= queued_task.max_attempts:
+            ours.update(status=QueuedTask.Status.DEAD, last_error=str(e), updated_at=now)
+        else:
+            policy = cloud_task.retry_policy or RetryPolicy(backoff_base=TaskQueue.RETRY_BACKOFF_SECONDS)
+            ours.update(
+                status=QueuedTask.Status.PENDING,
+                available_at=now + timedelta(seconds=policy.backoff(queued_task.attempts - 1)),
+                last_error=str(e),
+                updated_at=now,
+            )
+        return False
+
+    ours.delete()
+    return True
+
+
+def run_pending(worker_id: str = 'inline', queues: list[str] | None = None, limit: int | None = None) -> int:
+    """Claim and run due tasks until the queue is empty (or limit is reached); returns tasks run."""
+    count = 0
+    while limit is None or count < limit:
+        queued_task = claim_next(worker_id, queues)
+        if queued_task is None:
+            break
+        execute(queued_task)
+        count += 1
+    return count
+
+
+def requeue_dead(queues: list[str] | None = None) -> int:
+    """Give dead-lettered tasks a fresh set of attempts."""
+    dead = QueuedTask.objects.filter(status=QueuedTask.Status.DEAD)
+    if queues:
+        dead = dead.filter(queue__in=queues)
+    return dead.update(status=QueuedTask.Status.PENDING, attempts=0, available_at=timezone.now(), updated_at=timezone.now())
+
+
+class TaskWorker:
+    """
+    Run the database queue on N threads until stopped.
+
+    Each thread claims one task at a time and sleeps for the poll interval
+    when nothing is due.
+    """
+
+    def __init__(self, concurrency: int = 1, queues: list[str] | None = None, poll_interval: float | None = None, name=''):
+        import os
+        import socket
+
+        self.concurrency = concurrency
+        self.queues = queues or None
+        self.poll_interval = poll_interval or TaskQueue.POLL_INTERVAL_SECONDS
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = threading.Event()
+        self.processed = 0
+        self._lock = threading.Lock()
+
+    def run(self, drain: bool = False):
+        """
+        Start the worker threads and block until stop() (or, with drain, until nothing is due).
+        """
+        threads = [
+            threading.Thread(target=self._loop, args=(f"{self.name}-{i}", drain), name=f"task-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join()
+
+    def stop(self):
+        """Finish in-flight tasks, then exit."""
+        self.stop_event.set()
+
+    def _loop(self, worker_id: str, drain: bool):
+        try:
+            while not self.stop_event.is_set():
+                close_old_connections()
+                try:
+                    dead_letter_expired()
+                    queued_task = claim_next(worker_id, self.queues)
+                except DatabaseError as e:
+                    # Transient (lost connection, lock contention): back off and poll again
+                    logger.warning(f"Task worker {worker_id} could not claim a task: {e}")
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+
+                if queued_task is None:
+                    if drain:
+                        return
+                    self.stop_event.wait(self.poll_interval)
+                    continue
+
+                execute(queued_task)
+                with self._lock:
+                    self.processed += 1
+        finally:
+            close_old_connections()
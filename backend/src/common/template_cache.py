@@ -0,0 +1,113 @@
+"""
+Per-process LRU cache for rendering templates.
+
+Certificate and badge rendering repeatedly need the same template file
+(downloaded from storage) in a parsed form. Entries are keyed on the
+template's identity and updated_at, so editing a template naturally
+produces a new key and stale entries simply age out.
+
+Usage:
+    from common.template_cache import template_cache
+
+    parsed = template_cache.get_or_load(
+        ('certificate_template', template.pk, template.updated_at),
+        lambda: (parse(download(template)), approximate_size),
+    )
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from functools import lru_cache
+from typing import Any
+
+from common.config import RenderCache
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """
+    Size-bounded LRU cache.
+
+    Each entry carries an approximate size in bytes; least recently used
+    entries are evicted once the total exceeds max_bytes. Loaders run outside
+    the lock so a slow download never blocks other threads.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], tuple[Any, int]]) -> Any:
+        """
+        Return the cached value for key, calling loader() on a miss.
+
+        Args:
+            key: Cache key (include updated_at so edits invalidate)
+            loader: Returns (value, size_in_bytes); None values are not cached
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value, size = loader()
+        if value is None:
+            return None
+
+        if size > self.max_bytes:
+            logger.warning(f"Template {key} ({size} bytes) exceeds cache budget, not caching")
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._size -= evicted_size
+        return value
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        """Entry count, size and hit/miss counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+@lru_cache(maxsize=RenderCache.FONT_MAX_ENTRIES)
+def load_font(name: str, size: int):
+    """Load a Pillow TrueType font once per (name, size), falling back to the default bitmap font."""
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(name, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+# Singleton instance
+template_cache = TemplateCache(max_bytes=RenderCache.TEMPLATE_MAX_BYTES)
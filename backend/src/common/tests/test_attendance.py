@@ -0,0 +1,42 @@
+"""
+Tests for the attendance interval engine.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from common.attendance import covered_minutes, covered_minutes_within, merge_intervals
+
+START = datetime(2026, 1, 1, 10, 0, tzinfo=UTC)
+
+
+def at(minutes):
+    return START + timedelta(minutes=minutes)
+
+
+class TestAttendanceIntervals:
+    """Tests for merging join/leave segments."""
+
+    def test_overlapping_segments_count_once(self):
+        """Two devices covering the same time are not double-counted."""
+        intervals = [(at(0), at(60)), (at(30), at(90)), (at(120), at(130))]
+        assert merge_intervals(intervals) == [(at(0), at(90)), (at(120), at(130))]
+        assert covered_minutes(intervals) == 100
+
+    def test_unsorted_and_touching_segments_merge(self):
+        intervals = [(at(20), at(40)), (at(0), at(20)), (at(10), at(15))]
+        assert merge_intervals(intervals) == [(at(0), at(40))]
+
+    def test_open_segments_are_ignored(self):
+        assert covered_minutes([(at(0), None), (at(5), at(15))]) == 10
+
+    def test_clipped_to_window(self):
+        """Time before the session starts or after it ends doesn't count."""
+        intervals = [(at(-30), at(20)), (at(50), at(200))]
+        assert covered_minutes(intervals, window=(at(0), at(60))) == 30
+        assert covered_minutes([(at(-30), at(-10))], window=(at(0), at(60))) == 0
+
+    def test_clipped_to_several_windows(self):
+        """Sessions of one event: time in any session counts, overlapping windows once."""
+        windows = [(at(0), at(60)), (at(50), at(70)), (at(1440), at(1500))]
+        assert covered_minutes_within([(at(1440), at(1500))], windows) == 60
+        assert covered_minutes_within([(at(-10), at(100)), (at(1430), at(1450))], windows) == 80
@@ -3,6 +3,7 @@ Tests for common app endpoints.
 
 Endpoints tested:
 - POST /api/common/tasks/handler/
+- GET /api/common/tasks/metrics/
 """
 
 import pytest
@@ -79,3 +80,511 @@ class TestCloudTaskHandler:
             status.HTTP_400_BAD_REQUEST,
             status.HTTP_403_FORBIDDEN,
         ]
+
+
+# =============================================================================
+# Task Scheduling Tests
+# =============================================================================
+
+
+class TestCloudTaskScheduling:
+    """Tests for CloudTask.schedule / delay_for and retry policies."""
+
+    def _make_task(self, calls, retry=None):
+        from common.cloud_tasks import task
+
+        @task(retry=retry)
+        def record(value):
+            calls.append(value)
+            return value
+
+        return record
+
+    def test_sync_mode_runs_due_tasks_inline(self, settings):
+        settings.CLOUD_TASKS_SYNC = True
+        calls = []
+
+        assert self._make_task(calls).delay_for(0, 'now') == 'now'
+        assert calls == ['now']
+
+    def test_sync_mode_holds_future_tasks_until_due(self, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from common.cloud_tasks import local_timer_queue
+
+        settings.CLOUD_TASKS_SYNC = True
+        local_timer_queue.clear()
+        calls = []
+
+        self._make_task(calls).delay_for(30, 'later')
+        assert calls == []
+        assert local_timer_queue.run_due() == 0
+
+        assert local_timer_queue.run_due(timezone.now() + timedelta(seconds=31)) == 1
+        assert calls == ['later']
+
+    def test_schedule_sets_schedule_time(self, settings):
+        from datetime import UTC, datetime
+        from unittest.mock import patch
+
+        settings.CLOUD_TASKS_SYNC = False
+        eta = datetime(2030, 1, 1, 12, 0, tzinfo=UTC)
+
+        with patch('common.cloud_tasks.get_client') as mock_client:
+            self._make_task([]).schedule(eta, 'x')
+
+        request = mock_client.return_value.create_task.call_args.kwargs['request']
+        assert request['task']['schedule_time'].ToDatetime(tzinfo=UTC) == eta
+
+    def test_retry_follows_policy(self):
+        from unittest.mock import patch
+
+        from common.cloud_tasks import RetryPolicy
+
+        record = self._make_task([], retry=RetryPolicy(max_retries=2, backoff_base=10, backoff_factor=3))
+
+        with patch.object(record, 'delay_for') as mock_delay_for:
+            assert record.retry(0, 'a') is True
+            assert record.retry(1, 'b') is True
+            assert record.retry(2, 'c') is False
+
+        assert [c.args for c in mock_delay_for.call_args_list] == [(10, 'a'), (30, 'b')]
+
+
+class TestCloudTaskDelayMany:
+    """Tests for bulk enqueueing with CloudTask.delay_many."""
+
+    def _make_task(self):
+        from common.cloud_tasks import task
+
+        @task()
+        def fan_out(item_id, flag=False):
+            if item_id == 'bad':
+                raise ValueError('bad item')
+            return item_id
+
+        return fan_out
+
+    def test_enqueues_concurrently_and_reports_failures(self, settings):
+        import json
+        import threading
+        import time
+        from unittest.mock import patch
+
+        settings.CLOUD_TASKS_SYNC = False
+        lock = threading.Lock()
+        in_flight = {'now': 0, 'max': 0}
+        bodies = []
+
+        def create_task(request):
+            body = json.loads(request['task']['http_request']['body'])
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            time.sleep(0.01)
+            with lock:
+                in_flight['now'] -= 1
+                bodies.append(body)
+            if body['args'] == [13]:
+                raise RuntimeError('quota exceeded')
+
+        with patch('common.cloud_tasks.get_client') as mock_client:
+            mock_client.return_value.create_task.side_effect = create_task
+            result = self._make_task().delay_many(range(40), max_workers=8, flag=True)
+
+        assert result['total'] == 40
+        assert result['enqueued'] == 39
+        assert result['failed'] == [{'args': (13,), 'error': 'quota exceeded'}]
+        assert in_flight['max'] > 1
+        assert all(body['kwargs'] == {'flag': True} for body in bodies)
+
+    def test_sync_mode_runs_inline_with_per_item_failures(self, settings):
+        settings.CLOUD_TASKS_SYNC = True
+
+        result = self._make_task().delay_many([1, 'bad', (3,)])
+
+        assert result['enqueued'] == 2
+        assert result['failed'] == [{'args': ('bad',), 'error': 'bad item'}]
+
+
+# =============================================================================
+# Database Task Queue Tests
+# =============================================================================
+
+
+_queue_calls = []
+
+
+def _queue_task():
+    from common.cloud_tasks import get_task, task
+
+    existing = get_task(f"{__name__}.queued_job")
+    if existing:
+        return existing
+
+    @task(queue='emails')
+    def queued_job(value):
+        if value == 'fail':
+            raise RuntimeError('boom')
+        _queue_calls.append(value)
+
+    return queued_job
+
+
+@pytest.mark.django_db
+class TestDatabaseTaskQueue:
+    """Tests for TASK_BACKEND='database' and the run_task_worker command."""
+
+    @pytest.fixture(autouse=True)
+    def database_backend(self, settings):
+        settings.TASK_BACKEND = 'database'
+        _queue_calls.clear()
+
+    def test_delay_is_durable_until_a_worker_runs_it(self):
+        from common.models import QueuedTask
+        from common.task_queue import run_pending
+
+        _queue_task().delay('a')
+        assert _queue_calls == []
+        assert QueuedTask.objects.get().queue == 'emails'
+
+        assert run_pending() == 1
+        assert _queue_calls == ['a']
+        assert not QueuedTask.objects.exists()
+
+    def test_delay_many_and_schedule(self):
+        from common.models import QueuedTask
+        from common.task_queue import run_pending
+
+        job = _queue_task()
+        result = job.delay_many(['x', 'y', 'z'])
+        job.delay_for(3600, 'later')
+
+        assert result['enqueued'] == 3
+        assert run_pending() == 3
+        assert sorted(_queue_calls) == ['x', 'y', 'z']
+        assert QueuedTask.objects.get().args == ['later']
+
+    def test_failures_retry_with_backoff_then_dead_letter(self, settings):
+        from django.utils import timezone
+
+        from common.models import QueuedTask
+        from common.task_queue import claim_next, execute
+
+        _queue_task().delay('fail')
+        queued = QueuedTask.objects.get()
+
+        for attempt in range(1, queued.max_attempts + 1):
+            claimed = claim_next('test-worker')
+            assert claimed.attempts == attempt
+            assert execute(claimed) is False
+            claimed.refresh_from_db()
+            if attempt < queued.max_attempts:
+                assert claimed.status == QueuedTask.Status.PENDING
+                assert claimed.available_at > timezone.now()
+                QueuedTask.objects.filter(pk=queued.pk).update(available_at=timezone.now())
+
+        claimed.refresh_from_db()
+        assert claimed.status == QueuedTask.Status.DEAD
+        assert claimed.last_error == 'boom'
+        assert claim_next('test-worker') is None
+
+    def test_visibility_timeout_releases_abandoned_claims(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from common.models import QueuedTask
+        from common.task_queue import claim_next, execute
+
+        _queue_task().delay('b')
+        first = claim_next('crashed-worker')
+        assert claim_next('other-worker') is None  # Hidden while claimed
+
+        QueuedTask.objects.filter(pk=first.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+        second = claim_next('other-worker')
+        assert second.attempts == 2
+
+        # The original worker no longer holds the claim, so its late result is ignored
+        QueuedTask.objects.filter(pk=first.pk).update(available_at=timezone.now() + timedelta(minutes=5))
+        assert execute(first) is True
+        assert QueuedTask.objects.filter(pk=first.pk).exists()
+        assert execute(second) is True
+        assert not QueuedTask.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_task_worker_command_drains_queue(settings):
+    from django.core.management import call_command
+
+    from common.models import QueuedTask
+
+    settings.TASK_BACKEND = 'database'
+    _queue_calls.clear()
+    _queue_task().delay_many(range(10))
+
+    # One thread: in-memory SQLite locks the table across connections
+    call_command('run_task_worker', '--workers', '1', '--drain')
+
+    assert sorted(_queue_calls) == list(range(10))
+    assert not QueuedTask.objects.exists()
+
+
+# =============================================================================
+# Task Metrics Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestTaskMetrics:
+    """Tests for per-task latency, queue-delay and query instrumentation."""
+
+    handler_endpoint = '/api/common/tasks/handler/'
+    endpoint = '/api/common/tasks/metrics/'
+
+    @pytest.fixture(autouse=True)
+    def clean_metrics(self):
+        from common.task_metrics import task_metrics
+
+        task_metrics.reset()
+        _queue_calls.clear()
+        yield
+        task_metrics.reset()
+
+    def test_handler_records_latency_queue_delay_and_queries(self, api_client):
+        import time
+
+        from django.contrib.auth import get_user_model
+
+        from common.task_metrics import task_metrics
+
+        job = _queue_task()
+        payload = {'task': job.name, 'args': ['ok'], 'kwargs': {}, 'enqueued_at': time.time() - 5}
+        response = api_client.post(self.handler_endpoint, payload, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        stats = task_metrics.snapshot()['tasks'][job.name]
+        assert stats['runs'] == 1
+        assert stats['failures'] == 0
+        assert stats['duration_ms']['count'] == 1
+        assert stats['queue_delay_ms']['count'] == 1
+        assert stats['queue_delay_ms']['buckets']['5000'] == 0
+        assert stats['queue_delay_ms']['buckets']['10000'] == 1
+
+        def query_job():
+            return get_user_model().objects.count()
+
+        from common.cloud_tasks import CloudTask
+        from common.task_metrics import run_instrumented
+
+        run_instrumented(CloudTask(query_job), (), {})
+        stats = task_metrics.snapshot()['tasks'][f"{__name__}.query_job"]
+        assert stats['queries'] == 1
+        assert stats['queue_delay_ms']['count'] == 0  # No enqueue timestamp
+
+    def test_failures_are_counted_by_exception_type(self, api_client):
+        from common.task_metrics import task_metrics
+
+        job = _queue_task()
+        response = api_client.post(self.handler_endpoint, {'task': job.name, 'args': ['fail']}, format='json')
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        stats = task_metrics.snapshot()['tasks'][job.name]
+        assert stats['failures'] == 1
+        assert stats['errors'] == {'RuntimeError': 1}
+
+    def test_scheduled_task_delay_is_measured_from_eta(self, api_client):
+        import time
+
+        from common.task_metrics import task_metrics
+
+        job = _queue_task()
+        now = time.time()
+        payload = {'task': job.name, 'args': ['ok'], 'enqueued_at': now - 3600, 'eta': now - 1}
+        api_client.post(self.handler_endpoint, payload, format='json')
+
+        delay = task_metrics.snapshot()['tasks'][job.name]['queue_delay_ms']
+        assert delay['sum'] < 60000
+
+    def test_database_worker_records_metrics(self, settings):
+        from common.task_metrics import task_metrics
+        from common.task_queue import run_pending
+
+        settings.TASK_BACKEND = 'database'
+        job = _queue_task()
+        job.delay_many(['a', 'b'])
+        run_pending()
+
+        stats = task_metrics.snapshot()['tasks'][job.name]
+        assert stats['runs'] == 2
+        assert stats['queue_delay_ms']['count'] == 2
+
+    def test_metrics_endpoint_requires_admin(self, auth_client, admin_client):
+        from common.task_metrics import run_instrumented
+
+        job = _queue_task()
+        run_instrumented(job, ('ok',), {})
+
+        assert auth_client.get(self.endpoint).status_code == status.HTTP_403_FORBIDDEN
+        response = admin_client.get(self.endpoint)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['tasks'][job.name]['runs'] == 1
+
+
+# =============================================================================
+# Fan-out Tests
+# =============================================================================
+
+_chunk_calls = []
+
+
+def _count_chunk_task():
+    from common.cloud_tasks import chunk_task, get_task
+
+    existing = get_task(f"{__name__}.count_users_chunk")
+    if existing:
+        return existing
+
+    @chunk_task()
+    def count_users_chunk(first_id, last_id, fail_from=None):
+        from django.contrib.auth import get_user_model
+
+        _chunk_calls.append((first_id, last_id))
+        if fail_from is not None and first_id >= fail_from:
+            raise RuntimeError('chunk failed')
+        users = get_user_model().objects.filter(pk__range=(first_id, last_id))
+        return {'users': users.count(), 'label': 'ignored'}
+
+    return count_users_chunk
+
+
+_flaky_failures = []
+
+
+def _flaky_chunk_task():
+    from common.cloud_tasks import RetryPolicy, chunk_task, get_task
+
+    existing = get_task(f"{__name__}.flaky_users_chunk")
+    if existing:
+        return existing
+
+    @chunk_task(retry=RetryPolicy(max_retries=1, backoff_base=30))
+    def flaky_users_chunk(first_id, last_id):
+        from django.contrib.auth import get_user_model
+
+        if _flaky_failures:
+            raise RuntimeError(_flaky_failures.pop(0))
+        return {'users': get_user_model().objects.filter(pk__range=(first_id, last_id)).count()}
+
+    return flaky_users_chunk
+
+
+@pytest.mark.django_db
+class TestFanOut:
+    """Tests for map_queryset / chunk_task."""
+
+    @pytest.fixture(autouse=True)
+    def users(self):
+        from factories import UserFactory
+
+        _chunk_calls.clear()
+        return UserFactory.create_batch(5)
+
+    def _queryset(self, users):
+        from django.contrib.auth import get_user_model
+
+        return get_user_model().objects.filter(pk__in=[u.pk for u in users])
+
+    def test_splits_into_id_ranges_and_aggregates_results(self, users):
+        from common.cloud_tasks import map_queryset
+
+        job = map_queryset(self._queryset(users), _count_chunk_task(), chunk_size=2)
+
+        ids = sorted(u.pk for u in users)
+        assert _chunk_calls == [(ids[0], ids[1]), (ids[2], ids[3]), (ids[4], ids[4])]
+        assert job.total_items == 5
+        assert job.total_chunks == 3
+        assert job.completed_chunks == 3
+        assert job.status == job.Status.COMPLETED
+        assert job.results == {'users': 5}  # Non-numeric values are not aggregated
+
+    def test_failed_chunk_does_not_fail_the_job(self, users):
+        from common.cloud_tasks import map_queryset
+
+        ids = sorted(u.pk for u in users)
+        job = map_queryset(self._queryset(users), _count_chunk_task(), fail_from=ids[4], chunk_size=2)
+
+        assert job.status == job.Status.COMPLETED
+        assert job.completed_chunks == 2
+        assert job.failed_chunks == 1
+        assert job.results == {'users': 4}
+        assert job.errors == [{'chunk': 2, 'error': 'chunk failed'}]
+
+    def test_failed_chunk_is_retried_before_it_counts(self, users):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from common.cloud_tasks import local_timer_queue, map_queryset
+
+        local_timer_queue.clear()
+        _flaky_failures[:] = ['timeout']
+        job = map_queryset(self._queryset(users), _flaky_chunk_task(), chunk_size=5)
+
+        job.refresh_from_db()
+        assert (job.status, job.failed_chunks) == (job.Status.RUNNING, 0)
+
+        assert local_timer_queue.run_due(timezone.now() + timedelta(seconds=31)) == 1
+        job.refresh_from_db()
+        assert job.status == job.Status.COMPLETED
+        assert (job.completed_chunks, job.failed_chunks) == (1, 0)
+        assert job.results == {'users': 5}
+
+    def test_chunk_fails_once_retries_are_exhausted(self, users):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from common.cloud_tasks import local_timer_queue, map_queryset
+
+        local_timer_queue.clear()
+        _flaky_failures[:] = ['timeout', 'still down']
+        job = map_queryset(self._queryset(users), _flaky_chunk_task(), chunk_size=5)
+        local_timer_queue.run_due(timezone.now() + timedelta(seconds=31))
+
+        job.refresh_from_db()
+        assert job.status == job.Status.COMPLETED
+        assert job.failed_chunks == 1
+        assert job.errors == [{'chunk': 0, 'error': 'still down'}]
+
+    def test_redelivered_chunk_is_counted_once(self, users, settings):
+        from common.cloud_tasks import map_queryset
+        from common.models import FanOutJob
+
+        settings.TASK_BACKEND = 'database'
+        job = map_queryset(self._queryset(users), _count_chunk_task(), chunk_size=5)
+        assert job.status == FanOutJob.Status.RUNNING
+
+        # The queue delivers the only chunk twice
+        child = _count_chunk_task()
+        first_id, last_id = min(u.pk for u in users), max(u.pk for u in users)
+        child(job.id, 0, first_id, last_id)
+        child(job.id, 0, first_id, last_id)
+
+        job.refresh_from_db()
+        assert job.completed_chunks == 1
+        assert job.results == {'users': 5}
+        assert job.status == FanOutJob.Status.COMPLETED
+
+    def test_empty_queryset_completes_immediately(self):
+        from django.contrib.auth import get_user_model
+
+        from common.cloud_tasks import map_queryset
+
+        job = map_queryset(get_user_model().objects.none(), _count_chunk_task())
+
+        assert job.total_chunks == 0
+        assert job.status == job.Status.COMPLETED
+        assert _chunk_calls == []
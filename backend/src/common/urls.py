@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import CloudTaskHandlerView
+from .views import CloudTaskHandlerView, TaskMetricsView
 
 app_name = 'common'
 
 urlpatterns = [
     path('tasks/handler/', CloudTaskHandlerView.as_view(), name='cloud_task_handler'),
+    path('tasks/metrics/', TaskMetricsView.as_view(), name='task_metrics'),
 ]
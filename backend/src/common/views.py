@@ -1,13 +1,14 @@
 import logging
 
 from rest_framework import status
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from common.utils import error_response
 
 from .cloud_tasks import get_task
+from .task_metrics import run_instrumented, task_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -34,10 +35,28 @@ class CloudTaskHandlerView(APIView):
                 return error_response(f"Task not found: {task_name}", code='TASK_NOT_FOUND')
 
             logger.info(f"Executing task: {task_name}")
-            result = task_func(*args, **kwargs)
+            result = run_instrumented(task_func, args, kwargs, enqueued_at=self._runnable_since(request.data))
 
             return Response({'status': 'success', 'result': str(result)})
 
         except Exception as e:
             logger.exception(f"Error executing task: {e}")
             return error_response(str(e), code='INTERNAL_ERROR', status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def _runnable_since(self, data) -> float | None:
+        """Epoch seconds the task became runnable: its ETA if scheduled, else when it was enqueued."""
+        timestamps = [data.get('enqueued_at'), data.get('eta')]
+        timestamps = [float(t) for t in timestamps if isinstance(t, int | float)]
+        return max(timestamps) if timestamps else None
+
+
+class TaskMetricsView(APIView):
+    """
+    Task run metrics for this instance: runs, failures, query counts, and
+    duration / queue-delay histograms per task since process start.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(task_metrics.snapshot())
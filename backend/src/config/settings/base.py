@@ -72,6 +72,14 @@ GCS_EMULATOR_HOST = os.environ.get('GCS_EMULATOR_HOST', '')
 # Useful for initial deployments or debugging. Set to False to enable async Cloud Tasks.
 CLOUD_TASKS_SYNC = os.environ.get('CLOUD_TASKS_SYNC', 'true').lower() in ('true', '1', 'yes')
 
+# Task backend: 'cloud_tasks', 'sync', 'database' (durable queue run by `manage.py run_task_worker`)
+# or a dotted path to a common.cloud_tasks.TaskBackend subclass. Empty = derived from CLOUD_TASKS_SYNC.
+TASK_BACKEND = os.environ.get('TASK_BACKEND', '')
+
+# In sync mode, tasks scheduled for later (task.schedule / delay_for) wait on an in-process
+# timer queue. When True, a background thread runs them as they fall due.
+CLOUD_TASKS_LOCAL_TIMER = os.environ.get('CLOUD_TASKS_LOCAL_TIMER', 'true').lower() in ('true', '1', 'yes')
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -82,6 +90,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'common.middleware.CoalesceCounterDeltasMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -219,6 +228,9 @@ ZOOM_CLIENT_ID = os.environ.get('ZOOM_CLIENT_ID')
 ZOOM_CLIENT_SECRET = os.environ.get('ZOOM_CLIENT_SECRET')
 ZOOM_REDIRECT_URI = os.environ.get('ZOOM_REDIRECT_URI')
 ZOOM_WEBHOOK_SECRET = os.environ.get('ZOOM_WEBHOOK_SECRET')
+# Zoom webhook ingestion: 'immediate' (one task per webhook) or 'batched' (logs are
+# written quickly and drained per meeting in batches by integrations.tasks.drain_zoom_webhooks)
+ZOOM_WEBHOOK_INGESTION = os.environ.get('ZOOM_WEBHOOK_INGESTION', 'immediate')
 
 # Google OAuth
 GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID')
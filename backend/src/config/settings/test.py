@@ -1,12 +1,27 @@
+import os
+
 from .base import *
 
-# Use in-memory SQLite for speed
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': ':memory:',
+# Use in-memory SQLite for speed; set TEST_DB_HOST to run against PostgreSQL
+# (needed by tests marked `postgres`, which SQLite's single writer can't exercise)
+if os.environ.get('TEST_DB_HOST'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('TEST_DB_NAME', 'postgres'),
+            'USER': os.environ.get('TEST_DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('TEST_DB_PASSWORD', ''),
+            'HOST': os.environ['TEST_DB_HOST'],
+            'PORT': os.environ.get('TEST_DB_PORT', '5432'),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
     }
-}
 
 # Fast password hashing
 PASSWORD_HASHERS = [
@@ -29,6 +44,8 @@ REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {
 GOOGLE_CLOUD_PROJECT = 'test-project'
 GOOGLE_CLOUD_LOCATION = 'us-central1'
 GOOGLE_CLOUD_TASKS_QUEUE = 'test-queue'
+TASK_BACKEND = ''
+CLOUD_TASKS_LOCAL_TIMER = False  # Scheduled tasks only run via local_timer_queue.run_due()
 
 # Zoom Integration Config for tests
 ZOOM_CLIENT_ID = 'test_client_id'
@@ -37,6 +37,23 @@ from factories import (
 User = get_user_model()
 
 
+# =============================================================================
+# Markers
+# =============================================================================
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip postgres-marked tests unless the test database is PostgreSQL (see config/settings/test.py)."""
+    from django.conf import settings
+
+    if settings.DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+        return
+    skip = pytest.mark.skip(reason="needs PostgreSQL: set TEST_DB_HOST and run with -m postgres")
+    for item in items:
+        if 'postgres' in item.keywords:
+            item.add_marker(skip)
+
+
 # =============================================================================
 # API Client Fixtures
 # =============================================================================
@@ -534,6 +551,26 @@ def mock_zoom():
     yield mock_instance
 
 
+@pytest.fixture(autouse=True)
+def clear_meeting_resolver():
+    """Per-process meeting ID cache would outlive each test's rolled-back rows."""
+    from integrations.meeting_resolver import meeting_resolver
+
+    meeting_resolver.clear()
+    yield
+    meeting_resolver.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_zoom_token_cache():
+    """Cached access tokens are keyed by connection pk, which rolled-back tests reuse."""
+    from accounts.zoom_client import token_cache
+
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
 @pytest.fixture
 def mock_email():
     """Mock email sending for tests."""
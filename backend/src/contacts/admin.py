@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Contact, ContactList, Tag
+from .models import Contact, ContactList, ContactOutboxEntry, Tag
 
 
 class ContactInline(admin.TabularInline):
@@ -29,3 +29,12 @@ class ContactAdmin(admin.ModelAdmin):
 class TagAdmin(admin.ModelAdmin):
     list_display = ('name', 'owner', 'color', 'contact_count')
     search_fields = ('name', 'owner__email')
+
+
+@admin.register(ContactOutboxEntry)
+class ContactOutboxEntryAdmin(admin.ModelAdmin):
+    list_display = ('dedupe_key', 'kind', 'organizer', 'attempts', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('dedupe_key', 'organizer__email', 'last_error')
+    ordering = ('id',)
+    readonly_fields = ('attempts', 'last_error')
@@ -0,0 +1,61 @@
+# Generated by Django 6.0 on 2026-10-16 22:10
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_initial'),
+        ('registrations', '0003_registration_seat_hold_expires_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContactOutboxEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When this record was created')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When this record was last modified')),
+                (
+                    'uuid',
+                    models.UUIDField(
+                        db_index=True,
+                        default=uuid.uuid4,
+                        editable=False,
+                        help_text='Public identifier for external use',
+                        unique=True,
+                    ),
+                ),
+                (
+                    'kind',
+                    models.CharField(choices=[('link', 'Link to contact'), ('attendance', 'Record attendance')], max_length=20),
+                ),
+                ('dedupe_key', models.CharField(help_text='kind:registration_id', max_length=100, unique=True)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Failed drain rounds')),
+                ('last_error', models.TextField(blank=True)),
+                (
+                    'organizer',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+                (
+                    'registration',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='+', to='registrations.registration'
+                    ),
+                ),
+            ],
+            options={
+                'db_table': 'contact_outbox',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['organizer', 'id'], name='contact_out_organiz_989eb4_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,5 @@
 """
-Contacts app models - ContactList, Contact, Tag.
+Contacts app models - ContactList, Contact, Tag, ContactOutboxEntry.
 """
 
 from django.db import models
@@ -341,3 +341,36 @@ class Tag(BaseModel):
 
         target_tag.update_contact_count()
         self.delete()
+
+
+class ContactOutboxEntry(BaseModel):
+    """
+    A registration side effect on the organizer's contacts, waiting to be applied.
+
+    Written by the registration signals in the same transaction as the
+    registration, and applied in id order, per organizer and in batches, by
+    contacts.outbox. dedupe_key makes each side effect happen once per
+    registration however many times it is saved.
+    """
+
+    class Kind(models.TextChoices):
+        LINK = 'link', 'Link to contact'
+        ATTENDANCE = 'attendance', 'Record attendance'
+
+    organizer = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='+')
+    registration = models.ForeignKey('registrations.Registration', on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    dedupe_key = models.CharField(max_length=100, unique=True, help_text="kind:registration_id")
+
+    attempts = models.PositiveIntegerField(default=0, help_text="Failed drain rounds")
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'contact_outbox'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['organizer', 'id']),
+        ]
+
+    def __str__(self):
+        return self.dedupe_key
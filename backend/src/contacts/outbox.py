@@ -0,0 +1,237 @@
+"""
+Registration side effects on the organizer's contacts, applied off the request.
+
+Confirming a registration links its registrant to a contact in the
+organizer's list, and attendance updates that contact's stats. Instead of
+doing this inside the registration request, the signals write a
+ContactOutboxEntry in the same transaction (one INSERT) and a drain is
+scheduled per organizer once it commits:
+
+    registration saved ──▶ ContactOutboxEntry ──▶ drain_contact_outbox(organizer_id)
+
+The drain applies an organizer's entries in id order, ContactSync.BATCH_SIZE
+at a time, with a fixed number of statements per batch: the contact list
+and the existing contacts are looked up once, new contacts are inserted in
+one bulk_create and stats move by one F() update per increment. A batch
+and its entries' deletion commit together, so a failed batch is simply
+applied again. drain_pending_contact_outbox picks up organizers whose drain
+was lost.
+
+Usage:
+    from contacts.outbox import contact_outbox
+
+    contact_outbox.enqueue(registration, ContactOutboxEntry.Kind.LINK)
+"""
+
+import logging
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from common.config import ContactSync
+from contacts.tasks import drain_contact_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class ContactOutbox:
+    """
+    Write and drain ContactOutboxEntry rows.
+    """
+
+    def enqueue(self, registration, kind: str):
+        """
+        Record a side effect of registration, to be applied once its transaction commits.
+
+        Entries are idempotent: a side effect already recorded for the
+        registration is not recorded again.
+        """
+        self.enqueue_many([registration], kind)
+
+    def enqueue_many(self, registrations, kind: str):
+        """Record the same side effect for saved registrations, with one INSERT (e.g. bulk imports)."""
+        from contacts.models import ContactOutboxEntry
+
+        entries, first_keys = [], {}
+        for registration in registrations:
+            organizer_id = registration.event.owner_id
+            if not organizer_id:
+                continue
+            dedupe_key = f'{kind}:{registration.pk}'
+            entries.append(
+                ContactOutboxEntry(organizer_id=organizer_id, registration_id=registration.pk, kind=kind, dedupe_key=dedupe_key)
+            )
+            first_keys.setdefault(organizer_id, dedupe_key)
+        if not entries:
+            return
+
+        ContactOutboxEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        for organizer_id, dedupe_key in first_keys.items():
+            transaction.on_commit(partial(self._schedule_drain, organizer_id, dedupe_key))
+
+    def _schedule_drain(self, organizer_id: int, dedupe_key: str):
+        """Coalesce: only the oldest pending entry of an organizer schedules its drain."""
+        from contacts.models import ContactOutboxEntry
+
+        oldest = (
+            ContactOutboxEntry.objects.filter(organizer_id=organizer_id, attempts__lt=ContactSync.MAX_ATTEMPTS)
+            .order_by('id')
+            .values_list('dedupe_key', flat=True)
+            .first()
+        )
+        if oldest == dedupe_key:
+            drain_contact_outbox.delay_for(ContactSync.COALESCE_SECONDS, organizer_id)
+
+    def drain(self, organizer_id: int) -> dict[str, int]:
+        """
+        Apply an organizer's pending entries in batches until none are left.
+
+        A batch that fails is rolled back, counted against its entries'
+        attempts and left for drain_pending_contact_outbox.
+
+        Returns:
+            Dict with applied, failed, contacts_created and contacts_updated counts
+        """
+        from contacts.models import ContactOutboxEntry
+
+        results = {'applied': 0, 'failed': 0, 'contacts_created': 0, 'contacts_updated': 0}
+        while True:
+            entries = []
+            try:
+                with transaction.atomic():
+                    entries = self._claim(organizer_id)
+                    if not entries:
+                        break
+                    batch = self.apply_batch(organizer_id, entries)
+                    ContactOutboxEntry.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+            except Exception as e:
+                logger.error(f"Contact outbox batch for organizer {organizer_id} failed: {e}")
+                ContactOutboxEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+                    attempts=F('attempts') + 1, last_error=str(e)[:1000], updated_at=timezone.now()
+                )
+                results['failed'] += len(entries)
+                break
+
+            results['applied'] += len(entries)
+            results['contacts_created'] += batch['created']
+            results['contacts_updated'] += batch['updated']
+        return results
+
+    def _claim(self, organizer_id: int) -> list:
+        """
+        Lock up to ContactSync.BATCH_SIZE of an organizer's entries, oldest first.
+
+        The lock waits for a concurrent drain of the same organizer rather
+        than skipping its rows, so entries are applied strictly in order.
+        """
+        from contacts.models import ContactOutboxEntry
+
+        return list(
+            ContactOutboxEntry.objects.filter(organizer_id=organizer_id, attempts__lt=ContactSync.MAX_ATTEMPTS)
+            .select_for_update()
+            .order_by('id')[: ContactSync.BATCH_SIZE]
+        )
+
+    def apply_batch(self, organizer_id: int, entries: list) -> dict[str, int]:
+        """
+        Apply claimed entries for one organizer, in order, as set-based writes.
+
+        Same rules as when this ran per registration: a registrant whose email
+        isn't among the organizer's contacts is added to the organizer's
+        personal list, otherwise the contact's invite count goes up (and it
+        is linked to the registrant's account); attendance counts once per
+        event, when the contact wasn't already seen attending since the
+        event started.
+
+        Returns:
+            Dict with created and updated contact counts
+        """
+        from accounts.models import User
+        from contacts.models import Contact, ContactList, ContactOutboxEntry
+        from registrations.models import Registration
+
+        registrations = Registration.all_objects.select_related('event', 'user').in_bulk(
+            {entry.registration_id for entry in entries}
+        )
+        emails = {registration.email for registration in registrations.values()}
+
+        contacts = {}
+        for contact in Contact.objects.filter(contact_list__owner_id=organizer_id, email__in=emails):
+            contacts.setdefault(contact.email, contact)
+
+        now = timezone.now()
+        new_contacts = {}
+        invites, attendances, linked = Counter(), Counter(), {}
+        for entry in entries:
+            registration = registrations.get(entry.registration_id)
+            if registration is None:
+                continue
+            contact = new_contacts.get(registration.email) or contacts.get(registration.email)
+
+            if entry.kind == ContactOutboxEntry.Kind.LINK:
+                if contact is None:
+                    new_contacts[registration.email] = Contact(
+                        email=registration.email,
+                        full_name=registration.full_name,
+                        professional_title=registration.professional_title or '',
+                        organization_name=registration.organization_name or '',
+                        user=registration.user,
+                        source='registration',
+                        added_from_event=registration.event,
+                        events_invited_count=1,
+                        last_invited_at=now,
+                    )
+                elif contact.pk is None:
+                    contact.events_invited_count += 1
+                else:
+                    invites[contact.pk] += 1
+                    user = registration.user
+                    if user and not contact.user_id and user.email.lower() == contact.email.lower():
+                        contact.user = user
+                        linked[contact.pk] = contact
+
+            elif contact is not None and (
+                contact.last_attended_at is None or contact.last_attended_at < registration.event.starts_at
+            ):
+                contact.last_attended_at = now
+                if contact.pk is None:
+                    contact.events_attended_count += 1
+                else:
+                    attendances[contact.pk] += 1
+
+        if new_contacts:
+            default_list = ContactList.get_or_create_for_user(User.all_objects.get(pk=organizer_id))
+            for contact in new_contacts.values():
+                contact.contact_list = default_list
+            Contact.objects.bulk_create(new_contacts.values())
+            default_list.update_contact_count()
+
+        for ids, count in self._group_by_count(invites):
+            Contact.objects.filter(pk__in=ids).update(
+                events_invited_count=F('events_invited_count') + count, last_invited_at=now, updated_at=now
+            )
+        for ids, count in self._group_by_count(attendances):
+            Contact.objects.filter(pk__in=ids).update(
+                events_attended_count=F('events_attended_count') + count, last_attended_at=now, updated_at=now
+            )
+        if linked:
+            for contact in linked.values():
+                contact.updated_at = now
+            Contact.objects.bulk_update(linked.values(), ['user', 'updated_at'])
+
+        return {'created': len(new_contacts), 'updated': len(invites.keys() | attendances.keys() | linked.keys())}
+
+    @staticmethod
+    def _group_by_count(counter: Counter) -> list[tuple[list, int]]:
+        """Group ids by their increment, so each distinct increment is one UPDATE (usually just 1)."""
+        groups = defaultdict(list)
+        for pk, count in counter.items():
+            groups[count].append(pk)
+        return [(ids, count) for count, ids in groups.items()]
+
+
+# Singleton instance
+contact_outbox = ContactOutbox()
@@ -259,7 +259,7 @@ class ContactCreateSerializer(serializers.ModelSerializer):
 
         if email and contact_list:
             # Check for duplicate email in same list
-            exists = Contact.objects.filter(contact_list=contact_list, email__iexact=email).exists()
+            exists = Contact.objects.filter(contact_list=contact_list, email=email).exists()
 
             if exists:
                 raise serializers.ValidationError({'email': 'A contact with this email already exists in this list.'})
@@ -0,0 +1,48 @@
+"""
+Cloud tasks for contacts.
+"""
+
+import logging
+
+from django.utils import timezone
+
+from common.cloud_tasks import task
+
+logger = logging.getLogger(__name__)
+
+
+@task()
+def drain_contact_outbox(organizer_id: int):
+    """
+    Apply an organizer's pending contact outbox entries in batches.
+
+    Scheduled when a registration commits its first pending entry for the organizer.
+    """
+    from contacts.outbox import contact_outbox
+
+    results = contact_outbox.drain(organizer_id)
+    logger.info(f"Drained contact outbox for organizer {organizer_id}: {results}")
+    return results
+
+
+@task()
+def drain_pending_contact_outbox():
+    """
+    Schedule a drain for every organizer with pending contact outbox entries.
+
+    Periodic safety net: picks up entries whose drain was lost, raced with
+    the previous batch, or failed and is due another attempt.
+    """
+    from common.config import ContactSync
+    from contacts.models import ContactOutboxEntry
+
+    cutoff = timezone.now() - timezone.timedelta(seconds=ContactSync.COALESCE_SECONDS)
+    organizer_ids = list(
+        ContactOutboxEntry.objects.filter(created_at__lt=cutoff, attempts__lt=ContactSync.MAX_ATTEMPTS)
+        .order_by()
+        .values_list('organizer_id', flat=True)
+        .distinct()
+    )
+    drain_contact_outbox.delay_many(organizer_ids)
+    logger.info(f"Scheduled contact outbox drains for {len(organizer_ids)} organizers")
+    return len(organizer_ids)
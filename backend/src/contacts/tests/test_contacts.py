@@ -13,12 +13,19 @@ Endpoints tested:
 - DELETE /api/v1/contacts/{uuid}/
 - POST /api/v1/contacts/bulk_create/
 - GET /api/v1/contacts/export/
+
+Also covers the registration-to-contact outbox (contacts.outbox).
 """
 
+from unittest.mock import patch
+
 import pytest
 from rest_framework import status
 
-from contacts.models import Contact, ContactList
+from common.config import ContactSync
+from contacts.models import Contact, ContactList, ContactOutboxEntry
+from contacts.outbox import contact_outbox
+from factories import RegistrationFactory, UserFactory
 
 # =============================================================================
 # Tag Tests
@@ -195,3 +202,80 @@ class TestContactViewSet:
         response = organizer_client.get(f'{self.endpoint}?search={contact.email}')
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['results']) == 1
+
+
+# =============================================================================
+# Contact Outbox Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestContactOutbox:
+    """Registration side effects on contacts are queued, then applied per organizer in batches."""
+
+    def test_confirmed_registration_is_queued_not_linked(self, published_event):
+        registration = RegistrationFactory(event=published_event, guest=True)
+        registration.save()
+        registration.save(update_fields=['zoom_registrant_join_url'])
+
+        assert not Contact.objects.filter(email=registration.email).exists()
+        entry = ContactOutboxEntry.objects.get()
+        assert (entry.kind, entry.organizer_id, entry.registration_id) == (
+            ContactOutboxEntry.Kind.LINK,
+            published_event.owner_id,
+            registration.pk,
+        )
+
+    def test_commit_schedules_one_drain_per_organizer(self, published_event, django_capture_on_commit_callbacks):
+        with (
+            patch('contacts.outbox.drain_contact_outbox.delay_for') as mock_delay_for,
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            RegistrationFactory.create_batch(3, event=published_event, guest=True)
+
+        mock_delay_for.assert_called_once_with(ContactSync.COALESCE_SECONDS, published_event.owner_id)
+
+    def test_drain_links_registrants_in_one_batch(self, organizer, published_event, contact, django_assert_max_num_queries):
+        RegistrationFactory(event=published_event, user=UserFactory(email=contact.email))
+        RegistrationFactory.create_batch(50, event=published_event, guest=True)
+
+        # A fixed number of statements for the whole batch, plus the final empty claim
+        with django_assert_max_num_queries(16):
+            results = contact_outbox.drain(organizer.id)
+
+        assert results['applied'] == 51
+        assert results['contacts_created'] == 50
+        contact.refresh_from_db()
+        assert contact.events_invited_count == 1
+        assert contact.user.email == contact.email
+        assert Contact.objects.filter(contact_list=contact.contact_list, source='registration').count() == 50
+        assert ContactList.objects.get(pk=contact.contact_list_id).contact_count == 51
+        assert not ContactOutboxEntry.objects.exists()
+
+    def test_drain_records_attendance_once(self, organizer, published_event):
+        registration = RegistrationFactory(event=published_event, guest=True)
+        registration.attendance_eligible = True
+        registration.save(update_fields=['attendance_eligible'])
+        registration.save(update_fields=['attendance_eligible'])
+
+        contact_outbox.drain(organizer.id)
+
+        contact = Contact.objects.get(email=registration.email)
+        assert contact.events_invited_count == 1
+        assert contact.events_attended_count == 1
+        assert contact.last_attended_at is not None
+
+    def test_failed_batch_is_kept_for_retry(self, organizer, published_event):
+        RegistrationFactory(event=published_event, guest=True)
+
+        with patch.object(contact_outbox, 'apply_batch', side_effect=RuntimeError('boom')):
+            results = contact_outbox.drain(organizer.id)
+
+        assert results['failed'] == 1
+        entry = ContactOutboxEntry.objects.get()
+        assert entry.attempts == 1
+        assert entry.last_error == 'boom'
+        assert not Contact.objects.exists()
+
+        assert contact_outbox.drain(organizer.id)['applied'] == 1
+        assert Contact.objects.count() == 1
@@ -333,7 +333,7 @@ class ContactViewSet(BaseModelViewSet):
             email = contact_data['email'].lower()
 
             # Check for duplicate
-            if Contact.objects.filter(contact_list=contact_list, email__iexact=email).exists():
+            if Contact.objects.filter(contact_list=contact_list, email=email).exists():
                 if serializer.validated_data['skip_duplicates']:
                     skipped.append(email)
                     continue
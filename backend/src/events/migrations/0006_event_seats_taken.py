@@ -0,0 +1,42 @@
+"""
+Migration to add Event.seats_taken (admission control) and count existing seats.
+"""
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_seats_taken(apps, schema_editor):
+    """
+    Initialize seats_taken from live confirmed and pending registrations.
+    """
+    Event = apps.get_model("events", "Event")
+    Registration = apps.get_model("registrations", "Registration")
+
+    rows = (
+        Registration.objects.filter(deleted_at__isnull=True, status__in=["confirmed", "pending"])
+        .values("event_id")
+        .annotate(seats=Count("id"))
+        .order_by()
+    )
+    for row in rows:
+        Event.objects.filter(pk=row["event_id"]).update(seats_taken=row["seats"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_add_zoom_error_at'),
+        ('registrations', '0003_registration_seat_hold_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='seats_taken',
+            field=models.PositiveIntegerField(
+                default=0, help_text='Seats held by confirmed and pending registrations (admission control)'
+            ),
+        ),
+        migrations.RunPython(count_seats_taken, migrations.RunPython.noop),
+    ]
@@ -3,13 +3,43 @@ Events app models - Event, EventStatusHistory, EventCustomField.
 """
 
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
-from common.config import AttendanceThresholds, EventDuplication, EventDuration, SessionDefaults
+from common.config import AttendanceReconciliation, AttendanceThresholds, EventDuplication, EventDuration, SessionDefaults
 from common.models import BaseModel, SoftDeleteModel
 from common.validators import validate_zoom_settings_schema
 
+# Denormalized registration counters on Event
+COUNTER_FIELDS = ('registration_count', 'waitlist_count', 'attendance_count', 'certificate_count')
+
+
+def registration_counts(event_ids) -> dict[int, dict[str, int]]:
+    """
+    Count live registrations per event in one query, for the Event counters.
+
+    Returns:
+        {event_id: {counter field: count}} for events that have registrations,
+        plus 'seats_taken' (see Event.recount_seats)
+    """
+    from django.db.models import Count, Q
+
+    from registrations.models import Registration
+
+    rows = (
+        Registration.all_objects.filter(event_id__in=event_ids, deleted_at__isnull=True)
+        .values('event_id')
+        .annotate(
+            registration_count=Count('id', filter=Q(status=Registration.Status.CONFIRMED)),
+            waitlist_count=Count('id', filter=Q(status=Registration.Status.WAITLISTED)),
+            attendance_count=Count('id', filter=Q(attended=True)),
+            certificate_count=Count('id', filter=Q(certificate_issued=True)),
+            seats_taken=Count('id', filter=Q(status__in=Registration.SEAT_STATUSES)),
+        )
+        .order_by()
+    )
+    return {row.pop('event_id'): row for row in rows}
+
 
 class Event(SoftDeleteModel):
     """
@@ -270,6 +300,9 @@ class Event(SoftDeleteModel):
     waitlist_count = models.PositiveIntegerField(default=0, help_text="Waitlisted registrations")
     attendance_count = models.PositiveIntegerField(default=0, help_text="Attendees who joined")
     certificate_count = models.PositiveIntegerField(default=0, help_text="Certificates issued")
+    seats_taken = models.PositiveIntegerField(
+        default=0, help_text="Seats held by confirmed and pending registrations (admission control)"
+    )
 
     class Meta:
         db_table = 'events'
@@ -297,6 +330,25 @@ class Event(SoftDeleteModel):
         """Calculate scheduled end time."""
         return self.starts_at + timezone.timedelta(minutes=self.duration_minutes)
 
+    @property
+    def attendance_window(self):
+        """(start, end) that attended minutes are clipped to; allows for overruns."""
+        return self.starts_at, self.ends_at + timezone.timedelta(minutes=AttendanceReconciliation.WINDOW_GRACE_MINUTES)
+
+    @property
+    def attendance_windows(self) -> list[tuple]:
+        """
+        Windows that attended minutes are clipped to.
+
+        Each published session's window for a multi-session event (one query),
+        otherwise just the event's own attendance_window.
+        """
+        if self.is_multi_session:
+            windows = [session.attendance_window for session in self.sessions.filter(is_published=True)]
+            if windows:
+                return windows
+        return [self.attendance_window]
+
     @property
     def is_upcoming(self):
         """Check if event is in the future."""
@@ -322,7 +374,7 @@ class Event(SoftDeleteModel):
         """Check if registration is at capacity."""
         if self.max_attendees is None:
             return False
-        return self.registration_count >= self.max_attendees
+        return self.seats_taken >= self.max_attendees
 
     @property
     def registration_open(self):
@@ -365,7 +417,7 @@ class Event(SoftDeleteModel):
         """Number of spots remaining."""
         if self.max_attendees is None:
             return None
-        return max(0, self.max_attendees - self.registration_count)
+        return max(0, self.max_attendees - self.seats_taken)
 
     # =========================================
     # Status Methods
@@ -442,41 +494,40 @@ class Event(SoftDeleteModel):
     # Count Methods
     # =========================================
     def update_counts(self):
-        """Update denormalized counts from related objects."""
-        from registrations.models import Registration
-
-        registrations = self.registrations.filter(deleted_at__isnull=True)
+        """
+        Recount denormalized counts from related objects.
 
-        self.registration_count = registrations.filter(status=Registration.Status.CONFIRMED).count()
+        Registration saves keep the counts current with F() deltas; this full
+        recount repairs drift (recount_event_counters) and backs manual fixes.
+        """
+        counts = registration_counts([self.pk]).get(self.pk, {})
+        for field in COUNTER_FIELDS:
+            setattr(self, field, counts.get(field, 0))
 
-        self.waitlist_count = registrations.filter(status=Registration.Status.WAITLISTED).count()
+        self.save(update_fields=[*COUNTER_FIELDS, 'updated_at'])
 
-        self.attendance_count = registrations.filter(attended=True).count()
+    def recount_seats(self):
+        """
+        Recount seats_taken from registrations, holding the event row lock.
 
-        self.certificate_count = registrations.filter(certificate_issued=True).count()
+        Admissions (registrations.admission) update seats_taken under the
+        same lock, so none can land between the count and the write.
+        """
+        from registrations.models import Registration
 
-        self.save(update_fields=['registration_count', 'waitlist_count', 'attendance_count', 'certificate_count', 'updated_at'])
+        with transaction.atomic():
+            Event.all_objects.select_for_update().filter(pk=self.pk).values_list('pk').first()
+            self.seats_taken = Registration.all_objects.filter(
+                event_id=self.pk, deleted_at__isnull=True, status__in=Registration.SEAT_STATUSES
+            ).count()
+            Event.all_objects.filter(pk=self.pk).update(seats_taken=self.seats_taken)
 
     def _auto_issue_certificates(self):
         """Auto-issue certificates to all eligible attendees."""
         from certificates.services import certificate_service
-        from registrations.models import Registration
 
-        # Get all eligible registrations
-        eligible = (
-            Registration.objects.filter(event=self, status='confirmed', deleted_at__isnull=True)
-            .filter(models.Q(attendance_eligible=True) | models.Q(attendance_override=True))
-            .exclude(certificate_issued=True)
-        )
-
-        issued_count = 0
-        for registration in eligible:
-            if registration.can_receive_certificate:
-                result = certificate_service.issue_certificate(registration=registration, issued_by=self.owner)
-                if result.get('success'):
-                    issued_count += 1
-
-        return issued_count
+        result = certificate_service.issue_bulk(self, issued_by=self.owner)
+        return result['success']
 
     def _auto_issue_badges(self):
         """Auto-issue badges to all eligible attendees."""
@@ -627,6 +678,11 @@ class EventSession(BaseModel):
     def ends_at(self):
         return self.starts_at + timezone.timedelta(minutes=self.duration_minutes)
 
+    @property
+    def attendance_window(self):
+        """(start, end) that attended minutes are clipped to; allows for overruns."""
+        return self.starts_at, self.ends_at + timezone.timedelta(minutes=AttendanceReconciliation.WINDOW_GRACE_MINUTES)
+
     @property
     def is_past(self):
         return timezone.now() > self.ends_at
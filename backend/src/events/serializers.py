@@ -817,7 +817,7 @@ class PublicEventDetailSerializer(PublicEventListSerializer):
     def get_spots_remaining(self, obj):
         if not obj.max_attendees:
             return None
-        return max(0, obj.max_attendees - obj.registration_count)
+        return max(0, obj.max_attendees - obj.seats_taken)
 
     def get_sessions(self, obj):
         """Return published sessions for multi-session events."""
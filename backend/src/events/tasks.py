@@ -6,7 +6,7 @@ import logging
 
 from django.utils import timezone
 
-from common.cloud_tasks import task
+from common.cloud_tasks import RetryPolicy, chunk_task, map_queryset, task
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +16,16 @@ def send_event_reminders(hours_before: int = 24):
     """
     Send reminders for upcoming events.
 
+    Each event's confirmed registrations are fanned out to
+    send_event_reminder_chunk tasks.
+
     Args:
         hours_before: Hours before event to send reminder
+
+    Returns:
+        Number of registrations reminders were dispatched for
     """
     from events.models import Event
-    from integrations.services import email_service
     from registrations.models import Registration
 
     now = timezone.now()
@@ -33,26 +38,44 @@ def send_event_reminders(hours_before: int = 24):
 
     count = 0
     for event in events:
-        # Get confirmed registrations
-        registrations = Registration.objects.filter(event=event, status='confirmed').select_related('user')
-
-        for reg in registrations:
-            email_service.send_email(
-                template='event_reminder',
-                recipient=reg.user.email,
-                context={
-                    'user_name': reg.user.full_name,
-                    'event_title': event.title,
-                    'event_date': event.starts_at.strftime('%B %d, %Y at %I:%M %p'),
-                    'join_url': event.zoom_join_url or '',
-                },
-            )
-            count += 1
+        job = map_queryset(Registration.objects.filter(event=event, status='confirmed'), send_event_reminder_chunk, event.id)
+        count += job.total_items
 
-    logger.info(f"Sent {count} event reminders")
+    logger.info(f"Dispatched {count} event reminders")
     return count
 
 
+@chunk_task()
+def send_event_reminder_chunk(first_id: int, last_id: int, event_id: int):
+    """
+    Send reminders to one chunk of an event's confirmed registrations.
+    """
+    from events.models import Event
+    from integrations.services import email_service
+    from registrations.models import Registration
+
+    event = Event.objects.get(id=event_id)
+    registrations = Registration.objects.filter(event=event, status='confirmed', pk__range=(first_id, last_id)).select_related(
+        'user'
+    )
+
+    sent = 0
+    for reg in registrations:
+        email_service.send_email(
+            template='event_reminder',
+            recipient=reg.user.email,
+            context={
+                'user_name': reg.user.full_name,
+                'event_title': event.title,
+                'event_date': event.starts_at.strftime('%B %d, %Y at %I:%M %p'),
+                'join_url': event.zoom_join_url or '',
+            },
+        )
+        sent += 1
+
+    return {'sent': sent}
+
+
 @task()
 def auto_complete_events():
     """
@@ -84,6 +107,7 @@ def create_zoom_meeting(event_id: int):
     """
     from accounts.services import zoom_service
     from events.models import Event
+    from registrations.tasks import sync_zoom_registrants
 
     try:
         event = Event.objects.get(id=event_id)
@@ -103,6 +127,9 @@ def create_zoom_meeting(event_id: int):
             event.zoom_error_at = None
             event.save(update_fields=['zoom_error', 'zoom_error_at', 'updated_at'])
 
+        # Registrations made before the meeting existed, in batches rather than a task each
+        sync_zoom_registrants.delay(event.id)
+
         return True
     except Event.DoesNotExist:
         return False
@@ -114,19 +141,130 @@ def sync_zoom_attendance(event_id: int):
     Recalculate attendance statistics for an event.
 
     Attendance data is collected via Zoom webhooks (participant_joined/left).
-    This task aggregates that data and updates registration attendance summaries.
+    Unmatched attendance records are matched first (participant_matcher), then
+    confirmed registrations are fanned out to sync_attendance_chunk tasks,
+    which update their attendance summaries; the FanOutJob collects the
+    matched/unmatched/eligible/ineligible totals.
     """
     from events.models import Event
-    from integrations.services import attendance_matcher
+    from integrations.services import participant_matcher
+    from registrations.models import Registration
 
     try:
         event = Event.objects.get(id=event_id)
-        result = attendance_matcher.match_attendance(event)
-        logger.info(f"Synced attendance for event {event_id}: {result}")
-        return result
     except Event.DoesNotExist:
         return {}
 
+    participant_matcher.match_unmatched_records(event)
+    job = map_queryset(Registration.objects.filter(event=event, status='confirmed'), sync_attendance_chunk, event.id)
+    logger.info(f"Syncing attendance for event {event_id} in {job.total_chunks} chunks (job {job.uuid})")
+    return {'job_id': str(job.uuid), 'chunks': job.total_chunks, **job.results}
+
+
+@task(retry=RetryPolicy(max_retries=4, backoff_base=900))  # 15, 30, 60, 60 minutes
+def import_zoom_participant_report(event_id: int, retry_count: int = 0):
+    """
+    Import an event's Zoom participant report, then resync attendance.
+
+    Queued after meeting.ended to backfill segments whose webhooks were
+    missed. Zoom builds the report some time after the meeting, so failures
+    (e.g. the report isn't ready yet) are retried with backoff.
+    """
+    from accounts.services import ZoomApiError
+    from events.models import Event
+    from integrations.services import attendance_matcher
+
+    try:
+        event = Event.objects.select_related('owner').get(id=event_id)
+    except Event.DoesNotExist:
+        return {}
+    if not event.zoom_meeting_id:
+        return {}
+
+    try:
+        counts = attendance_matcher.import_participant_report(event)
+    except ZoomApiError as e:
+        logger.warning(f"Zoom participant report for event {event_id} not imported: {e}")
+        if not import_zoom_participant_report.retry(retry_count, event_id, retry_count=retry_count + 1):
+            logger.error(f"Giving up on Zoom participant report for event {event_id}")
+        return {}
+
+    if counts['created'] or counts['closed']:
+        sync_zoom_attendance.delay(event_id)
+    return counts
+
+
+@chunk_task()
+def sync_attendance_chunk(first_id: int, last_id: int, event_id: int):
+    """
+    Recalculate attendance summaries for one chunk of an event's confirmed registrations.
+    """
+    from events.models import Event
+    from integrations.services import attendance_matcher
+    from registrations.models import Registration
+
+    event = Event.objects.get(id=event_id)
+    registrations = Registration.objects.filter(event=event, status='confirmed', pk__range=(first_id, last_id))
+    return attendance_matcher.match_attendance(event, registrations=registrations)
+
+
+@task()
+def recount_event_counters():
+    """
+    Repair drift in events' denormalized registration counters.
+
+    Registration saves maintain the counters with F() deltas, which
+    queryset updates and lost races can leave off. Non-draft events starting
+    within EventCounters.RECOUNT_RECENT_DAYS back, or later, are fanned out
+    to recount_event_counters_chunk.
+
+    Returns:
+        Number of events dispatched for recounting
+    """
+    from common.config import EventCounters
+    from events.models import Event
+
+    since = timezone.now() - timezone.timedelta(days=EventCounters.RECOUNT_RECENT_DAYS)
+    events = Event.objects.exclude(status=Event.Status.DRAFT).filter(starts_at__gte=since)
+    job = map_queryset(events, recount_event_counters_chunk)
+    logger.info(f"Dispatched counter recount for {job.total_items} events (job {job.uuid})")
+    return job.total_items
+
+
+@chunk_task()
+def recount_event_counters_chunk(first_id: int, last_id: int):
+    """
+    Recount one chunk of events in one query and write only the events that drifted.
+    """
+    from events.models import COUNTER_FIELDS, Event, registration_counts
+
+    events = list(
+        Event.objects.exclude(status=Event.Status.DRAFT)
+        .filter(pk__range=(first_id, last_id))
+        .only('id', 'seats_taken', *COUNTER_FIELDS)
+    )
+    counts = registration_counts([event.pk for event in events])
+
+    now = timezone.now()
+    drifted = []
+    seats_drifted = 0
+    for event in events:
+        actual = counts.get(event.pk, {})
+        if any(getattr(event, field) != actual.get(field, 0) for field in COUNTER_FIELDS):
+            logger.warning(f"Event {event.pk} counters drifted: {actual}")
+            for field in COUNTER_FIELDS:
+                setattr(event, field, actual.get(field, 0))
+            event.updated_at = now
+            drifted.append(event)
+        if event.seats_taken != actual.get('seats_taken', 0):
+            # Admissions race with this unlocked read; recount under the row lock
+            logger.warning(f"Event {event.pk} seats_taken drifted: {event.seats_taken} != {actual.get('seats_taken', 0)}")
+            event.recount_seats()
+            seats_drifted += 1
+    Event.objects.bulk_update(drifted, [*COUNTER_FIELDS, 'updated_at'])
+
+    return {'checked': len(events), 'repaired': len(drifted), 'seats_repaired': seats_drifted}
+
 
 @task()
 def update_event_counts(event_id: int):
@@ -148,12 +286,15 @@ def notify_event_cancelled(event_id: int):
     """
     Notify all registrants that an event has been cancelled.
 
+    Confirmed registrations are fanned out to notify_event_cancelled_chunk tasks.
+
     Args:
         event_id: ID of the cancelled event
+
+    Returns:
+        Number of registrations notifications were dispatched for
     """
     from events.models import Event
-    from integrations.models import EmailLog
-    from integrations.tasks import send_email
     from registrations.models import Registration
 
     try:
@@ -163,15 +304,36 @@ def notify_event_cancelled(event_id: int):
             logger.warning(f"Event {event_id} is not cancelled, skipping notification")
             return 0
 
-        # Get all confirmed registrations
-        registrations = Registration.objects.filter(event=event, status='confirmed', deleted_at__isnull=True).select_related(
-            'user'
-        )
+        registrations = Registration.objects.filter(event=event, status='confirmed', deleted_at__isnull=True)
+        job = map_queryset(registrations, notify_event_cancelled_chunk, event.id)
+
+        logger.info(f"Dispatched {job.total_items} cancellation notifications for event {event_id} (job {job.uuid})")
+        return job.total_items
+
+    except Event.DoesNotExist:
+        logger.error(f"Event {event_id} not found")
+        return 0
+
+
+@chunk_task()
+def notify_event_cancelled_chunk(first_id: int, last_id: int, event_id: int):
+    """
+    Queue cancellation emails for one chunk of an event's confirmed registrations.
+    """
+    from events.models import Event
+    from integrations.models import EmailLog
+    from integrations.tasks import send_email
+    from registrations.models import Registration
 
-        count = 0
-        for reg in registrations:
-            # Create email log
-            email_log = EmailLog.objects.create(
+    event = Event.objects.get(id=event_id)
+    registrations = Registration.objects.filter(
+        event=event, status='confirmed', deleted_at__isnull=True, pk__range=(first_id, last_id)
+    ).select_related('user')
+
+    # Create email logs in one pass, then queue them concurrently
+    email_logs = EmailLog.objects.bulk_create(
+        [
+            EmailLog(
                 recipient_email=reg.email,
                 recipient_name=reg.full_name,
                 recipient_user=reg.user,
@@ -180,16 +342,11 @@ def notify_event_cancelled(event_id: int):
                 event=event,
                 registration=reg,
             )
-            # Queue for sending
-            send_email.delay(email_log.id)
-            count += 1
-
-        logger.info(f"Queued {count} cancellation notifications for event {event_id}")
-        return count
-
-    except Event.DoesNotExist:
-        logger.error(f"Event {event_id} not found")
-        return 0
+            for reg in registrations
+        ]
+    )
+    result = send_email.delay_many(log.id for log in email_logs)
+    return {'enqueued': result['enqueued'], 'failed': len(result['failed'])}
 
 
 @task()
@@ -204,36 +361,44 @@ def send_invitations(invitation_ids: list):
     from integrations.models import EmailLog
     from integrations.tasks import send_email
 
-    count = 0
-    for inv_id in invitation_ids:
-        try:
-            invitation = EventInvitation.objects.select_related('event').get(id=inv_id)
+    invitations = {inv.id: inv for inv in EventInvitation.objects.filter(id__in=invitation_ids).select_related('event')}
+    for inv_id in set(invitation_ids) - invitations.keys():
+        logger.warning(f"Invitation {inv_id} not found")
 
-            if invitation.status != 'pending':
-                continue
+    pending = [inv for inv in invitations.values() if inv.status == 'pending']
+    if not pending:
+        logger.info("Sent 0 invitations")
+        return 0
 
-            # Create email log
-            email_log = EmailLog.objects.create(
+    # Create email logs in one pass
+    email_logs = EmailLog.objects.bulk_create(
+        [
+            EmailLog(
                 recipient_email=invitation.email,
                 recipient_name=invitation.name,
                 email_type=EmailLog.EmailType.INVITATION,
                 subject=f"You're invited: {invitation.event.title}",
                 event=invitation.event,
             )
+            for invitation in pending
+        ]
+    )
 
-            # Queue for sending
-            send_email.delay(email_log.id)
-
-            # Mark invitation as sent
-            invitation.status = 'sent'
-            invitation.sent_at = timezone.now()
-            invitation.save(update_fields=['status', 'sent_at', 'updated_at'])
-
-            count += 1
+    # Queue for sending
+    result = send_email.delay_many(log.id for log in email_logs)
+    failed_log_ids = {item['args'][0] for item in result['failed']}
 
-        except EventInvitation.DoesNotExist:
-            logger.warning(f"Invitation {inv_id} not found")
+    # Mark invitations as sent, except those whose email could not be queued
+    now = timezone.now()
+    sent = []
+    for invitation, email_log in zip(pending, email_logs, strict=True):
+        if email_log.id in failed_log_ids:
             continue
+        invitation.status = 'sent'
+        invitation.sent_at = invitation.updated_at = now
+        sent.append(invitation)
+    EventInvitation.objects.bulk_update(sent, ['status', 'sent_at', 'updated_at'])
 
+    count = len(sent)
     logger.info(f"Sent {count} invitations")
     return count
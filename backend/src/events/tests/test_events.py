@@ -399,6 +399,57 @@ class TestEventActions:
         assert isinstance(response.data, list)
 
 
+@pytest.mark.django_db
+class TestEventCancellationNotifications:
+    """Tests for events.tasks.notify_event_cancelled."""
+
+    def test_queues_one_email_per_confirmed_registration(self, published_event):
+        from unittest.mock import patch
+
+        from events.tasks import notify_event_cancelled
+        from factories import RegistrationFactory
+        from integrations.models import EmailLog
+
+        RegistrationFactory.create_batch(3, event=published_event, status='confirmed')
+        RegistrationFactory(event=published_event, status='cancelled')
+        published_event.status = 'cancelled'
+        published_event.save(update_fields=['status'])
+
+        with patch('integrations.tasks.send_email.delay_many') as mock_delay_many:
+            mock_delay_many.return_value = {'total': 3, 'enqueued': 3, 'failed': []}
+            assert notify_event_cancelled(published_event.id) == 3
+
+        logs = EmailLog.objects.filter(event=published_event, email_type=EmailLog.EmailType.EVENT_UPDATE)
+        assert sorted(mock_delay_many.call_args.args[0]) == sorted(logs.values_list('id', flat=True))
+
+    def test_fans_out_in_chunks_tracked_by_job(self, published_event):
+        from unittest.mock import patch
+
+        from common.config import FanOut
+        from common.models import FanOutJob
+        from events.tasks import notify_event_cancelled
+        from factories import RegistrationFactory
+        from integrations.models import EmailLog
+
+        RegistrationFactory.create_batch(5, event=published_event, status='confirmed')
+        published_event.status = 'cancelled'
+        published_event.save(update_fields=['status'])
+
+        with (
+            patch.object(FanOut, 'CHUNK_SIZE', 2),
+            patch('integrations.tasks.send_email.delay_many') as mock_delay_many,
+        ):
+            mock_delay_many.side_effect = lambda ids: {'total': len(list(ids)), 'enqueued': 2, 'failed': []}
+            assert notify_event_cancelled(published_event.id) == 5
+
+        assert mock_delay_many.call_count == 3
+        job = FanOutJob.objects.get(task_name='events.tasks.notify_event_cancelled_chunk')
+        assert job.status == FanOutJob.Status.COMPLETED
+        assert job.total_chunks == 3
+        assert job.results == {'enqueued': 6, 'failed': 0}
+        assert EmailLog.objects.filter(event=published_event).count() == 5
+
+
 # =============================================================================
 # Event Dashboard Tests
 # =============================================================================
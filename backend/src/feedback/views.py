@@ -32,7 +32,7 @@ class EventFeedbackViewSet(viewsets.ModelViewSet):
             queryset = EventFeedback.objects.filter(
                 django_models.Q(event__owner=user)
                 | django_models.Q(registration__user=user)
-                | django_models.Q(registration__user__isnull=True, registration__email__iexact=user.email)
+                | django_models.Q(registration__user__isnull=True, registration__email=user.email)
             ).distinct()
 
         event_uuid = self.request.query_params.get('event')
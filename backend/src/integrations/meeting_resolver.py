@@ -0,0 +1,176 @@
+"""
+Zoom meeting ID resolution for webhook handlers.
+
+Every Zoom webhook names a meeting ID that belongs to an Event or a
+CourseSession (or to nothing on this platform). Resolving it costs up to
+two queries per webhook, so targets are cached per process with a TTL;
+unknown meetings are cached too, with a shorter TTL. Saving or deleting an
+Event or CourseSession invalidates its entry in this process (see
+integrations.signals); other processes see the change within the TTL.
+
+Usage:
+    from integrations.meeting_resolver import meeting_resolver
+
+    target = meeting_resolver.resolve(meeting_id)
+    if target and target.kind == MeetingTarget.EVENT:
+        AttendanceRecord.objects.filter(event_id=target.pk, ...)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from common.config import MeetingResolution
+
+
+class MeetingTarget(NamedTuple):
+    """What a Zoom meeting ID belongs to."""
+
+    EVENT = 'event'
+    SESSION = 'session'
+
+    kind: str
+    pk: int
+
+
+class MeetingResolver:
+    """
+    Bounded LRU cache of meeting ID -> MeetingTarget (or None), with TTLs.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: OrderedDict[str, tuple[MeetingTarget | None, float]] = OrderedDict()
+        self._by_target: dict[MeetingTarget, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, meeting_id: str) -> MeetingTarget | None:
+        """
+        Return the Event or CourseSession target for a meeting ID, or None.
+
+        Events win over course sessions, as in the webhook handlers.
+        """
+        meeting_id = str(meeting_id)
+        if not meeting_id:
+            return None
+
+        now = time.monotonic()
+        hit, target = self._cached(meeting_id, now)
+        if hit:
+            return target
+        target = self._lookup(meeting_id)
+        self._store(meeting_id, target, now)
+        return target
+
+    def event(self, meeting_id: str):
+        """
+        The Event for a meeting ID, or None.
+
+        On a cache miss the event is loaded by meeting ID directly, so a
+        cold lookup costs the same single query as a warm one.
+        """
+        from events.models import Event
+
+        meeting_id = str(meeting_id)
+        if not meeting_id:
+            return None
+
+        now = time.monotonic()
+        hit, target = self._cached(meeting_id, now)
+        if not hit:
+            event = Event.objects.filter(zoom_meeting_id=meeting_id).first()
+            if event:
+                self._store(meeting_id, MeetingTarget(MeetingTarget.EVENT, event.pk), now)
+                return event
+            target = self._lookup_session(meeting_id)
+            self._store(meeting_id, target, now)
+        if not target or target.kind != MeetingTarget.EVENT:
+            return None
+        return Event.objects.filter(pk=target.pk).first()
+
+    def session(self, meeting_id: str):
+        """The CourseSession (with its course) for a meeting ID, or None."""
+        from learning.models import CourseSession
+
+        target = self.resolve(meeting_id)
+        if not target or target.kind != MeetingTarget.SESSION:
+            return None
+        return CourseSession.objects.select_related('course').filter(pk=target.pk).first()
+
+    def invalidate(self, meeting_id: str = '', target: MeetingTarget | None = None):
+        """Drop the entry for a meeting ID and/or the entry pointing at a target."""
+        with self._lock:
+            if target and target in self._by_target:
+                self._discard(self._by_target[target])
+            if meeting_id:
+                self._discard(str(meeting_id))
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._by_target.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Entry count and hit/miss counters."""
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _cached(self, meeting_id: str, now: float) -> tuple[bool, MeetingTarget | None]:
+        """(hit, target) for a meeting ID, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(meeting_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(meeting_id)
+                self.hits += 1
+                return True, entry[0]
+            self.misses += 1
+        return False, None
+
+    def _store(self, meeting_id: str, target: MeetingTarget | None, now: float):
+        """Cache a looked-up target (or its absence), evicting the least recently used entries."""
+        ttl = self.ttl_seconds if target else self.negative_ttl_seconds
+        with self._lock:
+            self._discard(meeting_id)
+            self._entries[meeting_id] = (target, now + ttl)
+            if target:
+                self._by_target[target] = meeting_id
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, meeting_id: str):
+        """Remove an entry and its reverse index (caller holds the lock)."""
+        entry = self._entries.pop(meeting_id, None)
+        if entry and entry[0]:
+            self._by_target.pop(entry[0], None)
+
+    def _lookup(self, meeting_id: str) -> MeetingTarget | None:
+        """Query Event, then CourseSession."""
+        from events.models import Event
+
+        event_pk = Event.objects.filter(zoom_meeting_id=meeting_id).values_list('pk', flat=True).first()
+        if event_pk:
+            return MeetingTarget(MeetingTarget.EVENT, event_pk)
+        return self._lookup_session(meeting_id)
+
+    def _lookup_session(self, meeting_id: str) -> MeetingTarget | None:
+        """Query CourseSession."""
+        from learning.models import CourseSession
+
+        session_pk = CourseSession.objects.filter(zoom_meeting_id=meeting_id).values_list('pk', flat=True).first()
+        if session_pk:
+            return MeetingTarget(MeetingTarget.SESSION, session_pk)
+        return None
+
+
+# Singleton instance
+meeting_resolver = MeetingResolver(
+    max_entries=MeetingResolution.MAX_ENTRIES,
+    ttl_seconds=MeetingResolution.TTL_SECONDS,
+    negative_ttl_seconds=MeetingResolution.NEGATIVE_TTL_SECONDS,
+)
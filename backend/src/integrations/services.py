@@ -3,6 +3,7 @@ Integration services for email, webhooks, and external providers.
 """
 
 import logging
+from collections import defaultdict
 from typing import Any
 
 from django.conf import settings
@@ -234,6 +235,236 @@ class WebhookProcessor:
             log.save(update_fields=["error_message", "updated_at"])
             return False
 
+    # Zoom event types handled in bulk by process_zoom_batch
+    JOIN_EVENTS = ("meeting.participant_joined", "webinar.participant_joined")
+    LEAVE_EVENTS = ("meeting.participant_left", "webinar.participant_left")
+
+    def drain_zoom_meeting(self, meeting_id: str) -> dict[str, int]:
+        """
+        Process a meeting's pending webhook logs in batches until none are left.
+
+        Used with ZOOM_WEBHOOK_INGESTION='batched', where the webhook view only
+        writes the log and a drain is scheduled per meeting.
+
+        Returns:
+            Dict with processed, failed and records_created counts
+        """
+        from integrations.models import ZoomWebhookLog
+
+        results = {"processed": 0, "failed": 0, "records_created": 0}
+        while logs := self._claim_pending_logs(meeting_id):
+            try:
+                batch = self.process_zoom_batch(meeting_id, logs)
+            except Exception as e:
+                # Leave the batch for retry_failed_webhooks, which replays logs one by one
+                logger.error(f"Zoom webhook batch for meeting {meeting_id} failed: {e}")
+                ZoomWebhookLog.objects.filter(
+                    pk__in=[log.pk for log in logs], processing_status=ZoomWebhookLog.ProcessingStatus.PROCESSING
+                ).update(processing_status=ZoomWebhookLog.ProcessingStatus.FAILED, error_message=str(e)[:1000])
+                batch = {"failed": len(logs)}
+            for key, value in batch.items():
+                results[key] += value
+        return results
+
+    def _claim_pending_logs(self, meeting_id: str) -> list:
+        """Claim up to WebhookConfig.BATCH_SIZE pending logs for a meeting, oldest first."""
+        from django.db import transaction
+        from django.db.models import F
+
+        from common.config import WebhookConfig
+        from integrations.models import ZoomWebhookLog
+
+        pending = ZoomWebhookLog.ProcessingStatus.PENDING
+        with transaction.atomic():
+            ids = list(
+                ZoomWebhookLog.objects.filter(zoom_meeting_id=meeting_id, processing_status=pending)
+                .select_for_update(skip_locked=True)
+                .order_by("event_timestamp", "id")
+                .values_list("id", flat=True)[: WebhookConfig.BATCH_SIZE]
+            )
+            now = timezone.now()
+            ZoomWebhookLog.objects.filter(pk__in=ids, processing_status=pending).update(
+                processing_status=ZoomWebhookLog.ProcessingStatus.PROCESSING,
+                processing_attempts=F("processing_attempts") + 1,
+                last_attempt_at=now,
+                updated_at=now,
+            )
+        return list(ZoomWebhookLog.objects.filter(pk__in=ids).order_by("event_timestamp", "id"))
+
+    def process_zoom_batch(self, meeting_id: str, logs: list) -> dict[str, int]:
+        """
+        Process claimed webhook logs for one meeting, in event order.
+
+        The event is resolved once. Consecutive joins are ingested together
+        (one registration query, one bulk_create), as are consecutive leaves;
+        other webhooks, and meetings that belong to a course session, go
+        through the per-log handlers.
+
+        Returns:
+            Dict with processed, failed and records_created counts
+        """
+        from integrations.meeting_resolver import meeting_resolver
+
+        event = meeting_resolver.event(meeting_id)
+        created, failed = set(), {}
+
+        run, run_type = [], None
+        for log in [*logs, None]:
+            log_type = log and self._batch_type(event, log.event_type)
+            if run and (log_type != run_type or log_type is None):
+                ingest = self._ingest_joins if run_type == "join" else self._ingest_leaves
+                run_created, run_failed = ingest(event, run)
+                created |= run_created
+                failed.update(run_failed)
+                run = []
+            if log is None:
+                break
+            if log_type:
+                run.append(log)
+                run_type = log_type
+            elif not self.process_zoom_webhook(log):
+                failed[log.pk] = log.error_message or "Unknown error during processing"
+
+        self._complete_batch(event, logs, created, failed)
+        return {"processed": len(logs) - len(failed), "failed": len(failed), "records_created": len(created)}
+
+    def _batch_type(self, event, event_type: str) -> str | None:
+        """'join' or 'leave' for webhooks ingested in bulk, None for the per-log handlers."""
+        if event is None:
+            return None
+        if event_type in self.JOIN_EVENTS:
+            return "join"
+        if event_type in self.LEAVE_EVENTS:
+            return "leave"
+        return None
+
+    def _ingest_joins(self, event, logs: list) -> tuple[set, dict]:
+        """
+        Create AttendanceRecords for a run of join webhooks.
+
+        Matches registrations by email in one query, skips records that
+        already exist (redelivered webhooks), bulk-creates the rest and
+        applies first joins to registrations in one UPDATE.
+
+        Returns:
+            (ids of logs that created a record, {log id: error} for invalid logs)
+        """
+        from django.utils.dateparse import parse_datetime
+
+        from registrations.models import AttendanceRecord, Registration
+
+        joins, failed = [], {}
+        for log in logs:
+            participant = log.payload.get("payload", {}).get("object", {}).get("participant", {})
+            join_time_str = participant.get("join_time")
+            join_time = parse_datetime(join_time_str) if join_time_str else None
+            if not join_time:
+                failed[log.pk] = "Missing meeting_id or join_time in payload"
+                continue
+            joins.append((log, participant, join_time))
+
+        # Email and alias emails; display names are left to reconciliation
+        registrations = participant_matcher.match_many(
+            event, {(participant.get("email", ""), "") for _, participant, _ in joins}, use_names=False
+        )
+
+        seen = set(
+            AttendanceRecord.objects.filter(
+                event=event, zoom_participant_id__in={participant.get("id", "") for _, participant, _ in joins}
+            ).values_list("zoom_participant_id", "join_time")
+        )
+
+        now = timezone.now()
+        records, created, first_joins = [], set(), {}
+        for log, participant, join_time in joins:
+            key = (participant.get("id", ""), join_time)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            registration = registrations.get((participant.get("email", ""), ""))
+            records.append(
+                AttendanceRecord(
+                    event=event,
+                    registration=registration,
+                    zoom_participant_id=key[0],
+                    zoom_user_id=participant.get("user_id", ""),
+                    zoom_user_email=participant.get("email", ""),
+                    zoom_user_name=participant.get("user_name", ""),
+                    join_time=join_time,
+                    is_matched=registration is not None,
+                    matched_at=now if registration else None,
+                )
+            )
+            created.add(log.pk)
+            if registration and (registration.pk not in first_joins or join_time < first_joins[registration.pk]):
+                first_joins[registration.pk] = join_time
+
+        AttendanceRecord.objects.bulk_create(records)
+        Registration.record_attendance_joins(first_joins)
+        logger.info(f"Ingested {len(records)} joins for event {event.uuid}")
+        return created, failed
+
+    def _ingest_leaves(self, event, logs: list) -> tuple[set, dict]:
+        """
+        Close AttendanceRecords for a run of leave webhooks.
+
+        Open records for every participant in the run are loaded in one query;
+        each is then closed with AttendanceRecord.participant_left().
+
+        Returns:
+            (empty set, {log id: error} for invalid logs)
+        """
+        from django.utils.dateparse import parse_datetime
+
+        from registrations.models import AttendanceRecord
+
+        leaves, failed = [], {}
+        for log in logs:
+            participant = log.payload.get("payload", {}).get("object", {}).get("participant", {})
+            leave_time_str = participant.get("leave_time")
+            leave_time = parse_datetime(leave_time_str) if leave_time_str else None
+            if not participant.get("id") or not leave_time:
+                failed[log.pk] = "Missing participant id or leave_time in payload"
+                continue
+            leaves.append((participant["id"], leave_time))
+
+        # Open records per participant; each leave closes the latest, as _handle_participant_left does
+        open_records = defaultdict(list)
+        for record in (
+            AttendanceRecord.objects.filter(
+                event=event, zoom_participant_id__in={pid for pid, _ in leaves}, leave_time__isnull=True
+            )
+            .select_related("registration__event")
+            .order_by("join_time")
+        ):
+            open_records[record.zoom_participant_id].append(record)
+
+        for participant_id, leave_time in leaves:
+            if open_records[participant_id]:
+                open_records[participant_id].pop().participant_left(leave_time=leave_time)
+        return set(), failed
+
+    def _complete_batch(self, event, logs: list, created: set, failed: dict):
+        """Mark a batch's logs completed (in bulk) or failed."""
+        from integrations.models import ZoomWebhookLog
+
+        now = timezone.now()
+        completed = {log.pk for log in logs} - set(failed)
+        for records_created, ids in ((1, completed & created), (0, completed - created)):
+            ZoomWebhookLog.objects.filter(pk__in=ids).update(
+                processing_status=ZoomWebhookLog.ProcessingStatus.COMPLETED,
+                processed_at=now,
+                attendance_records_created=records_created,
+                event=event,
+                error_message="",
+                error_traceback="",
+                updated_at=now,
+            )
+        for log in logs:
+            if log.pk in failed:
+                log.mark_failed(failed[log.pk])
+
     def _get_zoom_handler(self, event_type: str):
         """Get handler for Zoom event type."""
         handlers = {
@@ -251,7 +482,7 @@ class WebhookProcessor:
 
     def _handle_meeting_started(self, payload: dict) -> bool:
         """Handle meeting/webinar start event."""
-        from events.models import Event
+        from integrations.meeting_resolver import meeting_resolver
 
         meeting_id = str(payload.get("object", {}).get("id", ""))
 
@@ -262,27 +493,21 @@ class WebhookProcessor:
         logger.info(f"Meeting/Webinar started: {meeting_id}")
 
         # Try to find Event
-        try:
-            event = Event.objects.get(zoom_meeting_id=meeting_id)
+        event = meeting_resolver.event(meeting_id)
+        if event:
             # Mark event as live if it's scheduled
             if event.status == "scheduled":
                 event.status = "live"
                 event.save(update_fields=["status", "updated_at"])
                 logger.info(f"Marked event {event.uuid} as live")
             return True
-        except Event.DoesNotExist:
-            pass
 
         # Try CourseSession
-        try:
-            from learning.models import CourseSession
-
-            session = CourseSession.objects.get(zoom_meeting_id=meeting_id)
+        session = meeting_resolver.session(meeting_id)
+        if session:
             # Could add session status updates here if needed
             logger.info(f"Session started: {session.uuid}")
             return True
-        except Exception:
-            pass
 
         logger.warning(f"Event/Session not found for Zoom meeting ID: {meeting_id}")
         return True  # Return True to acknowledge webhook receipt
@@ -291,8 +516,8 @@ class WebhookProcessor:
         """Handle participant join event."""
         from django.utils.dateparse import parse_datetime
 
-        from events.models import Event
-        from registrations.models import AttendanceRecord, Registration
+        from integrations.meeting_resolver import MeetingTarget, meeting_resolver
+        from registrations.models import AttendanceRecord
 
         # Extract data
         meeting_id = str(payload.get("object", {}).get("id", ""))
@@ -312,20 +537,16 @@ class WebhookProcessor:
             logger.warning("Missing meeting_id or join_time in payload")
             return False
 
-        # Try to find Event first
-        try:
-            event = Event.objects.get(zoom_meeting_id=meeting_id)
+        target = meeting_resolver.resolve(meeting_id)
 
-            # Find Registration (if any)
-            registration = None
-            if user_email:
-                registration = Registration.objects.filter(
-                    event=event, email__iexact=user_email, deleted_at__isnull=True
-                ).first()
+        # Event: only its pk is needed
+        if target and target.kind == MeetingTarget.EVENT:
+            # Find Registration (if any), by email or alias email
+            registration = participant_matcher.match(target.pk, user_email) if user_email else None
 
             # Create Attendance Record
             AttendanceRecord.objects.get_or_create(
-                event=event,
+                event_id=target.pk,
                 zoom_participant_id=participant_uuid,
                 join_time=join_time,
                 defaults={
@@ -339,48 +560,36 @@ class WebhookProcessor:
             )
 
             if registration:
-                registration.update_attendance_summary()
+                registration.record_attendance_join(join_time)
 
             return True
-        except Event.DoesNotExist:
-            pass  # Try CourseSession next
-
-        # Try to find CourseSession
-        try:
-            from learning.models import CourseEnrollment, CourseSession, CourseSessionAttendance
 
-            session = CourseSession.objects.get(zoom_meeting_id=meeting_id)
+        # Try CourseSession
+        if target and target.kind == MeetingTarget.SESSION:
+            from learning.models import CourseEnrollment, CourseSessionAttendance
 
             # Find Enrollment (if any)
             enrollment = None
             if user_email:
                 enrollment = CourseEnrollment.objects.filter(
-                    course=session.course, user__email__iexact=user_email, status="active"
+                    course__sessions=target.pk, user__email=user_email, status="active"
                 ).first()
 
             if enrollment:
                 # Create or update attendance record
                 attendance, created = CourseSessionAttendance.objects.get_or_create(
-                    session=session,
+                    session_id=target.pk,
                     enrollment=enrollment,
                     defaults={
-                        "zoom_participant_id": participant_uuid,
                         "zoom_user_email": user_email,
-                        "zoom_join_time": join_time,
                         "attendance_minutes": 0,
                     },
                 )
-                if not created:
-                    # Update join time if new session (rejoin)
-                    attendance.zoom_join_time = join_time
-                    # Update participant UUID so 'left' event can find record
-                    attendance.zoom_participant_id = participant_uuid
-                    attendance.save(update_fields=["zoom_join_time", "zoom_participant_id", "updated_at"])
-
-            logger.info(f"Session participant joined: {user_email} for session {session.uuid}")
+                # Open a segment per join (rejoin or another device) so 'left' can close it
+                attendance.add_segment_join(participant_uuid, join_time)
+
+            logger.info(f"Session participant joined: {user_email} for session {target.pk}")
             return True
-        except Exception:
-            pass
 
         logger.warning(f"Event/Session not found for Zoom meeting ID: {meeting_id}")
         return True  # Return True to acknowledge webhook receipt
@@ -389,7 +598,7 @@ class WebhookProcessor:
         """Handle participant leave event."""
         from django.utils.dateparse import parse_datetime
 
-        from events.models import Event
+        from integrations.meeting_resolver import MeetingTarget, meeting_resolver
         from registrations.models import AttendanceRecord
 
         meeting_id = str(payload.get("object", {}).get("id", ""))
@@ -405,12 +614,14 @@ class WebhookProcessor:
         if not meeting_id or not participant_uuid or not leave_time:
             return False
 
-        # Try Event first
-        try:
-            event = Event.objects.get(zoom_meeting_id=meeting_id)
+        target = meeting_resolver.resolve(meeting_id)
 
+        # Try Event first
+        if target and target.kind == MeetingTarget.EVENT:
             record = (
-                AttendanceRecord.objects.filter(event=event, zoom_participant_id=participant_uuid, leave_time__isnull=True)
+                AttendanceRecord.objects.filter(
+                    event_id=target.pk, zoom_participant_id=participant_uuid, leave_time__isnull=True
+                )
                 .order_by("-join_time")
                 .first()
             )
@@ -419,56 +630,49 @@ class WebhookProcessor:
                 record.participant_left(leave_time=leave_time)
                 logger.info(f"Closed attendance record for {record}")
             return True
-        except Event.DoesNotExist:
-            pass
 
         # Try CourseSession
-        try:
-            from learning.models import CourseSession, CourseSessionAttendance
-
-            session = CourseSession.objects.get(zoom_meeting_id=meeting_id)
-
-            # Find the attendance record and update leave time + duration
-            attendance = CourseSessionAttendance.objects.filter(session=session, zoom_participant_id=participant_uuid).first()
-
-            if attendance and attendance.zoom_join_time:
-                attendance.zoom_leave_time = leave_time
-                # Calculate duration of THIS segment
-                segment_duration = (leave_time - attendance.zoom_join_time).total_seconds() / 60
-
-                # Accumulate minutes (don't overwrite)
-                if segment_duration > 0:
-                    attendance.attendance_minutes += int(segment_duration)
-
-                # Calculate eligibility based on new total
-                min_required = session.minimum_attendance_percent or 80
-                attendance_percent = (
-                    (attendance.attendance_minutes / session.duration_minutes * 100) if session.duration_minutes else 0
-                )
-                attendance.is_eligible = attendance_percent >= min_required
+        if target and target.kind == MeetingTarget.SESSION:
+            from django.db.models import Q
+
+            from learning.models import CourseSessionAttendance
+
+            # Find the attendance record holding this participant's open segment: the latest join's
+            # participant, or one of the enrollee's other devices (same email)
+            candidates = Q(zoom_participant_id=participant_uuid)
+            if user_email := participant.get("email", ""):
+                candidates |= Q(zoom_user_email=user_email)
+            records = CourseSessionAttendance.objects.filter(candidates, session_id=target.pk).select_related("session")
+            attendance = next(
+                (candidate for candidate in records if candidate.close_segment(participant_uuid, leave_time)), None
+            )
 
-                attendance.save(update_fields=["zoom_leave_time", "attendance_minutes", "is_eligible", "updated_at"])
+            # Segment closed and saved with its minutes and eligibility; overlaps count once
+            if attendance:
+                session = attendance.session
                 logger.info(f"Closed session attendance for session {session.uuid}")
             return True
-        except Exception:
-            pass
 
         return True
 
     def _handle_meeting_ended(self, payload: dict) -> bool:
         """Handle meeting end event."""
-        from events.models import Event
+        from integrations.meeting_resolver import meeting_resolver
 
         meeting_id = str(payload.get("object", {}).get("id", ""))
 
-        try:
-            event = Event.objects.get(zoom_meeting_id=meeting_id)
-            # Auto-complete if still live
-            if event.status == "live":
-                event.complete()
-            return True
-        except Event.DoesNotExist:
-            return True
+        event = meeting_resolver.event(meeting_id)
+        # Auto-complete if still live
+        if event and event.status == "live":
+            event.complete()
+
+        # Backfill whatever webhooks were missed, once Zoom has built the participant report
+        if event:
+            from common.config import AttendanceReconciliation
+            from events.tasks import import_zoom_participant_report
+
+            import_zoom_participant_report.delay_for(AttendanceReconciliation.REPORT_IMPORT_DELAY_MINUTES * 60, event.id)
+        return True
 
     def _handle_recording_completed(self, payload: dict) -> bool:
         """Handle recording completed event."""
@@ -478,16 +682,15 @@ class WebhookProcessor:
         meeting_id = str(recording_data.get("id", ""))
 
         # Find associated event
-        from events.models import Event
+        from integrations.meeting_resolver import MeetingTarget, meeting_resolver
 
-        try:
-            event = Event.objects.get(zoom_meeting_id=meeting_id)
-        except Event.DoesNotExist:
+        target = meeting_resolver.resolve(meeting_id)
+        if not target or target.kind != MeetingTarget.EVENT:
             return True
 
         # Create recording record
         ZoomRecording.objects.create(
-            event=event,
+            event_id=target.pk,
             zoom_meeting_id=meeting_id,
             recording_id=recording_data.get("uuid", ""),
             topic=recording_data.get("topic", ""),
@@ -501,6 +704,122 @@ class WebhookProcessor:
         return True
 
 
+class ParticipantMatcher:
+    """
+    Service for matching Zoom participants to an event's registrations.
+
+    Registration, User and ZoomConnection emails are stored lowercase, so
+    exact lookups hit their indexes (email__iexact can't). Tried in order:
+    - Email: the registration email
+    - Alias emails: the registrant's account email or linked Zoom account email
+    - Display name: normalized, only when exactly one registration has it
+    """
+
+    def match(self, event, email: str = "", name: str = "", use_names: bool = False):
+        """
+        Match one participant.
+
+        Args:
+            event: Event or its pk
+            email: Email reported by Zoom
+            name: Display name reported by Zoom
+            use_names: Fall back to display names (loads the event's registrant names)
+
+        Returns:
+            Registration or None
+        """
+        return self.match_many(event, [(email, name)], use_names=use_names).get((email, name))
+
+    def match_many(self, event, participants, use_names: bool = True) -> dict:
+        """
+        Match many participants with a bounded number of queries.
+
+        Args:
+            event: Event or its pk
+            participants: Iterable of (email, name)
+            use_names: Fall back to display names
+
+        Returns:
+            Dict of (email, name) -> Registration for the participants matched
+        """
+        from django.db.models import Q
+
+        from registrations.models import Registration
+
+        participants = {(email or "", name or "") for email, name in participants}
+        registrations = Registration.objects.filter(event=event, deleted_at__isnull=True)
+        matches = {}
+
+        # Email, on the (event, email) unique index
+        emails = {self._email(email) for email, _ in participants} - {""}
+        if emails:
+            by_email = {reg.email: reg for reg in registrations.filter(email__in=emails)}
+            matches = {key: by_email[self._email(key[0])] for key in participants if self._email(key[0]) in by_email}
+
+        # Alias emails: account email or linked Zoom account email
+        emails = {self._email(email) for email, _ in participants - matches.keys()} - {""}
+        if emails:
+            by_alias = {}
+            for reg in registrations.filter(
+                Q(user__email__in=emails) | Q(user__zoom_connection__zoom_email__in=emails)
+            ).select_related("user__zoom_connection"):
+                by_alias.setdefault(reg.user.email, reg)
+                if hasattr(reg.user, "zoom_connection") and reg.user.zoom_connection.zoom_email:
+                    by_alias.setdefault(reg.user.zoom_connection.zoom_email, reg)
+            for key in participants - matches.keys():
+                if self._email(key[0]) in by_alias:
+                    matches[key] = by_alias[self._email(key[0])]
+
+        # Display name, when it identifies exactly one registration
+        names = {self._name(name) for _, name in participants - matches.keys()} - {""}
+        if use_names and names:
+            by_name = defaultdict(list)
+            for reg in registrations.only("id", "full_name", "email"):
+                if self._name(reg.full_name) in names:
+                    by_name[self._name(reg.full_name)].append(reg)
+            for key in participants - matches.keys():
+                candidates = by_name.get(self._name(key[1]), [])
+                if len(candidates) == 1:
+                    matches[key] = candidates[0]
+
+        return matches
+
+    def match_unmatched_records(self, event) -> int:
+        """
+        Match an event's unmatched attendance records automatically.
+
+        Runs before reconciliation so that only genuinely unknown
+        participants are left for manual match_participant. Registration
+        summaries are not updated here; match_attendance rebuilds them.
+
+        Returns:
+            Number of attendance records matched
+        """
+        from registrations.models import AttendanceRecord
+
+        unmatched = AttendanceRecord.objects.filter(event=event, is_matched=False)
+        participants = set(unmatched.values_list("zoom_user_email", "zoom_user_name").distinct())
+        if not participants:
+            return 0
+
+        now = timezone.now()
+        matched = 0
+        for (email, name), registration in self.match_many(event, participants).items():
+            matched += unmatched.filter(zoom_user_email=email, zoom_user_name=name).update(
+                registration=registration, is_matched=True, matched_at=now, updated_at=now
+            )
+        logger.info(f"Auto-matched {matched} attendance records for event {event.uuid}")
+        return matched
+
+    @staticmethod
+    def _email(email: str) -> str:
+        return email.strip().lower()
+
+    @staticmethod
+    def _name(name: str) -> str:
+        return " ".join(name.casefold().split())
+
+
 class AttendanceMatcher:
     """
     Service for matching Zoom attendance to registrations.
@@ -509,45 +828,281 @@ class AttendanceMatcher:
     This service aggregates that data and updates registration attendance summaries.
     """
 
-    def match_attendance(self, event) -> dict[str, Any]:
+    def match_attendance(self, event, registrations=None, pull_from_zoom: bool = False) -> dict[str, Any]:
         """
         Aggregate attendance data and update registration summaries.
 
         Attendance records are created by Zoom webhooks - this method just
-        recalculates statistics and updates registration eligibility.
+        recalculates statistics and updates registration eligibility, set-based:
+        one query loads every join/leave interval, minutes are the merged
+        intervals clipped to the event window, eligibility is evaluated in
+        memory, and summaries are written back with chunked bulk_update. The
+        result matches calling update_attendance_summary() on each registration.
 
         Args:
             event: Event to match attendance for
+            registrations: Subset of the event's confirmed registrations (e.g. one fan-out chunk);
+                unmatched records are auto-matched only for a full-event call
+            pull_from_zoom: Import the meeting's participant report first (import_participant_report)
 
         Returns:
             Dict with match results: {matched, unmatched, eligible, ineligible}
         """
-        from registrations.models import AttendanceRecord, Registration
+        from django.db.models import Count
 
-        results = {"matched": 0, "unmatched": 0, "eligible": 0, "ineligible": 0}
+        from common.attendance import covered_minutes_within
+        from common.config import AttendanceReconciliation
+        from common.counters import counter_deltas
+        from contacts.models import ContactOutboxEntry
+        from contacts.outbox import contact_outbox
+        from events.models import Event, SessionAttendance
+        from registrations.models import AttendanceRecord, Registration, attendance_eligibility, event_session_totals
 
-        # Get all registrations for event
-        registrations = Registration.objects.filter(event=event, status="confirmed").select_related("user")
+        results = {"matched": 0, "unmatched": 0, "eligible": 0, "ineligible": 0}
 
-        # Get attendance records
-        attendance_records = AttendanceRecord.objects.filter(registration__event=event)
+        if pull_from_zoom:
+            self.import_participant_report(event)
+
+        # Get all registrations for event; first match what can be matched automatically
+        if registrations is None:
+            participant_matcher.match_unmatched_records(event)
+            registrations = Registration.objects.filter(event=event, status="confirmed")
+        registrations = list(
+            registrations.only(
+                "id",
+                "event_id",
+                "check_in_time",
+                "attendance_override",
+                "attendance_eligible",
+                "total_attendance_minutes",
+                "attended",
+                "first_join_at",
+                "last_leave_at",
+            )
+        )
+        if not registrations:
+            return results
+        registration_ids = [reg.pk for reg in registrations]
+
+        # One query for every attendance interval, grouped by registration in memory
+        intervals = defaultdict(list)
+        for registration_id, join_time, leave_time in AttendanceRecord.objects.filter(
+            registration_id__in=registration_ids
+        ).values_list("registration_id", "join_time", "leave_time"):
+            intervals[registration_id].append((join_time, leave_time))
+
+        # Multi-session events: per-session attendance from the same intervals, then eligible counts
+        eligible_sessions, session_totals = {}, (0, 0)
+        if event.is_multi_session:
+            self._update_session_attendance(event, intervals)
+            eligible_sessions = dict(
+                SessionAttendance.objects.filter(registration_id__in=registration_ids, is_eligible=True)
+                .values("registration_id")
+                .annotate(count=Count("id"))
+                .values_list("registration_id", "count")
+            )
+            session_totals = event_session_totals(event)
 
+        windows = event.attendance_windows
+        now = timezone.now()
+        attended_delta = 0
+        newly_eligible = []
         for reg in registrations:
-            records = attendance_records.filter(registration=reg)
+            reg_intervals = intervals.get(reg.pk, [])
+            results["matched" if reg_intervals else "unmatched"] += 1
+
+            # Merged intervals, so overlapping segments (two devices, reconnects) count once
+            total_minutes = covered_minutes_within(reg_intervals, windows)
+            reg.total_attendance_minutes = total_minutes
+            # Attended if joined Zoom OR checked in physically (Hybrid support)
+            attended = total_minutes > 0 or reg.check_in_time is not None
+            attended_delta += int(attended) - int(reg.attended)
+            reg.attended = attended
+            reg.first_join_at = min((join for join, _ in reg_intervals), default=None)
+            reg.last_leave_at = max((leave for _, leave in reg_intervals if leave), default=None)
+            if not reg.attendance_override:
+                was_eligible = reg.attendance_eligible
+                reg.attendance_eligible = attendance_eligibility(
+                    event, total_minutes, reg.check_in_time is not None, eligible_sessions.get(reg.pk, 0), session_totals
+                )
+                if reg.attendance_eligible and not was_eligible:
+                    reg.event = event
+                    newly_eligible.append(reg)
+            reg.updated_at = now
 
-            if records.exists():
-                results["matched"] += 1
-            else:
-                results["unmatched"] += 1
+            results["eligible" if reg.attendance_eligible else "ineligible"] += 1
+
+        Registration.objects.bulk_update(
+            registrations,
+            ["total_attendance_minutes", "attended", "first_join_at", "last_leave_at", "attendance_eligible", "updated_at"],
+            batch_size=AttendanceReconciliation.BULK_UPDATE_BATCH_SIZE,
+        )
+        # bulk_update bypasses post_save, so apply the attended flips to the event counter and
+        # queue the contact attendance of newly eligible registrations here
+        counter_deltas.add(Event, event.pk, attendance_count=attended_delta)
+        contact_outbox.enqueue_many(newly_eligible, ContactOutboxEntry.Kind.ATTENDANCE)
 
-            reg.update_attendance_summary()
+        return results
 
-            if reg.attendance_eligible:
-                results["eligible"] += 1
+    def import_participant_report(self, event) -> dict[str, int]:
+        """
+        Import a past event meeting's Zoom participant report as AttendanceRecords.
+
+        Fills the gaps missed webhooks leave. The report is streamed page by
+        page; segments are normalized and upserted in chunks of
+        REPORT_IMPORT_CHUNK_SIZE, so memory stays flat however large the
+        meeting. Segments are keyed like join webhooks, by (participant id,
+        join time): a segment already recorded is never duplicated, only
+        closed if its leave webhook was missed. Re-running is a no-op.
+        Registration summaries are left to match_attendance().
+
+        Returns:
+            Counts: {created, closed, unchanged, skipped}
+
+        Raises:
+            ZoomApiError: If a report page can't be fetched
+        """
+        from accounts.services import zoom_service
+        from common.config import AttendanceReconciliation
+
+        counts = {"created": 0, "closed": 0, "unchanged": 0, "skipped": 0}
+        chunk = {}
+        for participant in zoom_service.iter_past_meeting_participants(event.owner, event.zoom_meeting_id):
+            segment = self._report_segment(participant)
+            if segment is None:
+                counts["skipped"] += 1
+                continue
+
+            # Duplicates within a chunk collapse here, across chunks on the existing-record lookup
+            key = (segment["participant_id"], segment["join_time"])
+            if key in chunk:
+                counts["unchanged"] += 1
+                chunk[key]["leave_time"] = max(filter(None, (chunk[key]["leave_time"], segment["leave_time"])), default=None)
+                continue
+            chunk[key] = segment
+
+            if len(chunk) >= AttendanceReconciliation.REPORT_IMPORT_CHUNK_SIZE:
+                self._upsert_report_segments(event, chunk, counts)
+                chunk = {}
+        if chunk:
+            self._upsert_report_segments(event, chunk, counts)
+
+        logger.info(f"Imported Zoom participant report for event {event.uuid}: {counts}")
+        return counts
+
+    @staticmethod
+    def _report_segment(participant: dict) -> dict | None:
+        """Normalize a participant report row, or None if it can't be keyed."""
+        from django.utils.dateparse import parse_datetime
+
+        join_time = parse_datetime(participant.get("join_time") or "")
+        if not participant.get("id") or not join_time:
+            return None
+
+        leave_time = parse_datetime(participant.get("leave_time") or "")
+        if not leave_time and participant.get("duration"):
+            leave_time = join_time + timezone.timedelta(seconds=int(participant["duration"]))
+        return {
+            "participant_id": participant["id"],
+            "zoom_user_id": str(participant.get("user_id", "")),
+            "email": (participant.get("user_email") or "").strip().lower(),
+            "name": participant.get("name", ""),
+            "join_time": join_time,
+            "leave_time": max(leave_time, join_time) if leave_time else None,
+        }
+
+    def _upsert_report_segments(self, event, segments: dict, counts: dict):
+        """Create the chunk's new segments and close open records it has leave times for."""
+        from registrations.models import AttendanceRecord
+
+        existing = {
+            (record.zoom_participant_id, record.join_time): record
+            for record in AttendanceRecord.objects.filter(
+                event=event, zoom_participant_id__in={participant_id for participant_id, _ in segments}
+            ).only("id", "zoom_participant_id", "join_time", "leave_time", "duration_minutes")
+        }
+
+        # Email and alias emails; display names are left to match_unmatched_records
+        new_segments = [segment for key, segment in segments.items() if key not in existing]
+        registrations = participant_matcher.match_many(
+            event, {(segment["email"], "") for segment in new_segments}, use_names=False
+        )
+
+        now = timezone.now()
+        to_create = []
+        for segment in new_segments:
+            registration = registrations.get((segment["email"], ""))
+            record = AttendanceRecord(
+                event=event,
+                registration=registration,
+                zoom_participant_id=segment["participant_id"],
+                zoom_user_id=segment["zoom_user_id"],
+                zoom_user_email=segment["email"],
+                zoom_user_name=segment["name"],
+                join_time=segment["join_time"],
+                leave_time=segment["leave_time"],
+                is_matched=registration is not None,
+                matched_at=now if registration else None,
+            )
+            record.calculate_duration()
+            to_create.append(record)
+
+        to_close = []
+        for key, record in existing.items():
+            if key not in segments:
+                continue
+            if record.leave_time is None and segments[key]["leave_time"]:
+                record.leave_time = segments[key]["leave_time"]
+                record.calculate_duration()
+                record.updated_at = now
+                to_close.append(record)
             else:
-                results["ineligible"] += 1
+                counts["unchanged"] += 1
 
-        return results
+        AttendanceRecord.objects.bulk_create(to_create)
+        AttendanceRecord.objects.bulk_update(to_close, ["leave_time", "duration_minutes", "updated_at"])
+        counts["created"] += len(to_create)
+        counts["closed"] += len(to_close)
+
+    def _update_session_attendance(self, event, intervals: dict) -> int:
+        """
+        Upsert SessionAttendance for each published session of a multi-session event.
+
+        Each registration's intervals are clipped to the session window; the
+        session is eligible when the covered minutes reach its minimum
+        attendance percent. Only registrations with attendance records are
+        written, so rows entered by hand for others are kept.
+
+        Returns:
+            Rows written
+        """
+        from common.attendance import covered_minutes
+        from common.config import AttendanceReconciliation
+        from events.models import SessionAttendance
+
+        sessions = list(event.sessions.filter(is_published=True))
+        rows = []
+        for registration_id, reg_intervals in intervals.items():
+            for session in sessions:
+                minutes = covered_minutes(reg_intervals, session.attendance_window)
+                rows.append(
+                    SessionAttendance(
+                        session=session,
+                        registration_id=registration_id,
+                        duration_minutes=minutes,
+                        is_eligible=bool(session.duration_minutes)
+                        and minutes * 100 >= session.minimum_attendance_percent * session.duration_minutes,
+                    )
+                )
+
+        SessionAttendance.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["session", "registration"],
+            update_fields=["duration_minutes", "is_eligible", "updated_at"],
+            batch_size=AttendanceReconciliation.BULK_UPDATE_BATCH_SIZE,
+        )
+        return len(rows)
 
     def match_session_attendance(self, session) -> dict[str, Any]:
         """
@@ -591,4 +1146,5 @@ class AttendanceMatcher:
 # Singleton instances
 email_service = EmailService()
 webhook_processor = WebhookProcessor()
+participant_matcher = ParticipantMatcher()
 attendance_matcher = AttendanceMatcher()
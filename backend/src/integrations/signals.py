@@ -0,0 +1,25 @@
+"""
+Integrations signals.
+
+Keeps the webhook meeting resolver in step with Zoom meeting IDs.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.models import Event
+from learning.models import CourseSession
+
+from .meeting_resolver import MeetingTarget, meeting_resolver
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event_meeting(sender, instance, **kwargs):
+    """Drop cached resolutions for the event's old and current meeting IDs."""
+    meeting_resolver.invalidate(instance.zoom_meeting_id, MeetingTarget(MeetingTarget.EVENT, instance.pk))
+
+
+@receiver([post_save, post_delete], sender=CourseSession)
+def invalidate_session_meeting(sender, instance, **kwargs):
+    """Drop cached resolutions for the session's old and current meeting IDs."""
+    meeting_resolver.invalidate(instance.zoom_meeting_id, MeetingTarget(MeetingTarget.SESSION, instance.pk))
@@ -37,6 +37,43 @@ def process_zoom_webhook(log_id: int):
         return False
 
 
+@task()
+def drain_zoom_webhooks(meeting_id: str):
+    """
+    Process a meeting's pending Zoom webhook logs in batches.
+
+    Scheduled by the webhook view when ZOOM_WEBHOOK_INGESTION='batched'.
+    """
+    from integrations.services import webhook_processor
+
+    results = webhook_processor.drain_zoom_meeting(meeting_id)
+    logger.info(f"Drained Zoom webhooks for meeting {meeting_id}: {results}")
+    return results
+
+
+@task()
+def drain_pending_zoom_webhooks():
+    """
+    Schedule a drain for every meeting with pending webhook logs.
+
+    Periodic safety net for batched ingestion: picks up logs whose drain
+    was lost or raced with the previous batch.
+    """
+    from common.config import WebhookConfig
+    from integrations.models import ZoomWebhookLog
+
+    cutoff = timezone.now() - timezone.timedelta(seconds=WebhookConfig.COALESCE_SECONDS)
+    meeting_ids = list(
+        ZoomWebhookLog.objects.filter(processing_status=ZoomWebhookLog.ProcessingStatus.PENDING, created_at__lt=cutoff)
+        .exclude(zoom_meeting_id='')
+        .values_list('zoom_meeting_id', flat=True)
+        .distinct()
+    )
+    drain_zoom_webhooks.delay_many(meeting_ids)
+    logger.info(f"Scheduled Zoom webhook drains for {len(meeting_ids)} meetings")
+    return len(meeting_ids)
+
+
 @task()
 def cleanup_old_logs(webhook_days: int = 90, email_days: int = 365):
     """
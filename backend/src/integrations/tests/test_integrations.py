@@ -228,6 +228,7 @@ class TestZoomWebhook:
             zoom_meeting_id="999999",
             minimum_attendance_minutes=30,
             duration_minutes=60,
+            starts_at=timezone.now(),  # Attendance is clipped to the event window
         )
         registration = RegistrationFactory(
             event=event,
@@ -480,6 +481,7 @@ class TestNewZoomWebhookEvents:
             zoom_meeting_id="222333444",
             minimum_attendance_minutes=20,
             duration_minutes=45,
+            starts_at=timezone.now(),  # Attendance is clipped to the event window
         )
 
         registration = RegistrationFactory(
@@ -541,3 +543,441 @@ class TestNewZoomWebhookEvents:
         registration.refresh_from_db()
         assert registration.total_attendance_minutes >= 30
         assert registration.attendance_eligible is True
+
+
+@pytest.mark.django_db
+class TestCourseSessionAttendanceWebhooks:
+    """Tests for course session join/leave webhooks."""
+
+    def _participant(self, meeting_id, **participant):
+        return {"object": {"id": meeting_id, "participant": participant}}
+
+    def test_leave_closes_the_segment_of_any_device(self):
+        from factories import CourseEnrollmentFactory
+        from integrations.services import webhook_processor
+        from learning.models import CourseSession, CourseSessionAttendance
+
+        start = timezone.now().replace(microsecond=0)
+        enrollment = CourseEnrollmentFactory(user__email="learner@example.com")
+        session = CourseSession.objects.create(
+            course=enrollment.course, title="Live session", starts_at=start, duration_minutes=60, zoom_meeting_id="515151"
+        )
+
+        # Two devices of the same learner; the second join becomes the record's participant
+        for participant_id, offset in (("device-a", 0), ("device-b", 10)):
+            webhook_processor._handle_participant_joined(
+                self._participant(
+                    515151,
+                    id=participant_id,
+                    email="learner@example.com",
+                    join_time=(start + timezone.timedelta(minutes=offset)).isoformat(),
+                )
+            )
+        for participant_id, offset in (("device-a", 40), ("device-b", 30)):
+            webhook_processor._handle_participant_left(
+                self._participant(
+                    515151,
+                    id=participant_id,
+                    email="learner@example.com",
+                    leave_time=(start + timezone.timedelta(minutes=offset)).isoformat(),
+                )
+            )
+
+        attendance = CourseSessionAttendance.objects.get(session=session, enrollment=enrollment)
+        assert all(segment["leave"] for segment in attendance.segments)
+        assert attendance.attendance_minutes == 40
+
+    def test_stale_instances_keep_each_others_segments(self):
+        """Segment updates re-read the row, so a stale copy can't overwrite another webhook's segment."""
+        from factories import CourseEnrollmentFactory
+        from learning.models import CourseSession, CourseSessionAttendance
+
+        start = timezone.now().replace(microsecond=0)
+        enrollment = CourseEnrollmentFactory()
+        session = CourseSession.objects.create(
+            course=enrollment.course, title="Live session", starts_at=start, duration_minutes=60, zoom_meeting_id="525252"
+        )
+        record = CourseSessionAttendance.objects.create(session=session, enrollment=enrollment)
+        first, second = (CourseSessionAttendance.objects.get(pk=record.pk) for _ in range(2))
+
+        first.add_segment_join("device-a", start)
+        second.add_segment_join("device-b", start + timezone.timedelta(minutes=20))
+        assert first.close_segment("device-a", start + timezone.timedelta(minutes=30))
+        assert second.close_segment("device-b", start + timezone.timedelta(minutes=50))
+
+        record.refresh_from_db()
+        assert [segment["participant_id"] for segment in record.segments] == ["device-a", "device-b"]
+        assert all(segment["leave"] for segment in record.segments)
+        assert record.attendance_minutes == 50
+        assert record.is_eligible is True
+
+
+# =============================================================================
+# Attendance Reconciliation Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestAttendanceMatcher:
+    """Tests for set-based AttendanceMatcher.match_attendance."""
+
+    def _attend(self, registration, start, minutes):
+        from registrations.models import AttendanceRecord
+
+        return AttendanceRecord.objects.create(
+            event=registration.event,
+            registration=registration,
+            zoom_participant_id=f'p-{registration.pk}-{start.timestamp()}',
+            join_time=start,
+            leave_time=start + timezone.timedelta(minutes=minutes),
+            is_matched=True,
+        )
+
+    def test_reconciles_summaries_in_constant_queries(self, published_event, django_assert_max_num_queries):
+        from factories import RegistrationFactory
+        from integrations.services import attendance_matcher
+
+        start = timezone.now().replace(microsecond=0)
+        published_event.minimum_attendance_minutes = 30
+        published_event.starts_at = start
+        published_event.save(update_fields=['minimum_attendance_minutes', 'starts_at'])
+
+        attendees = RegistrationFactory.create_batch(20, event=published_event, status='confirmed')
+        for reg in attendees[:15]:
+            self._attend(reg, start, 20)
+            self._attend(reg, start + timezone.timedelta(minutes=30), 15)
+        overridden = attendees[19]
+        overridden.attendance_override = True
+        overridden.attendance_eligible = True
+        overridden.save(update_fields=['attendance_override', 'attendance_eligible', 'updated_at'])
+
+        # Registrations, intervals, bulk update and the contact outbox entries of the newly eligible
+        with django_assert_max_num_queries(5):
+            result = attendance_matcher.match_attendance(published_event)
+
+        assert result == {'matched': 15, 'unmatched': 5, 'eligible': 16, 'ineligible': 4}
+        reg = attendees[0]
+        reg.refresh_from_db()
+        assert reg.total_attendance_minutes == 35
+        assert reg.attended is True
+        assert reg.attendance_eligible is True
+        assert reg.first_join_at == start
+        assert reg.last_leave_at == start + timezone.timedelta(minutes=45)
+        overridden.refresh_from_db()
+        assert overridden.attendance_eligible is True
+
+    def test_queues_contact_attendance_for_newly_eligible(self, published_event):
+        from contacts.models import ContactOutboxEntry
+        from factories import RegistrationFactory
+        from integrations.services import attendance_matcher
+
+        start = timezone.now().replace(microsecond=0)
+        published_event.minimum_attendance_minutes = 30
+        published_event.starts_at = start
+        published_event.save(update_fields=['minimum_attendance_minutes', 'starts_at'])
+        eligible, short = RegistrationFactory.create_batch(2, event=published_event, status='confirmed')
+        self._attend(eligible, start, 45)
+        self._attend(short, start, 10)
+        ContactOutboxEntry.objects.all().delete()
+
+        attendance_matcher.match_attendance(published_event)
+        attendance_matcher.match_attendance(published_event)
+
+        queued = ContactOutboxEntry.objects.filter(kind=ContactOutboxEntry.Kind.ATTENDANCE)
+        assert list(queued.values_list('registration_id', 'organizer_id')) == [(eligible.pk, published_event.owner_id)]
+
+    def test_matches_per_registration_rebuild(self, published_event):
+        from factories import RegistrationFactory
+        from integrations.services import attendance_matcher
+
+        start = timezone.now().replace(microsecond=0)
+        published_event.starts_at = start
+        published_event.save(update_fields=['starts_at'])
+        attendees = RegistrationFactory.create_batch(3, event=published_event, status='confirmed')
+        self._attend(attendees[0], start, 90)
+        self._attend(attendees[1], start, 5)
+        attendees[2].check_in_time = start
+        attendees[2].save(update_fields=['check_in_time', 'updated_at'])
+
+        attendance_matcher.match_attendance(published_event)
+        fields = ('total_attendance_minutes', 'attended', 'first_join_at', 'last_leave_at', 'attendance_eligible')
+        reconciled = []
+        for reg in attendees:
+            reg.refresh_from_db()
+            reconciled.append(tuple(getattr(reg, f) for f in fields))
+
+        rebuilt = []
+        for reg in attendees:
+            reg.update_attendance_summary()
+            reg.refresh_from_db()
+            rebuilt.append(tuple(getattr(reg, f) for f in fields))
+
+        assert reconciled == rebuilt
+
+
+# =============================================================================
+# Batched Zoom Webhook Ingestion Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestBatchedZoomWebhooks:
+    """Tests for ZOOM_WEBHOOK_INGESTION='batched' and the per-meeting drain."""
+
+    endpoint = "/api/v1/integrations/webhooks/zoom/"
+
+    def _log(self, webhook_id, event_type, participant, timestamp):
+        from integrations.models import ZoomWebhookLog
+
+        return ZoomWebhookLog.objects.create(
+            webhook_id=webhook_id,
+            event_type=event_type,
+            event_timestamp=timestamp,
+            zoom_meeting_id="777777",
+            payload={"payload": {"object": {"id": 777777, "participant": participant}}},
+        )
+
+    def _join(self, n, email, join_time):
+        participant = {"id": f"p-{n}", "email": email, "user_name": f"User {n}", "join_time": join_time.isoformat()}
+        return self._log(f"join_{n}", "meeting.participant_joined", participant, join_time)
+
+    @patch("integrations.views.ZoomWebhookView._verify_signature")
+    def test_view_schedules_one_drain_per_meeting(self, mock_verify, api_client, settings):
+        from common.cloud_tasks import local_timer_queue
+        from integrations.models import ZoomWebhookLog
+
+        mock_verify.return_value = True
+        settings.ZOOM_WEBHOOK_INGESTION = "batched"
+        local_timer_queue.clear()
+
+        for n in range(3):
+            data = {
+                "event": "meeting.participant_joined",
+                "payload": {"object": {"id": 777777, "participant": {"id": f"p-{n}"}}},
+            }
+            response = api_client.post(self.endpoint, data, format="json", HTTP_X_ZM_REQUEST_ID=f"req-{n}")
+            assert response.data["status"] == "received"
+
+        # Redelivery is rejected by the unique webhook_id
+        response = api_client.post(self.endpoint, data, format="json", HTTP_X_ZM_REQUEST_ID="req-2")
+        assert response.data["status"] == "duplicate"
+
+        assert ZoomWebhookLog.objects.filter(processing_status="pending").count() == 3
+        assert len(local_timer_queue) == 1
+        local_timer_queue.clear()
+
+    def test_drain_ingests_joins_in_bulk(self, organizer, django_assert_max_num_queries):
+        from factories import EventFactory, RegistrationFactory
+        from integrations.models import ZoomWebhookLog
+        from integrations.tasks import drain_zoom_webhooks
+        from registrations.models import AttendanceRecord
+
+        start = timezone.now().replace(microsecond=0)
+        event = EventFactory(owner=organizer, status="live", zoom_meeting_id="777777", starts_at=start)
+        registrations = RegistrationFactory.create_batch(30, event=event, status="confirmed")
+        for n, reg in enumerate(registrations):
+            self._join(n, reg.email.upper(), start + timezone.timedelta(minutes=n % 5))
+        self._join(99, "guest@example.com", start)
+        # Redelivered join with a different webhook id
+        self._join("dup", registrations[0].email, start)
+        ZoomWebhookLog.objects.filter(webhook_id="join_dup").update(
+            payload={"payload": {"object": {"id": 777777, "participant": {"id": "p-0", "join_time": start.isoformat()}}}}
+        )
+
+        # Two claim rounds, event, registrations, existing records, bulk insert, first joins, completion;
+        # independent of the number of webhooks
+        with django_assert_max_num_queries(16):
+            results = drain_zoom_webhooks("777777")
+
+        assert results == {"processed": 32, "failed": 0, "records_created": 31}
+        assert AttendanceRecord.objects.filter(event=event).count() == 31
+        assert AttendanceRecord.objects.filter(event=event, is_matched=True).count() == 30
+        assert not ZoomWebhookLog.objects.exclude(processing_status="completed").exists()
+        registrations[7].refresh_from_db()
+        assert registrations[7].first_join_at == start + timezone.timedelta(minutes=2)
+
+    def test_drain_keeps_join_leave_order(self, organizer):
+        from factories import EventFactory, RegistrationFactory
+        from integrations.tasks import drain_zoom_webhooks
+
+        start = timezone.now().replace(microsecond=0)
+        event = EventFactory(
+            owner=organizer, status="live", zoom_meeting_id="777777", starts_at=start, minimum_attendance_minutes=30
+        )
+        registration = RegistrationFactory(event=event, status="confirmed")
+        self._join(1, registration.email, start)
+        leave_time = start + timezone.timedelta(minutes=40)
+        self._log("leave_1", "meeting.participant_left", {"id": "p-1", "leave_time": leave_time.isoformat()}, leave_time)
+
+        drain_zoom_webhooks("777777")
+
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 40
+        assert registration.attendance_eligible is True
+
+
+# =============================================================================
+# Meeting Resolver Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestMeetingResolver:
+    """Tests for the cached Zoom meeting ID resolver."""
+
+    def test_resolves_and_caches(self, organizer, django_assert_num_queries):
+        from factories import EventFactory
+        from integrations.meeting_resolver import MeetingTarget, meeting_resolver
+
+        event = EventFactory(owner=organizer, zoom_meeting_id="555000")
+
+        assert meeting_resolver.resolve("555000") == MeetingTarget(MeetingTarget.EVENT, event.pk)
+        with django_assert_num_queries(0):
+            assert meeting_resolver.resolve("555000").pk == event.pk
+
+    def test_unknown_meeting_is_negatively_cached(self, django_assert_num_queries):
+        from integrations.meeting_resolver import meeting_resolver
+
+        # Event, then CourseSession
+        with django_assert_num_queries(2):
+            assert meeting_resolver.resolve("404404") is None
+        with django_assert_num_queries(0):
+            assert meeting_resolver.resolve("404404") is None
+
+    def test_meeting_id_change_invalidates(self, organizer):
+        from factories import EventFactory
+        from integrations.meeting_resolver import meeting_resolver
+
+        event = EventFactory(owner=organizer, zoom_meeting_id="555001")
+        assert meeting_resolver.resolve("555001").pk == event.pk
+        assert meeting_resolver.resolve("555002") is None
+
+        event.zoom_meeting_id = "555002"
+        event.save(update_fields=["zoom_meeting_id", "updated_at"])
+
+        assert meeting_resolver.resolve("555001") is None
+        assert meeting_resolver.resolve("555002").pk == event.pk
+
+    def test_course_session_target(self, course):
+        from integrations.meeting_resolver import MeetingTarget, meeting_resolver
+        from learning.models import CourseSession
+
+        session = CourseSession.objects.create(
+            course=course, title="Live session", starts_at=timezone.now(), zoom_meeting_id="555003"
+        )
+
+        assert meeting_resolver.resolve("555003") == MeetingTarget(MeetingTarget.SESSION, session.pk)
+        assert meeting_resolver.session("555003") == session
+        assert meeting_resolver.event("555003") is None
+
+
+# =============================================================================
+# Participant Matcher Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestParticipantMatcher:
+    """Tests for matching Zoom participants to registrations."""
+
+    def test_email_and_alias_email(self, published_event, user):
+        from factories import RegistrationFactory
+        from integrations.services import participant_matcher
+
+        guest = RegistrationFactory(event=published_event, guest=True, email="guest@example.com")
+        member = RegistrationFactory(event=published_event, user=user, email="work@example.com")
+
+        assert participant_matcher.match(published_event, " Guest@Example.com ") == guest
+        # Joined Zoom with the account email rather than the registration email
+        assert participant_matcher.match(published_event, user.email.upper()) == member
+        assert participant_matcher.match(published_event, "nobody@example.com") is None
+
+    def test_display_name_fallback_requires_unique_name(self, published_event):
+        from factories import RegistrationFactory
+        from integrations.services import participant_matcher
+
+        ada = RegistrationFactory(event=published_event, guest=True, full_name="Ada Lovelace")
+        RegistrationFactory.create_batch(2, event=published_event, guest=True, full_name="Sam Smith")
+
+        matches = participant_matcher.match_many(
+            published_event, [("", "ada  LOVELACE"), ("", "Sam Smith"), ("phone@example.com", "")]
+        )
+        assert matches == {("", "ada  LOVELACE"): ada}
+
+    def test_match_unmatched_records(self, published_event):
+        from factories import RegistrationFactory
+        from integrations.services import participant_matcher
+        from registrations.models import AttendanceRecord
+
+        registration = RegistrationFactory(event=published_event, guest=True, full_name="Grace Hopper")
+        for n in range(2):
+            AttendanceRecord.objects.create(
+                event=published_event,
+                zoom_participant_id=f"p-{n}",
+                zoom_user_name="Grace Hopper",
+                join_time=timezone.now(),
+            )
+
+        assert participant_matcher.match_unmatched_records(published_event) == 2
+        assert registration.attendance_records.filter(is_matched=True).count() == 2
+
+
+# =============================================================================
+# Participant Report Import Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestParticipantReportImport:
+    """Tests for backfilling attendance from the Zoom participant report."""
+
+    REPORT = {
+        "": {
+            "participants": [
+                # Join webhook recorded, leave webhook missed
+                {"id": "p-1", "name": "Seen", "join_time": "2024-05-01T10:00:00Z", "leave_time": "2024-05-01T10:30:00Z"},
+                # No webhooks at all, and reported twice
+                {"id": "p-2", "user_email": "Guest@Example.com", "join_time": "2024-05-01T10:05:00Z", "duration": 1500},
+                {"id": "p-2", "user_email": "Guest@Example.com", "join_time": "2024-05-01T10:05:00Z", "duration": 1500},
+            ],
+            "next_page_token": "page-2",
+        },
+        "page-2": {
+            "participants": [{"id": "", "name": "Dial-in", "join_time": "2024-05-01T10:10:00Z"}],
+            "next_page_token": "",
+        },
+    }
+
+    def fetch_page(self, user, meeting_id, next_page_token=""):
+        return {"success": True, "data": self.REPORT[next_page_token]}
+
+    @pytest.mark.parametrize("chunk_size", [1, 500])
+    def test_import_is_streamed_and_idempotent(self, published_event, chunk_size):
+        from datetime import UTC, datetime
+
+        from common.config import AttendanceReconciliation
+        from factories import RegistrationFactory
+        from integrations.services import attendance_matcher
+        from registrations.models import AttendanceRecord
+
+        published_event.zoom_meeting_id = "555100"
+        published_event.save(update_fields=["zoom_meeting_id"])
+        guest = RegistrationFactory(event=published_event, guest=True, email="guest@example.com")
+        AttendanceRecord.objects.create(
+            event=published_event, zoom_participant_id="p-1", join_time=datetime(2024, 5, 1, 10, tzinfo=UTC)
+        )
+
+        with (
+            patch("accounts.services.zoom_service.get_past_meeting_participants", side_effect=self.fetch_page),
+            patch.object(AttendanceReconciliation, "REPORT_IMPORT_CHUNK_SIZE", chunk_size),
+        ):
+            first = attendance_matcher.import_participant_report(published_event)
+            second = attendance_matcher.import_participant_report(published_event)
+
+        assert first == {"created": 1, "closed": 1, "unchanged": 1, "skipped": 1}
+        assert second == {"created": 0, "closed": 0, "unchanged": 3, "skipped": 1}
+        assert AttendanceRecord.objects.filter(event=published_event).count() == 2
+        assert AttendanceRecord.objects.get(zoom_participant_id="p-1").duration_minutes == 30
+        backfilled = AttendanceRecord.objects.get(zoom_participant_id="p-2")
+        assert backfilled.registration == guest
+        assert backfilled.duration_minutes == 25
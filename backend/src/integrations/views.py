@@ -6,6 +6,7 @@ import hashlib
 import hmac
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from django_filters import rest_framework as filters
 from drf_yasg.utils import swagger_auto_schema
@@ -14,6 +15,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from common.config import WebhookConfig
 from common.permissions import IsOrganizerOrCourseManager
 from common.rbac import roles
 from common.utils import error_response
@@ -21,7 +23,7 @@ from common.viewsets import ReadOnlyModelViewSet
 
 from . import serializers
 from .models import EmailLog, RecordingView, ZoomRecording, ZoomRecordingFile, ZoomWebhookLog
-from .tasks import process_zoom_webhook
+from .tasks import drain_zoom_webhooks, process_zoom_webhook
 
 # =============================================================================
 # Event Recordings ViewSet (C3)
@@ -230,10 +232,6 @@ class ZoomWebhookView(generics.GenericAPIView):
 
         webhook_id = request.headers.get('x-zm-request-id', f"{event_type}_{timezone.now().timestamp()}")
 
-        # Deduplicate
-        if ZoomWebhookLog.objects.filter(webhook_id=webhook_id).exists():
-            return Response({'status': 'duplicate'})
-
         # Extract timestamp
         event_ts = request.data.get('event_ts')
         if event_ts:
@@ -244,17 +242,30 @@ class ZoomWebhookView(generics.GenericAPIView):
         else:
             event_timestamp = timezone.now()
 
-        log = ZoomWebhookLog.objects.create(
-            webhook_id=webhook_id,
-            event_type=event_type,
-            zoom_meeting_id=str(meeting_id),
-            event_timestamp=event_timestamp,
-            payload=request.data,
-            processing_status='pending',
-        )
+        # Deduplicate on the unique webhook_id (one INSERT instead of a lookup first)
+        try:
+            with transaction.atomic():
+                log = ZoomWebhookLog.objects.create(
+                    webhook_id=webhook_id,
+                    event_type=event_type,
+                    zoom_meeting_id=str(meeting_id),
+                    event_timestamp=event_timestamp,
+                    payload=request.data,
+                    processing_status='pending',
+                )
+        except IntegrityError:
+            return Response({'status': 'duplicate'})
 
-        # Process asynchronously (in production use Celery)
-        process_zoom_webhook.delay(log.id)
+        if settings.ZOOM_WEBHOOK_INGESTION == 'batched' and log.zoom_meeting_id:
+            # Coalesce: only the oldest pending log of a meeting schedules its drain
+            pending_before = ZoomWebhookLog.objects.filter(
+                zoom_meeting_id=log.zoom_meeting_id, processing_status='pending', id__lt=log.id
+            )
+            if not pending_before.exists():
+                drain_zoom_webhooks.delay_for(WebhookConfig.COALESCE_SECONDS, log.zoom_meeting_id)
+        else:
+            # Process asynchronously (in production use Celery)
+            process_zoom_webhook.delay(log.id)
 
         return Response({'status': 'received'})
 
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-16 20:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0006_add_hybrid_completion_criteria'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursesessionattendance',
+            name='segments',
+            field=models.JSONField(
+                blank=True, default=list, help_text='Join/leave segments: [{participant_id, join, leave}] (ISO timestamps)'
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 00:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0007_course_attendance_segments'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursesessionattendance',
+            index=models.Index(fields=['session', 'zoom_participant_id'], name='course_sess_session_ecf644_idx'),
+        ),
+    ]
@@ -17,7 +17,7 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 
-from common.config import AssignmentDefaults, ModuleDefaults
+from common.config import AssignmentDefaults, AttendanceReconciliation, ModuleDefaults
 from common.models import BaseModel
 from common.validators import validate_zoom_settings_schema
 
@@ -1287,6 +1287,11 @@ class CourseSession(BaseModel):
         """Calculate scheduled end time."""
         return self.starts_at + timezone.timedelta(minutes=self.duration_minutes)
 
+    @property
+    def attendance_window(self):
+        """(start, end) that attended minutes are clipped to; allows for overruns."""
+        return self.starts_at, self.ends_at + timezone.timedelta(minutes=AttendanceReconciliation.WINDOW_GRACE_MINUTES)
+
     @property
     def is_upcoming(self):
         """Check if session is in the future."""
@@ -1324,6 +1329,9 @@ class CourseSessionAttendance(BaseModel):
     zoom_user_email = models.EmailField(blank=True)
     zoom_join_time = models.DateTimeField(null=True, blank=True)
     zoom_leave_time = models.DateTimeField(null=True, blank=True)
+    segments = models.JSONField(
+        default=list, blank=True, help_text="Join/leave segments: [{participant_id, join, leave}] (ISO timestamps)"
+    )
 
     # Manual override
     is_manual_override = models.BooleanField(default=False)
@@ -1345,6 +1353,7 @@ class CourseSessionAttendance(BaseModel):
         indexes = [
             models.Index(fields=["session", "enrollment"]),
             models.Index(fields=["zoom_user_email"]),
+            models.Index(fields=["session", "zoom_participant_id"]),
         ]
 
     def __str__(self):
@@ -1357,6 +1366,63 @@ class CourseSessionAttendance(BaseModel):
             return 0
         return int((self.attendance_minutes / self.session.duration_minutes) * 100)
 
+    def add_segment_join(self, participant_id: str, join_time):
+        """
+        Open and save a segment for a Zoom participant joining (a rejoin or another device).
+
+        The segments are re-read under a row lock, so concurrent webhooks for
+        the same record can't drop each other's segments.
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            locked = CourseSessionAttendance.objects.select_for_update().get(pk=self.pk)
+            locked.segments.append({"participant_id": participant_id, "join": join_time.isoformat(), "leave": None})
+            locked.zoom_participant_id = participant_id
+            locked.zoom_join_time = join_time
+            locked.save(update_fields=["segments", "zoom_join_time", "zoom_participant_id", "updated_at"])
+        self.segments = locked.segments
+        self.zoom_participant_id = participant_id
+        self.zoom_join_time = join_time
+        self.updated_at = locked.updated_at
+
+    def close_segment(self, participant_id: str, leave_time) -> bool:
+        """
+        Close and save the participant's open segment, recomputing minutes and eligibility.
+
+        Minutes are the merged segments clipped to the session window, so
+        overlapping segments from two devices or reconnects count once. The
+        segments are re-read under a row lock, like add_segment_join().
+
+        Returns:
+            False if the participant has no open segment
+        """
+        from django.db import transaction
+        from django.utils.dateparse import parse_datetime
+
+        from common.attendance import covered_minutes
+
+        with transaction.atomic():
+            locked = CourseSessionAttendance.objects.select_for_update().get(pk=self.pk)
+            open_segments = [s for s in locked.segments if s["participant_id"] == participant_id and s["leave"] is None]
+            if not open_segments:
+                return False
+
+            open_segments[-1]["leave"] = leave_time.isoformat()
+            locked.zoom_leave_time = leave_time
+            intervals = [(parse_datetime(s["join"]), parse_datetime(s["leave"])) for s in locked.segments if s["leave"]]
+            locked.attendance_minutes = covered_minutes(intervals, self.session.attendance_window)
+
+            min_required = self.session.minimum_attendance_percent or 80
+            duration = self.session.duration_minutes
+            attendance_percent = (locked.attendance_minutes / duration * 100) if duration else 0
+            locked.is_eligible = attendance_percent >= min_required
+            locked.save(update_fields=["segments", "zoom_leave_time", "attendance_minutes", "is_eligible", "updated_at"])
+
+        for field in ("segments", "zoom_leave_time", "attendance_minutes", "is_eligible", "updated_at"):
+            setattr(self, field, getattr(locked, field))
+        return True
+
     def calculate_eligibility(self):
         """Check if attendance meets minimum threshold."""
         self.is_eligible = self.attendance_percent >= self.session.minimum_attendance_percent
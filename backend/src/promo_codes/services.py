@@ -4,7 +4,8 @@ Promo Code validation and application service.
 
 from decimal import Decimal
 
-from django.db.models import Q
+from django.db.models import Case, Count, Exists, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from .models import PromoCode, PromoCodeUsage
@@ -76,13 +77,18 @@ class PromoCodeService:
     """
 
     @staticmethod
-    def find_code(code: str, event) -> PromoCode | None:
+    def find_code(code: str, event, email: str | None = None) -> PromoCode | None:
         """
         Find a promo code that applies to the given event.
 
+        With an email, the code is fetched together with everything
+        validate_code() looks up for that email and event (usage count, event
+        restriction, first-time buyer), so validating it takes no more queries.
+
         Args:
             code: The promo code string
             event: The Event instance
+            email: Email of the registrant (optional)
 
         Returns:
             PromoCode instance or None
@@ -90,14 +96,44 @@ class PromoCodeService:
         code_upper = code.upper().strip()
 
         # Find codes owned by the event owner or organization
-        owner_filter = Q(owner=event.owner)
-        if event.organization:
-            owner_filter |= Q(organization=event.organization)
+        owner_filter = Q(owner_id=event.owner_id)
+        if event.organization_id:
+            owner_filter |= Q(organization_id=event.organization_id)
 
-        promo = PromoCode.objects.filter(owner_filter, code__iexact=code_upper).first()
+        promos = PromoCode.objects.filter(owner_filter, code__iexact=code_upper)
+        if email is None:
+            return promos.first()
 
+        promo = PromoCodeService._annotate_validation_facts(promos, event, email.lower()).first()
+        if promo:
+            promo.validation_facts_for = (email.lower(), event.pk)
         return promo
 
+    @staticmethod
+    def _annotate_validation_facts(promos, event, email_lower: str):
+        """Annotate the lookups validate_code() needs for one email and event."""
+        from registrations.models import Registration
+
+        email_uses = (
+            PromoCodeUsage.objects.filter(promo_code=OuterRef('pk'), user_email__iexact=email_lower)
+            .order_by()
+            .values('promo_code')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        event_links = PromoCode.events.through.objects.filter(promocode_id=OuterRef('pk'))
+        past_registrations = Registration.objects.filter(
+            email=email_lower, status=Registration.Status.CONFIRMED, deleted_at__isnull=True
+        ).exclude(event_id=event.pk)
+
+        return promos.annotate(
+            email_uses=Coalesce(Subquery(email_uses), 0),
+            limited_to_events=Exists(event_links),
+            applies_to_event=Exists(event_links.filter(event_id=event.pk)),
+            # Only looked up for first-time-only codes
+            has_past_registration=Case(When(first_time_only=True, then=Exists(past_registrations)), default=Value(False)),
+        )
+
     @staticmethod
     def validate_code(promo_code: PromoCode, event, email: str, user=None) -> None:
         """
@@ -113,6 +149,9 @@ class PromoCodeService:
             PromoCodeError subclass on validation failure
         """
         now = timezone.now()
+        email_lower = email.lower()
+        # Lookups already fetched by find_code() for this email and event
+        prefetched = getattr(promo_code, 'validation_facts_for', None) == (email_lower, event.pk)
 
         # Check if active
         if not promo_code.is_active:
@@ -130,16 +169,21 @@ class PromoCodeService:
             raise PromoCodeExhaustedError("This promo code has reached its usage limit.")
 
         # Check per-user limit
-        email_lower = email.lower()
-        user_usage_count = PromoCodeUsage.objects.filter(promo_code=promo_code, user_email__iexact=email_lower).count()
+        if prefetched:
+            user_usage_count = promo_code.email_uses
+        else:
+            user_usage_count = PromoCodeUsage.objects.filter(promo_code=promo_code, user_email__iexact=email_lower).count()
 
         if user_usage_count >= promo_code.max_uses_per_user:
             raise PromoCodeUserLimitError(f"You have already used this code {user_usage_count} time(s).")
 
         # Check event applicability
-        if promo_code.events.exists():
-            if not promo_code.events.filter(pk=event.pk).exists():
-                raise PromoCodeNotApplicableError("This promo code cannot be used for this event.")
+        if prefetched:
+            not_applicable = promo_code.limited_to_events and not promo_code.applies_to_event
+        else:
+            not_applicable = promo_code.events.exists() and not promo_code.events.filter(pk=event.pk).exists()
+        if not_applicable:
+            raise PromoCodeNotApplicableError("This promo code cannot be used for this event.")
 
         if promo_code.currency and event.currency and promo_code.currency.upper() != event.currency.upper():
             raise PromoCodeNotApplicableError(f"This promo code is only valid for {promo_code.currency.upper()} events.")
@@ -150,16 +194,19 @@ class PromoCodeService:
 
         # Check first-time only
         if promo_code.first_time_only:
-            from registrations.models import Registration
-
             # Check if user has any past registrations
-            past_registrations = (
-                Registration.objects.filter(
-                    email__iexact=email_lower, status=Registration.Status.CONFIRMED, deleted_at__isnull=True
+            if prefetched:
+                past_registrations = promo_code.has_past_registration
+            else:
+                from registrations.models import Registration
+
+                past_registrations = (
+                    Registration.objects.filter(
+                        email=email_lower, status=Registration.Status.CONFIRMED, deleted_at__isnull=True
+                    )
+                    .exclude(event=event)
+                    .exists()
                 )
-                .exclude(event=event)
-                .exists()
-            )
 
             if past_registrations:
                 raise PromoCodeFirstTimeOnlyError("This code is only valid for first-time attendees.")
@@ -223,7 +270,7 @@ class PromoCodeService:
         Raises:
             PromoCodeError subclass on validation failure
         """
-        promo_code = cls.find_code(code, event)
+        promo_code = cls.find_code(code, event, email=email)
 
         if not promo_code:
             raise PromoCodeNotFoundError("Invalid promo code.")
@@ -61,6 +61,16 @@ class TestPromoCodeService:
         """Should pass validation for valid code."""
         PromoCodeService.validate_code(promo_code, event, 'new@example.com')
 
+    def test_find_code_with_email_prefetches_validation(self, promo_code, event, django_assert_num_queries):
+        """With an email, the code comes with everything validation looks up."""
+        reg = RegistrationFactory(event=event, email='user@example.com')
+        PromoCodeService.apply_code(promo_code, reg, event.price)
+
+        with django_assert_num_queries(1):
+            found = PromoCodeService.find_code('testcode', event, email='User@example.com')
+            with pytest.raises(PromoCodeUserLimitError):
+                PromoCodeService.validate_code(found, event, 'user@example.com')
+
     def test_validate_code_inactive(self, promo_code, event):
         """Should fail if inactive."""
         promo_code.is_active = False
@@ -0,0 +1,131 @@
+"""
+Admission control for capacity-limited events.
+
+Event.seats_taken counts the registrations holding a seat: confirmed ones
+and pending ones whose payment is outstanding. A registration is admitted
+by one conditional UPDATE that takes a seat only while seats_taken is below
+max_attendees, so concurrent registrations can't oversell and nothing has
+to COUNT(*) the registrations:
+
+    UPDATE events SET seats_taken = seats_taken + 1
+    WHERE id = %s AND (max_attendees IS NULL OR seats_taken < max_attendees)
+
+The UPDATE runs in the same transaction as the registration insert, so a
+rollback gives the seat back. Seats given up (cancellations, deletions) and
+seats taken around admission (organizer adds, manual promotions) are
+applied by Registration.record_seat_change.
+
+Unpaid registrations hold their seat until seat_hold_expires_at;
+release_expired_seat_holds cancels the lapsed ones, which promotes the next
+waitlisted registration into the freed seat.
+
+Usage:
+    from registrations.admission import seat_admission_service
+
+    if seat_admission_service.acquire(event, registration):
+        ...
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from common.config import SeatAdmission
+
+logger = logging.getLogger(__name__)
+
+
+class SeatUnavailableError(Exception):
+    """Raised inside a registration transaction to roll it back when no seat is free."""
+
+
+class SeatAdmissionService:
+    """
+    Atomic seat accounting on Event.seats_taken.
+    """
+
+    def acquire(self, event, registration=None) -> bool:
+        """
+        Take a seat if the event has one free (always, if it has no max_attendees).
+
+        On success, registration (if given) is marked as holding the seat, so
+        saving it in a seat-holding status doesn't count the seat again.
+        """
+        from events.models import Event
+
+        taken = (
+            Event.all_objects.filter(pk=event.pk)
+            .filter(Q(max_attendees__isnull=True) | Q(seats_taken__lt=F('max_attendees')))
+            .update(seats_taken=F('seats_taken') + 1)
+        )
+        if taken and registration is not None:
+            registration._seated = True
+        return bool(taken)
+
+    def take(self, event_id: int, seats: int = 1):
+        """Count seats taken regardless of capacity (organizer adds, imports and overrides)."""
+        from events.models import Event
+
+        Event.all_objects.filter(pk=event_id).update(seats_taken=F('seats_taken') + seats)
+
+    def release(self, event_id: int):
+        """Give a seat back."""
+        from events.models import Event
+
+        Event.all_objects.filter(pk=event_id).update(seats_taken=Greatest(F('seats_taken') - 1, Value(0)))
+
+    def hold_expiry(self, promotion: bool = False):
+        """When a new unpaid hold lapses; waitlist promotions get longer to pay."""
+        if promotion:
+            return timezone.now() + timezone.timedelta(hours=SeatAdmission.PROMOTION_HOLD_HOURS)
+        return timezone.now() + timezone.timedelta(minutes=SeatAdmission.HOLD_MINUTES)
+
+    def release_expired_holds(self) -> int:
+        """
+        Cancel pending registrations whose seat hold expired before they paid.
+
+        Each one is re-checked under its row lock, so a payment confirming at
+        the same moment wins. The waitlist is promoted after the cancellation
+        commits, keeping the event row lock short.
+
+        Returns:
+            Number of holds released
+        """
+        from registrations.models import Registration
+
+        now = timezone.now()
+        expired = Registration.objects.filter(
+            status=Registration.Status.PENDING,
+            seat_hold_expires_at__lte=now,
+        ).exclude(payment_status=Registration.PaymentStatus.PAID)
+
+        released = 0
+        for registration_id in list(expired.values_list('id', flat=True)):
+            with transaction.atomic():
+                registration = (
+                    expired.select_for_update(of=('self',)).select_related('event').filter(pk=registration_id).first()
+                )
+                if registration is None:
+                    continue
+                registration.cancel(reason=Registration.SEAT_HOLD_EXPIRED_REASON, promote=False)
+
+            try:
+                from promo_codes.models import PromoCodeUsage
+
+                PromoCodeUsage.release_for_registration(registration)
+            except Exception as e:
+                logger.warning("Failed to release promo code usage for %s: %s", registration.uuid, e)
+
+            registration._promote_next_from_waitlist()
+            released += 1
+
+        if released:
+            logger.info(f"Released {released} expired seat holds")
+        return released
+
+
+# Singleton instance
+seat_admission_service = SeatAdmissionService()
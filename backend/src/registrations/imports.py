@@ -0,0 +1,317 @@
+"""
+Bulk attendee import for an event, from a CSV or JSON file.
+
+The file is read as a stream and handled RegistrationImport.CHUNK_SIZE rows
+at a time. Per chunk, rows are validated, deduplicated against the event's
+registrations with one email__in query, matched to user accounts with
+another, and written with one bulk_create for registrations and one for
+custom field responses, in a single transaction. Imported registrations
+are confirmed organizer adds (source=manual), so the event's capacity
+doesn't apply and no emails are sent.
+
+bulk_create skips the Registration signals, so the chunk applies their
+effects itself, as one operation each: the seats taken, a counter delta
+(coalesced into one UPDATE per request) and the contact outbox entries.
+Zoom registrants are synced once for the whole import.
+
+Columns (CSV header or JSON keys, case-insensitive):
+    email (required), full_name or name (or first_name + last_name),
+    professional_title, organization_name; custom fields by label or UUID.
+
+Usage:
+    from registrations.imports import registration_import_service
+
+    report = registration_import_service.import_file(event, request.FILES['file'], request.user)
+"""
+
+import codecs
+import csv
+import json
+import logging
+from itertools import islice
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from common.config import RegistrationImport
+from common.counters import counter_deltas
+from events.models import Event
+from registrations.admission import seat_admission_service
+from registrations.models import CustomFieldResponse, Registration
+
+logger = logging.getLogger(__name__)
+
+# Accepted column names per registration field (after lowercasing, spaces -> underscores)
+COLUMN_ALIASES = {
+    'email': ('email', 'email_address'),
+    'full_name': ('full_name', 'name'),
+    'first_name': ('first_name',),
+    'last_name': ('last_name',),
+    'professional_title': ('professional_title', 'title', 'job_title'),
+    'organization_name': ('organization_name', 'organization', 'company'),
+}
+
+FIELD_MAX_LENGTHS = {'full_name': 255, 'professional_title': 255, 'organization_name': 255}
+
+
+def _normalize_column(name) -> str:
+    return str(name).strip().lower().replace(' ', '_')
+
+
+def _cell(value) -> str:
+    """A standard field's value as stripped text."""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _custom_value(value) -> str:
+    """Serialize a custom field value the way registration does (JSON for lists/dicts)."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return _cell(value)
+
+
+class RegistrationImportService:
+    """
+    Streaming, chunked attendee import.
+    """
+
+    def import_file(self, event: Event, upload, registered_by) -> dict:
+        """
+        Import the attendees in an uploaded .csv, .json (array of objects) or .jsonl file.
+
+        Returns:
+            Report dict: created, skipped and failed counts, skipped_rows and
+            errors (each {'row', 'email', ...}, row being the 1-based record
+            number not counting the CSV header), and truncated if the file had
+            more than RegistrationImport.MAX_ROWS rows
+        """
+        return self.import_rows(event, self.read_rows(upload), registered_by)
+
+    def read_rows(self, upload):
+        """
+        Yield the upload's records as (row_number, dict), reading it as a stream.
+
+        A record that can't be parsed is yielded as (row_number, None).
+        """
+        name = (upload.name or '').lower()
+        if name.endswith('.csv'):
+            return self._read_csv(upload)
+        if name.endswith(('.json', '.jsonl', '.ndjson')):
+            return self._read_json(upload)
+        raise ValidationError({'file': 'Upload a .csv, .json or .jsonl file.'})
+
+    def _read_csv(self, upload):
+        reader = csv.DictReader(codecs.iterdecode(upload, 'utf-8-sig'))
+        for row_number, row in enumerate(reader, start=1):
+            # Extra cells without a header land under None; they're ignored
+            row.pop(None, None)
+            yield row_number, row
+
+    def _read_json(self, upload):
+        upload.seek(0)
+        head = upload.read(64).lstrip()
+        upload.seek(0)
+        if head.startswith((b'[', b'\xef\xbb\xbf[')):
+            # A JSON array has to be parsed whole; the view bounds the upload size
+            try:
+                records = json.loads(upload.read().decode('utf-8-sig'))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise ValidationError({'file': 'Invalid JSON.'}) from e
+            for row_number, record in enumerate(records, start=1):
+                yield row_number, record if isinstance(record, dict) else None
+            return
+
+        # JSON Lines: one object per line
+        row_number = 0
+        for line in codecs.iterdecode(upload, 'utf-8-sig'):
+            if not line.strip():
+                continue
+            row_number += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                record = None
+            yield row_number, record if isinstance(record, dict) else None
+
+    def import_rows(self, event: Event, rows, registered_by) -> dict:
+        """
+        Import (row_number, dict) records into event, RegistrationImport.CHUNK_SIZE at a time.
+
+        Each chunk commits on its own; rows of a chunk that fail validation
+        are reported and the rest of the chunk is still imported.
+        """
+        report = {'created': 0, 'skipped': 0, 'failed': 0, 'skipped_rows': [], 'errors': [], 'truncated': False}
+        custom_fields = self._custom_field_columns(event)
+        seen = set()
+
+        rows = iter(rows)
+        read = 0
+        try:
+            while chunk := list(islice(rows, min(RegistrationImport.CHUNK_SIZE, RegistrationImport.MAX_ROWS - read))):
+                read += len(chunk)
+                self._import_chunk(event, chunk, custom_fields, registered_by, seen, report)
+                if read >= RegistrationImport.MAX_ROWS:
+                    report['truncated'] = next(rows, None) is not None
+                    break
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Chunks already imported stay; the rest of the file is unreadable
+            logger.warning(f"Registration import for event {event.pk} stopped at row {read + 1}: {e}")
+            self._report(report, 'errors', read + 1, '', ['File could not be read from this row on; it was not imported.'])
+
+        if report['created'] and event.zoom_meeting_id:
+            from registrations.tasks import sync_zoom_registrants
+
+            transaction.on_commit(lambda: sync_zoom_registrants.delay(event.pk))
+
+        logger.info(
+            f"Imported registrations for event {event.pk}: "
+            f"{report['created']} created, {report['skipped']} skipped, {report['failed']} failed"
+        )
+        return report
+
+    def _custom_field_columns(self, event: Event) -> dict:
+        """Map normalized custom field labels and UUIDs to the event's custom fields."""
+        columns = {}
+        for field in event.custom_fields.all():
+            columns[_normalize_column(field.label)] = field
+            columns[str(field.uuid)] = field
+        return columns
+
+    def _clean_row(self, record, custom_fields: dict) -> tuple[dict, list[str]]:
+        """Map a record's columns onto registration fields and check them. Returns (row, errors)."""
+        if record is None:
+            return {'email': ''}, ['Could not parse this row.']
+
+        values = {_normalize_column(key): value for key, value in record.items()}
+        row = {
+            field: next((_cell(values[alias]) for alias in aliases if alias in values), '')
+            for field, aliases in COLUMN_ALIASES.items()
+        }
+        row['email'] = row['email'].lower()
+        if not row['full_name']:
+            row['full_name'] = ' '.join(part for part in (row['first_name'], row['last_name']) if part)
+
+        # One response per field, even if both its label and UUID columns are present
+        responses = {}
+        for key, value in values.items():
+            if key in custom_fields and _custom_value(value):
+                responses.setdefault(custom_fields[key].pk, (custom_fields[key], _custom_value(value)))
+        row['custom_fields'] = list(responses.values())
+
+        errors = []
+        if not row['email']:
+            errors.append('Email is required.')
+        else:
+            try:
+                validate_email(row['email'])
+            except DjangoValidationError:
+                errors.append('Enter a valid email address.')
+        for field, max_length in FIELD_MAX_LENGTHS.items():
+            if len(row[field]) > max_length:
+                errors.append(f"{field} is longer than {max_length} characters.")
+        return row, errors
+
+    def _import_chunk(self, event: Event, chunk: list, custom_fields: dict, registered_by, seen: set, report: dict):
+        """Validate, deduplicate and insert one chunk of records."""
+        from accounts.models import User
+
+        cleaned = []
+        for row_number, record in chunk:
+            row, errors = self._clean_row(record, custom_fields)
+            if errors:
+                self._report(report, 'errors', row_number, row['email'], errors)
+            elif row['email'] in seen:
+                self._report(report, 'skipped_rows', row_number, row['email'], 'Duplicate email in file.')
+            else:
+                seen.add(row['email'])
+                cleaned.append((row_number, row))
+        if not cleaned:
+            return
+
+        emails = [row['email'] for _, row in cleaned]
+        already_registered = set(Registration.all_objects.filter(event=event, email__in=emails).values_list('email', flat=True))
+        users = {user.email: user for user in User.objects.filter(email__in=emails)}
+
+        to_create = []
+        for row_number, row in cleaned:
+            user = users.get(row['email'])
+            if row['email'] in already_registered:
+                self._report(report, 'skipped_rows', row_number, row['email'], 'Already registered.')
+            elif not (user or row['full_name']):
+                self._report(report, 'errors', row_number, row['email'], ['Name is required.'])
+            else:
+                registration = Registration(
+                    event=event,
+                    user=user,
+                    email=row['email'],
+                    full_name=user.full_name if user else row['full_name'],
+                    professional_title=row['professional_title'],
+                    organization_name=row['organization_name'],
+                    status=Registration.Status.CONFIRMED,
+                    source=Registration.Source.MANUAL,
+                    registered_by=registered_by,
+                )
+                to_create.append((row_number, registration, row['custom_fields']))
+
+        while to_create:
+            try:
+                self._write(event, to_create)
+                break
+            except IntegrityError as e:
+                # Someone registered with some of these emails since the check: skip them and write the rest
+                taken = set(
+                    Registration.all_objects.filter(
+                        event=event, email__in=[registration.email for _, registration, _ in to_create]
+                    ).values_list('email', flat=True)
+                )
+                if not taken:
+                    # Not a duplicate registration; the chunk can't be written
+                    logger.warning(f"Registration import for event {event.pk} could not write a chunk: {e}")
+                    for row_number, registration, _ in to_create:
+                        self._report(report, 'errors', row_number, registration.email, ['Could not be saved.'])
+                    to_create = []
+                    break
+                for row_number, registration, _ in to_create:
+                    if registration.email in taken:
+                        self._report(report, 'skipped_rows', row_number, registration.email, 'Already registered.')
+                to_create = [item for item in to_create if item[1].email not in taken]
+        report['created'] += len(to_create)
+
+    def _write(self, event: Event, to_create: list):
+        """
+        Insert a chunk's registrations and custom field responses, and apply their Registration signal effects.
+        """
+        from contacts.models import ContactOutboxEntry
+        from contacts.outbox import contact_outbox
+
+        if not to_create:
+            return
+        registrations = [registration for _, registration, _ in to_create]
+        with transaction.atomic():
+            Registration.objects.bulk_create(registrations)
+            CustomFieldResponse.objects.bulk_create(
+                [
+                    CustomFieldResponse(registration=registration, field=field, value=value)
+                    for _, registration, responses in to_create
+                    for field, value in responses
+                ]
+            )
+            seat_admission_service.take(event.pk, seats=len(registrations))
+            counter_deltas.add(Event, event.pk, registration_count=len(registrations))
+            contact_outbox.enqueue_many(registrations, ContactOutboxEntry.Kind.LINK)
+
+    def _report(self, report: dict, key: str, row_number: int, email: str, detail):
+        """Count a skipped or failed row, listing it while under RegistrationImport.MAX_REPORTED_ROWS."""
+        report['skipped' if key == 'skipped_rows' else 'failed'] += 1
+        if len(report[key]) < RegistrationImport.MAX_REPORTED_ROWS:
+            entry = {'row': row_number, 'email': email}
+            entry['reason' if key == 'skipped_rows' else 'errors'] = detail
+            report[key].append(entry)
+
+
+# Singleton instance
+registration_import_service = RegistrationImportService()
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registrations', '0002_add_zoom_retry_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registration',
+            name='seat_hold_expires_at',
+            field=models.DateTimeField(
+                blank=True, db_index=True, help_text="When an unpaid registration's seat is released", null=True
+            ),
+        ),
+    ]
@@ -133,6 +133,11 @@ class Registration(SoftDeleteModel):
         null=True, blank=True, help_text="When promoted from waitlist to confirmed"
     )
 
+    # Seat hold (pending payment, see registrations.admission)
+    seat_hold_expires_at = models.DateTimeField(
+        null=True, blank=True, db_index=True, help_text="When an unpaid registration's seat is released"
+    )
+
     # Cancellation
     cancelled_at = models.DateTimeField(null=True, blank=True)
     cancellation_reason = models.TextField(blank=True)
@@ -195,9 +200,98 @@ class Registration(SoftDeleteModel):
         verbose_name = 'Registration'
         verbose_name_plural = 'Registrations'
 
+    # Fields that decide which Event counters a registration counts toward
+    COUNTED_FIELDS = ('status', 'attended', 'certificate_issued', 'deleted_at')
+
+    # Statuses holding one of the event's max_attendees seats (Event.seats_taken), and the fields deciding it
+    SEAT_STATUSES = (Status.CONFIRMED, Status.PENDING)
+    SEAT_FIELDS = ('status', 'deleted_at')
+    SEAT_HOLD_EXPIRED_REASON = 'Seat hold expired before payment was completed'
+
     def __str__(self):
         return f"{self.full_name} → {self.event.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Snapshot what this row counts toward, so a save can apply just the change
+        if all(field in field_names for field in cls.COUNTED_FIELDS):
+            instance._counted = instance.counter_contributions()
+        if all(field in field_names for field in cls.SEAT_FIELDS):
+            instance._seated = instance.holds_seat
+        return instance
+
+    # =========================================
+    # Event Counters
+    # =========================================
+    def counter_contributions(self) -> dict[str, int]:
+        """The Event counters this registration counts toward (1 each), as Event.update_counts() counts them."""
+        if self.deleted_at is not None:
+            return {}
+        return {
+            'registration_count': int(self.status == self.Status.CONFIRMED),
+            'waitlist_count': int(self.status == self.Status.WAITLISTED),
+            'attendance_count': int(bool(self.attended)),
+            'certificate_count': int(bool(self.certificate_issued)),
+        }
+
+    def record_counter_change(self, created: bool = False, deleted: bool = False):
+        """
+        Apply this registration's counter transition to its event as F() deltas.
+
+        Compares what it counts toward now with the snapshot taken when it was
+        loaded (or last recorded). Without a snapshot, e.g. loaded with
+        deferred fields, the event is recounted instead.
+        """
+        from common.counters import counter_deltas
+
+        before = {} if created else getattr(self, '_counted', None)
+        after = {} if deleted else self.counter_contributions()
+        if before is None:
+            event = Event.all_objects.filter(pk=self.event_id).first()
+            if event:
+                event.update_counts()
+        else:
+            deltas = {field: after.get(field, 0) - before.get(field, 0) for field in after.keys() | before.keys()}
+            counter_deltas.add(Event, self.event_id, **deltas)
+        self._counted = after
+
+    # =========================================
+    # Seats (admission control)
+    # =========================================
+    @property
+    def holds_seat(self) -> bool:
+        """Whether this registration occupies one of the event's seats."""
+        return self.deleted_at is None and self.status in self.SEAT_STATUSES
+
+    @property
+    def hold_lapsed(self) -> bool:
+        """Cancelled because its seat hold expired before payment (release_expired_seat_holds)."""
+        return self.status == self.Status.CANCELLED and self.cancellation_reason == self.SEAT_HOLD_EXPIRED_REASON
+
+    def record_seat_change(self, created: bool = False, deleted: bool = False):
+        """
+        Apply this registration taking or giving up a seat to Event.seats_taken.
+
+        Unlike the counters this is written right away, in the caller's
+        transaction, because admissions read it. A seat taken through
+        seat_admission_service.acquire() is already counted. Without a
+        snapshot, the event's seats are recounted instead.
+        """
+        from registrations.admission import seat_admission_service
+
+        before = getattr(self, '_seated', False if created else None)
+        after = not deleted and self.holds_seat
+        if before is None:
+            event = Event.all_objects.filter(pk=self.event_id).first()
+            if event:
+                event.recount_seats()
+        elif after and not before:
+            seat_admission_service.take(self.event_id)
+        elif before and not after:
+            seat_admission_service.release(self.event_id)
+        self._seated = after
+
     # =========================================
     # Properties
     # =========================================
@@ -239,8 +333,8 @@ class Registration(SoftDeleteModel):
             return True
         return False
 
-    def cancel(self, reason='', cancelled_by=None):
-        """Cancel this registration."""
+    def cancel(self, reason='', cancelled_by=None, promote=True):
+        """Cancel this registration, promoting from the waitlist unless promote=False."""
         self.status = self.Status.CANCELLED
         self.cancelled_at = timezone.now()
         self.cancellation_reason = reason
@@ -250,21 +344,25 @@ class Registration(SoftDeleteModel):
         # Update event counts handled by signals
 
         # Promote from waitlist if applicable
-        self._promote_next_from_waitlist()
+        if promote:
+            self._promote_next_from_waitlist()
 
     def _promote_next_from_waitlist(self):
-        """Promote next person from waitlist after cancellation."""
+        """Promote next person from waitlist after cancellation, if a seat is free."""
+        from registrations.admission import seat_admission_service
+
         # Only promote if auto-promote is enabled on the event
         if not self.event.waitlist_enabled or not self.event.waitlist_auto_promote:
             return
 
         next_waitlisted = (
             Registration.objects.filter(event=self.event, status=self.Status.WAITLISTED, deleted_at__isnull=True)
-            .order_by('waitlist_position')
+            .order_by('waitlist_position', 'created_at')
             .first()
         )
 
-        if next_waitlisted:
+        # The freed seat may already have gone to a concurrent registration
+        if next_waitlisted and seat_admission_service.acquire(self.event, next_waitlisted):
             next_waitlisted.promote_from_waitlist()
 
     def promote_from_waitlist(self):
@@ -276,8 +374,11 @@ class Registration(SoftDeleteModel):
             self.status = self.Status.CONFIRMED
             self.payment_status = self.PaymentStatus.NA
         else:
+            from registrations.admission import seat_admission_service
+
             self.status = self.Status.PENDING
             self.payment_status = self.PaymentStatus.PENDING
+            self.seat_hold_expires_at = seat_admission_service.hold_expiry(promotion=True)
             ticket_price = Decimal(str(self.event.price or 0))
             self.amount_paid = ticket_price
             self.platform_fee_amount = Decimal('0.00')
@@ -300,6 +401,7 @@ class Registration(SoftDeleteModel):
                 'total_amount',
                 'promoted_from_waitlist_at',
                 'waitlist_position',
+                'seat_hold_expires_at',
                 'updated_at',
             ]
         )
@@ -326,68 +428,147 @@ class Registration(SoftDeleteModel):
             },
         )
 
+    def minutes_eligibility_threshold(self):
+        """
+        Minutes of attendance that make this registration eligible, or None
+        when eligibility doesn't depend on attended minutes (multi-session
+        events judged by sessions attended).
+        """
+        criteria = self.event.multi_session_completion_criteria
+        if self.event.is_multi_session and criteria != Event.MultiSessionCompletionCriteria.TOTAL_MINUTES:
+            return None
+        return self.event.minimum_attendance_minutes
+
+    def record_attendance_join(self, join_time):
+        """
+        Incrementally apply a participant join: only first_join_at can change.
+
+        One UPDATE; attended minutes are applied when the record closes.
+        """
+        from django.db.models import DateTimeField, Value
+        from django.db.models.functions import Coalesce, Least
+
+        join = Value(join_time, output_field=DateTimeField())
+        Registration.all_objects.filter(pk=self.pk).update(
+            first_join_at=Least(Coalesce('first_join_at', join), join), updated_at=timezone.now()
+        )
+        self.refresh_from_db(fields=['first_join_at', 'updated_at'])
+
+    @classmethod
+    def record_attendance_joins(cls, joins: dict):
+        """
+        Apply many participant joins at once: {registration_id: join_time}.
+
+        Same rule as record_attendance_join(), in one UPDATE for the batch.
+        """
+        from django.db.models import Case, DateTimeField, Value, When
+        from django.db.models.functions import Coalesce, Least
+
+        if not joins:
+            return
+        join = Case(
+            *[When(pk=pk, then=Value(join_time)) for pk, join_time in joins.items()],
+            output_field=DateTimeField(),
+        )
+        cls.all_objects.filter(pk__in=list(joins)).update(
+            first_join_at=Least(Coalesce('first_join_at', join), join), updated_at=timezone.now()
+        )
+
+    def apply_attendance_delta(self, minutes_delta: int, join_time=None, leave_time=None):
+        """
+        Incrementally apply a closed (or re-closed) attendance record.
+
+        Adds minutes_delta to total_attendance_minutes, widens the first join /
+        last leave window and re-derives attended and minute-based eligibility,
+        all in one UPDATE so concurrent webhooks for the same registration
+        can't lose each other's minutes. Manual overrides are left alone.
+
+        Use update_attendance_summary() to rebuild from scratch (reconciliation).
+        """
+        from django.db.models import BooleanField, Case, DateTimeField, F, Q, Value, When
+        from django.db.models.functions import Coalesce, Greatest, Least
+
+        # Conditions below see pre-update values, so compare against threshold - delta
+        updates = {
+            'total_attendance_minutes': Greatest(F('total_attendance_minutes') + minutes_delta, Value(0)),
+            'attended': Case(
+                When(Q(total_attendance_minutes__gt=-minutes_delta) | Q(check_in_time__isnull=False), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            'updated_at': timezone.now(),
+        }
+        if join_time:
+            join = Value(join_time, output_field=DateTimeField())
+            updates['first_join_at'] = Least(Coalesce('first_join_at', join), join)
+        if leave_time:
+            leave = Value(leave_time, output_field=DateTimeField())
+            updates['last_leave_at'] = Greatest(Coalesce('last_leave_at', leave), leave)
+
+        threshold = self.minutes_eligibility_threshold()
+        if threshold is not None:
+            updates['attendance_eligible'] = Case(
+                When(attendance_override=True, then=F('attendance_eligible')),
+                When(check_in_time__isnull=False, then=Value(True)),
+                When(total_attendance_minutes__gte=threshold - minutes_delta, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+
+        was_eligible = self.attendance_eligible
+        Registration.all_objects.filter(pk=self.pk).update(**updates)
+        self.refresh_from_db(
+            fields=[
+                'total_attendance_minutes',
+                'attended',
+                'first_join_at',
+                'last_leave_at',
+                'attendance_eligible',
+                'updated_at',
+            ]
+        )
+        # The UPDATE bypasses post_save, so apply an attended flip and queue newly
+        # reached eligibility for the contact's stats here
+        self.record_counter_change()
+        if self.attendance_eligible and not was_eligible:
+            from contacts.models import ContactOutboxEntry
+            from contacts.outbox import contact_outbox
+
+            contact_outbox.enqueue(self, ContactOutboxEntry.Kind.ATTENDANCE)
+
     def update_attendance_summary(self):
         """
-        Recalculate attendance summary from AttendanceRecords and SessionAttendance.
-        Called after attendance records are created/updated.
+        Rebuild the attendance summary from AttendanceRecords and SessionAttendance.
+
+        Webhooks maintain the summary incrementally (record_attendance_join,
+        apply_attendance_delta); this full recompute is for reconciliation
+        and manual matches. Minutes are the merged join/leave intervals
+        clipped to the event's attendance windows (its sessions, for a
+        multi-session event), so overlapping segments count once.
         """
+        from common.attendance import covered_minutes_within
 
         # General attendance summary for single-session events or initial calculations
-        records = self.attendance_records.all()
+        intervals = list(self.attendance_records.values_list('join_time', 'leave_time'))
 
-        total_minutes = sum(r.duration_minutes for r in records)
+        total_minutes = covered_minutes_within(intervals, self.event.attendance_windows)
         self.total_attendance_minutes = total_minutes
 
         # Attended if joined Zoom OR checked in physically (Hybrid support)
         self.attended = (total_minutes > 0) or (self.check_in_time is not None)
 
-        if records.exists():
-            first_join = min(r.join_time for r in records)
-            last_leave = max(r.leave_time for r in records if r.leave_time) if any(r.leave_time for r in records) else None
-            self.first_join_at = first_join
-            self.last_leave_at = last_leave
-        else:
-            self.first_join_at = None
-            self.last_leave_at = None
+        self.first_join_at = min((join for join, _ in intervals), default=None)
+        self.last_leave_at = max((leave for _, leave in intervals if leave), default=None)
 
         # Determine attendance eligibility based on event type
         if not self.attendance_override:
-            # Physical check-in implies eligibility (unless overridden)
-            if self.check_in_time is not None:
-                self.attendance_eligible = True
-            elif self.event.is_multi_session:  # Check multi-session flag
-                # Multi-session event logic
-                session_progress_records = self.session_attendance.all()
-                total_sessions = self.event.sessions.filter(is_published=True).count()
-                eligible_sessions_count = session_progress_records.filter(is_eligible=True).count()
-
-                if self.event.multi_session_completion_criteria == Event.MultiSessionCompletionCriteria.ALL_SESSIONS:
-                    # All mandatory sessions must be eligible
-                    mandatory_sessions_count = self.event.sessions.filter(is_mandatory=True, is_published=True).count()
-                    self.attendance_eligible = (eligible_sessions_count >= mandatory_sessions_count) and (
-                        mandatory_sessions_count > 0
-                    )
-                elif (
-                    self.event.multi_session_completion_criteria == Event.MultiSessionCompletionCriteria.PERCENTAGE_OF_SESSIONS
-                ):
-                    if total_sessions > 0 and self.event.multi_session_completion_value is not None:
-                        percentage_attended = (eligible_sessions_count / total_sessions) * 100
-                        self.attendance_eligible = percentage_attended >= self.event.multi_session_completion_value
-                    else:
-                        self.attendance_eligible = False  # Cannot determine without total sessions or value
-                elif self.event.multi_session_completion_criteria == Event.MultiSessionCompletionCriteria.MIN_SESSIONS_COUNT:
-                    if self.event.multi_session_completion_value is not None:
-                        self.attendance_eligible = eligible_sessions_count >= self.event.multi_session_completion_value
-                    else:
-                        self.attendance_eligible = False  # Cannot determine without minimum sessions count
-                elif self.event.multi_session_completion_criteria == Event.MultiSessionCompletionCriteria.TOTAL_MINUTES:
-                    # Fallback to total minutes across all sessions if specified
-                    self.attendance_eligible = total_minutes >= self.event.minimum_attendance_minutes
-                else:
-                    self.attendance_eligible = False  # Default to false if criteria is not recognized or set
-            else:
-                # Single-session event logic
-                self.attendance_eligible = total_minutes >= self.event.minimum_attendance_minutes
+            eligible_sessions, session_totals = 0, (0, 0)
+            if self.check_in_time is None and self.event.is_multi_session:
+                eligible_sessions = self.session_attendance.filter(is_eligible=True).count()
+                session_totals = event_session_totals(self.event)
+            self.attendance_eligible = attendance_eligibility(
+                self.event, total_minutes, self.check_in_time is not None, eligible_sessions, session_totals
+            )
 
         self.save(
             update_fields=[
@@ -419,10 +600,58 @@ class Registration(SoftDeleteModel):
     @classmethod
     def link_registrations_for_user(cls, user):
         """Link all registrations with matching email to this user."""
-        count = cls.objects.filter(email__iexact=user.email, user__isnull=True, deleted_at__isnull=True).update(user=user)
+        count = cls.objects.filter(email=user.email, user__isnull=True, deleted_at__isnull=True).update(user=user)
         return count
 
 
+def event_session_totals(event) -> tuple[int, int]:
+    """(published sessions, published mandatory sessions) for a multi-session event, in one query."""
+    from django.db.models import Count, Q
+
+    counts = event.sessions.filter(is_published=True).aggregate(
+        total=Count('id'), mandatory=Count('id', filter=Q(is_mandatory=True))
+    )
+    return counts['total'], counts['mandatory']
+
+
+def attendance_eligibility(event, total_minutes: int, checked_in: bool, eligible_sessions: int = 0, session_totals=(0, 0)):
+    """
+    Attendance eligibility rule for one registration, without queries.
+
+    Args:
+        event: The registration's event
+        total_minutes: Attended minutes
+        checked_in: Physically checked in (implies eligibility)
+        eligible_sessions: Sessions the registration is eligible for (multi-session events)
+        session_totals: event_session_totals(event) (multi-session events)
+    """
+    # Physical check-in implies eligibility (unless overridden)
+    if checked_in:
+        return True
+
+    if not event.is_multi_session:
+        # Single-session event logic
+        return total_minutes >= event.minimum_attendance_minutes
+
+    # Multi-session event logic
+    total_sessions, mandatory_sessions = session_totals
+    criteria = event.multi_session_completion_criteria
+    value = event.multi_session_completion_value
+    if criteria == Event.MultiSessionCompletionCriteria.ALL_SESSIONS:
+        # All mandatory sessions must be eligible
+        return eligible_sessions >= mandatory_sessions and mandatory_sessions > 0
+    if criteria == Event.MultiSessionCompletionCriteria.PERCENTAGE_OF_SESSIONS:
+        # Cannot determine without total sessions or value
+        return total_sessions > 0 and value is not None and (eligible_sessions / total_sessions) * 100 >= value
+    if criteria == Event.MultiSessionCompletionCriteria.MIN_SESSIONS_COUNT:
+        # Cannot determine without minimum sessions count
+        return value is not None and eligible_sessions >= value
+    if criteria == Event.MultiSessionCompletionCriteria.TOTAL_MINUTES:
+        # Fallback to total minutes across all sessions if specified
+        return total_minutes >= event.minimum_attendance_minutes
+    return False  # Default to false if criteria is not recognized or set
+
+
 class AttendanceRecord(BaseModel):
     """
     Individual attendance record from Zoom.
@@ -519,13 +748,36 @@ class AttendanceRecord(BaseModel):
 
     def participant_left(self, leave_time=None):
         """Mark participant as having left the meeting."""
+        previous_leave = self.leave_time
         self.leave_time = leave_time or timezone.now()
         self.calculate_duration()
         self.save(update_fields=['leave_time', 'duration_minutes', 'updated_at'])
 
-        # Update registration summary
+        # Apply the minutes this record adds to the registration summary
         if self.registration:
-            self.registration.update_attendance_summary()
+            self.registration.apply_attendance_delta(
+                self.covered_minutes_added(previous_leave), join_time=self.join_time, leave_time=self.leave_time
+            )
+
+    def covered_minutes_added(self, previous_leave=None) -> int:
+        """
+        Minutes this record adds to its registration's merged attendance.
+
+        Compares the registration's covered minutes with and without this
+        record's interval (or with its previous interval, when re-closed), so
+        time already covered by an overlapping segment isn't counted twice.
+        """
+        from common.attendance import covered_minutes_within
+
+        others = list(
+            AttendanceRecord.objects.filter(registration_id=self.registration_id, leave_time__isnull=False)
+            .exclude(pk=self.pk)
+            .values_list('join_time', 'leave_time')
+        )
+        windows = self.registration.event.attendance_windows
+        before = covered_minutes_within(others + [(self.join_time, previous_leave)], windows)
+        after = covered_minutes_within(others + [(self.join_time, self.leave_time)], windows)
+        return after - before
 
     def match_to_registration(self, registration, user=None, manual=False):
         """Match this record to a registration."""
@@ -1,27 +1,69 @@
 import json
 import logging
 from decimal import Decimal
-from typing import Any
+from typing import Any, NamedTuple
 
-from django.db import transaction
-from django.db.models import Max
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, Max, OuterRef
 from rest_framework.exceptions import ValidationError
 
 from billing.services import stripe_payment_service
 from events.models import Event
 from promo_codes.services import PromoCodeError, promo_code_service
+from registrations.admission import SeatUnavailableError, seat_admission_service
 from registrations.models import CustomFieldResponse, Registration
 
 logger = logging.getLogger(__name__)
 
 
+class RegistrationContext(NamedTuple):
+    """
+    What the registration path checks before creating a registration,
+    fetched up front by RegistrationService.prefetch_context().
+    """
+
+    already_registered: bool
+    seats_taken: int
+    # Annotated with its validation lookups (promo_code_service.find_code); None if not given or not found
+    promo_code: Any
+
+
 class RegistrationService:
     """
     Service for managing event registrations.
     Handles validation, capacity checks, promo codes, and payments.
     """
 
-    def register_participant(self, event: Event, data: dict[str, Any], user=None) -> dict[str, Any]:
+    def prefetch_context(self, event: Event, email: str, user=None, promo_code_str: str = '') -> RegistrationContext:
+        """
+        Fetch the duplicate, capacity and promo code facts for one registration.
+
+        One query for the event (duplicate check, seats taken) and, when a
+        promo code applies, one for the code and everything its validation
+        needs.
+        """
+        existing = Registration.objects.filter(event_id=OuterRef('pk'))
+        existing = existing.filter(user=user) if user else existing.filter(email=email)
+        facts = (
+            Event.all_objects.filter(pk=event.pk)
+            .annotate(already_registered=Exists(existing))
+            .values('seats_taken', 'already_registered')
+            .first()
+        ) or {}
+
+        promo_code = None
+        if promo_code_str and not event.is_free:
+            promo_code = promo_code_service.find_code(promo_code_str, event, email=email)
+
+        return RegistrationContext(
+            already_registered=facts.get('already_registered', False),
+            seats_taken=facts.get('seats_taken', event.seats_taken),
+            promo_code=promo_code,
+        )
+
+    def register_participant(
+        self, event: Event, data: dict[str, Any], user=None, context: RegistrationContext | None = None
+    ) -> dict[str, Any]:
         """
         Register a participant for an event.
 
@@ -29,6 +71,7 @@ class RegistrationService:
             event: The Event instance.
             data: Validated data from serializer.
             user: Authenticated user (optional).
+            context: Precomputed prefetch_context() for this registration (optional).
 
         Returns:
             Dict containing registration details.
@@ -44,34 +87,26 @@ class RegistrationService:
             email = user.email
             full_name = full_name or user.full_name
 
-        # 2. Duplicate Check
-        existing_query = Registration.objects.filter(event=event, deleted_at__isnull=True)
-        if user:
-            is_registered = existing_query.filter(user=user).exists()
-        else:
-            is_registered = existing_query.filter(email__iexact=email).exists()
+        promo_code_str = data.get('promo_code', '').strip()
+        if context is None:
+            context = self.prefetch_context(event, email, user, promo_code_str)
 
-        if is_registered:
+        # 2. Duplicate Check
+        if context.already_registered:
             raise ValidationError("Already registered for this event.")
 
         # 3. Capacity & Waitlist Check
-        # Note: status will be set based on payment requirement later
-        if event.max_attendees:
-            confirmed_count = event.registrations.filter(status=Registration.Status.CONFIRMED).count()
-            if confirmed_count >= event.max_attendees:
-                if event.waitlist_enabled:
-                    return self._add_to_waitlist(event, user, email, full_name, data)
-                else:
-                    raise ValidationError("Event is at capacity.")
+        # Fast path from the prefetched counter; the seat itself is taken atomically in step 5
+        if event.max_attendees is not None and context.seats_taken >= event.max_attendees:
+            return self._waitlist_or_reject(event, user, email, full_name, data)
 
         # 4. Promo Code Validation & Pricing
-        promo_code_str = data.get('promo_code', '').strip()
         validated_promo_code = None
         final_price = event.price
 
         if promo_code_str and not event.is_free:
             try:
-                promo_code = promo_code_service.find_code(promo_code_str, event)
+                promo_code = context.promo_code
                 if not promo_code:
                     raise ValidationError("Invalid promo code.")
 
@@ -96,35 +131,51 @@ class RegistrationService:
         billing_details_provided = bool(billing_country and billing_postal_code)
 
         # 5. Create Registration (Atomic)
-        with transaction.atomic():
-            registration = Registration.objects.create(
-                event=event,
-                user=user,
-                email=email,
-                full_name=full_name,
-                professional_title=data.get('professional_title', ''),
-                organization_name=data.get('organization_name', ''),
-                status=status_to_set,
-                allow_public_verification=data.get('allow_public_verification', True),
-                source=Registration.Source.SELF,
-                amount_paid=final_price,
-                platform_fee_amount=Decimal('0.00'),
-                service_fee_amount=Decimal('0.00'),
-                processing_fee_amount=Decimal('0.00'),
-                tax_amount=Decimal('0.00'),
-                total_amount=final_price,
-                billing_country=billing_country,
-                billing_state=billing_state,
-                billing_postal_code=billing_postal_code,
-                billing_city=billing_city,
-            )
-
-            # Apply Promo Code
-            if validated_promo_code:
-                promo_code_service.apply_code(validated_promo_code, registration, event.price)
-
-            # Save Custom Fields
-            self._save_custom_fields(event, registration, data.get('custom_field_responses', {}))
+        # The seat is taken last, so the event row is locked only until commit;
+        # if none is left the registration rolls back and goes to the waitlist
+        try:
+            with transaction.atomic():
+                registration = Registration(
+                    event=event,
+                    user=user,
+                    email=email,
+                    full_name=full_name,
+                    professional_title=data.get('professional_title', ''),
+                    organization_name=data.get('organization_name', ''),
+                    status=status_to_set,
+                    allow_public_verification=data.get('allow_public_verification', True),
+                    source=Registration.Source.SELF,
+                    amount_paid=final_price,
+                    platform_fee_amount=Decimal('0.00'),
+                    service_fee_amount=Decimal('0.00'),
+                    processing_fee_amount=Decimal('0.00'),
+                    tax_amount=Decimal('0.00'),
+                    total_amount=final_price,
+                    billing_country=billing_country,
+                    billing_state=billing_state,
+                    billing_postal_code=billing_postal_code,
+                    billing_city=billing_city,
+                )
+                if status_to_set == Registration.Status.PENDING:
+                    registration.seat_hold_expires_at = seat_admission_service.hold_expiry()
+                # Counted by acquire() below, not by the post_save seat accounting
+                registration._seated = True
+                registration.save(force_insert=True)
+
+                # Apply Promo Code
+                if validated_promo_code:
+                    promo_code_service.apply_code(validated_promo_code, registration, event.price)
+
+                # Save Custom Fields
+                self._save_custom_fields(event, registration, data.get('custom_field_responses', {}))
+
+                if not seat_admission_service.acquire(event, registration):
+                    raise SeatUnavailableError
+        except SeatUnavailableError:
+            return self._waitlist_or_reject(event, user, email, full_name, data)
+        except IntegrityError:
+            # A concurrent request registered the same email first
+            raise ValidationError("Already registered for this event.") from None
 
         # 6. Payment Processing
         client_secret = None
@@ -189,6 +240,12 @@ class RegistrationService:
             'requires_payment': final_price > 0,
         }
 
+    def _waitlist_or_reject(self, event, user, email, full_name, data):
+        """Spill over to the waitlist when the event has no seat left."""
+        if event.waitlist_enabled:
+            return self._add_to_waitlist(event, user, email, full_name, data)
+        raise ValidationError("Event is at capacity.")
+
     def _add_to_waitlist(self, event, user, email, full_name, data):
         """Internal method to add to waitlist."""
         waitlist_pos = self._get_next_waitlist_position(event)
@@ -237,10 +294,13 @@ class RegistrationService:
         # Get valid field UUIDs for this event
         valid_fields = {str(f.uuid): f for f in event.custom_fields.all()}
 
-        for field_uuid, value in responses.items():
-            field_obj = valid_fields.get(field_uuid)
-            if field_obj:
-                CustomFieldResponse.objects.create(registration=registration, field=field_obj, value=serialize_val(value))
+        CustomFieldResponse.objects.bulk_create(
+            [
+                CustomFieldResponse(registration=registration, field=valid_fields[field_uuid], value=serialize_val(value))
+                for field_uuid, value in responses.items()
+                if field_uuid in valid_fields
+            ]
+        )
 
     def _get_next_waitlist_position(self, event):
         """Get next available waitlist position."""
@@ -349,7 +409,12 @@ class PaymentConfirmationService:
                             status=Registration.Status.CONFIRMED,
                             deleted_at__isnull=True,
                         ).count()
-                        if event.max_attendees and confirmed_count >= event.max_attendees:
+                        event_full = bool(event.max_attendees and confirmed_count >= event.max_attendees)
+                        # A pending registration already holds its seat; one whose hold lapsed must win it back
+                        hold_lapsed = locked_reg.hold_lapsed
+                        if hold_lapsed and not event_full:
+                            event_full = not seat_admission_service.acquire(event, locked_reg)
+                        if event_full:
                             refund_result = stripe_payment_service.refund_payment_intent(
                                 registration.payment_intent_id,
                                 registration=locked_reg,
@@ -380,11 +445,15 @@ class PaymentConfirmationService:
                         locked_reg.payment_status = Registration.PaymentStatus.PAID
                         locked_reg.total_amount = Decimal(intent.amount_received) / Decimal('100')
 
-                        # Update status to CONFIRMED if it was PENDING
+                        # Update status to CONFIRMED if it was PENDING (or its hold lapsed)
                         updated_fields = ['payment_status', 'total_amount', 'updated_at']
-                        if locked_reg.status == Registration.Status.PENDING:
+                        if locked_reg.status == Registration.Status.PENDING or hold_lapsed:
                             locked_reg.status = Registration.Status.CONFIRMED
                             updated_fields.append('status')
+                        if hold_lapsed:
+                            locked_reg.cancelled_at = None
+                            locked_reg.cancellation_reason = ''
+                            updated_fields.extend(['cancelled_at', 'cancellation_reason'])
                         if transfer_id and not locked_reg.stripe_transfer_id:
                             locked_reg.stripe_transfer_id = transfer_id
                             updated_fields.append('stripe_transfer_id')
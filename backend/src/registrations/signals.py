@@ -5,11 +5,26 @@ from .models import Registration
 
 
 @receiver(post_save, sender=Registration)
+def update_event_counts(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Update event counts when a registration's status, attendance or certificate changes.
+
+    Saves that touch none of Registration.COUNTED_FIELDS (Zoom registrant
+    fields, payment details, ...) leave the counters alone; the others apply F()
+    deltas (see Registration.record_counter_change). Status changes also
+    take or give back a seat (Registration.record_seat_change).
+    """
+    if update_fields is not None and not set(update_fields) & set(Registration.COUNTED_FIELDS):
+        return
+    instance.record_counter_change(created=created)
+    if update_fields is None or set(update_fields) & set(Registration.SEAT_FIELDS):
+        instance.record_seat_change(created=created)
+
+
 @receiver(post_delete, sender=Registration)
-def update_event_counts(sender, instance, **kwargs):
+def remove_from_event_counts(sender, instance, **kwargs):
     """
-    Update event counts when a registration is saved or deleted.
+    Take a hard-deleted registration out of its event's counts and seats.
     """
-    # Simply call the event's update_counts method
-    # This recalculates registration_count, waitlist_count, etc.
-    instance.event.update_counts()
+    instance.record_counter_change(deleted=True)
+    instance.record_seat_change(deleted=True)
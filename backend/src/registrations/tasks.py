@@ -6,7 +6,7 @@ import logging
 
 from django.utils import timezone
 
-from common.cloud_tasks import task
+from common.cloud_tasks import RetryPolicy, task
 
 logger = logging.getLogger(__name__)
 
@@ -65,16 +65,14 @@ def send_registration_confirmations(registration_ids: list):
     Args:
         registration_ids: List of registration IDs
     """
-    count = 0
-    for reg_id in registration_ids:
-        send_registration_confirmation.delay(reg_id)
-        count += 1
+    result = send_registration_confirmation.delay_many(registration_ids)
+    count = result['enqueued']
 
-    logger.info(f"Queued {count} registration confirmations")
+    logger.info(f"Queued {count} registration confirmations ({len(result['failed'])} failed to enqueue)")
     return count
 
 
-@task()
+@task(retry=RetryPolicy(max_retries=5, backoff_base=60))  # 60, 120, 240, 480, 960 seconds
 def add_zoom_registrant(registration_id: int, retry_count: int = 0):
     """
     Add registration to Zoom meeting as registrant.
@@ -92,9 +90,7 @@ def add_zoom_registrant(registration_id: int, retry_count: int = 0):
     from accounts.services import zoom_service
     from registrations.models import Registration
 
-    # Retry configuration
-    MAX_RETRIES = 5
-    BACKOFF_BASE_SECONDS = 60  # 1 minute base, doubles each retry
+    MAX_RETRIES = add_zoom_registrant.retry_policy.max_retries
 
     try:
         registration = Registration.objects.select_related('event').get(id=registration_id)
@@ -148,18 +144,13 @@ def add_zoom_registrant(registration_id: int, retry_count: int = 0):
             # App-level retry with exponential backoff
             if retry_count < MAX_RETRIES:
                 next_retry = retry_count + 1
-                backoff_seconds = BACKOFF_BASE_SECONDS * (2 ** retry_count)  # 60, 120, 240, 480, 960
-                logger.info(
-                    f"Scheduling retry {next_retry}/{MAX_RETRIES} for {registration.uuid} "
-                    f"in {backoff_seconds}s"
-                )
                 # Update attempt count
                 registration.zoom_add_attempt_count = next_retry
                 registration.zoom_add_error = error_msg
                 registration.save(update_fields=['zoom_add_attempt_count', 'zoom_add_error', 'updated_at'])
 
-                # Schedule retry (uses Cloud Tasks scheduling if available)
-                add_zoom_registrant.delay(registration_id, retry_count=next_retry)
+                # Schedule retry after the backoff instead of hitting Zoom again immediately
+                add_zoom_registrant.retry(retry_count, registration_id, retry_count=next_retry)
                 return False
             else:
                 # Max retries exceeded - log and give up
@@ -180,7 +171,64 @@ def add_zoom_registrant(registration_id: int, retry_count: int = 0):
         # For unexpected exceptions, still use app-level retry
         if retry_count < MAX_RETRIES:
             logger.info(f"Scheduling retry after exception for registration {registration_id}")
-            add_zoom_registrant.delay(registration_id, retry_count=retry_count + 1)
+            add_zoom_registrant.retry(retry_count, registration_id, retry_count=retry_count + 1)
             return False
         raise  # Only raise after max retries to avoid Cloud Tasks retry loop
 
+
+@task(retry=RetryPolicy(max_retries=5, backoff_base=60))
+def sync_zoom_registrants(event_id: int, retry_count: int = 0):
+    """
+    Add an event's confirmed registrations to its Zoom meeting in bulk.
+
+    Used instead of one add_zoom_registrant task per registration when a
+    whole event needs registrants, e.g. once its Zoom meeting is created.
+    Only registrations without a zoom_registrant_id are submitted, so a
+    retry resubmits just the failures and anything not reached.
+
+    Args:
+        event_id: Event whose registrations to sync
+        retry_count: Current retry attempt (for app-level retry logic)
+
+    Returns:
+        dict: added/failed/remaining counts
+    """
+    from accounts.services import zoom_service
+    from events.models import Event
+
+    try:
+        event = Event.objects.get(id=event_id)
+    except Event.DoesNotExist:
+        logger.error(f"Event {event_id} not found")
+        return {}
+
+    result = zoom_service.sync_meeting_registrants(event)
+    for registration_id, error in result['failed'].items():
+        logger.warning(f"Zoom registration failed for registration {registration_id}: {error}")
+
+    unfinished = result['failed'] or result['remaining']
+    if unfinished and not sync_zoom_registrants.retry(retry_count, event_id, retry_count=retry_count + 1):
+        logger.error(
+            f"Max retries exceeded syncing Zoom registrants for event {event_id}: "
+            f"{len(result['failed'])} failed, {result['remaining']} remaining"
+        )
+
+    return {'added': result['added'], 'failed': len(result['failed']), 'remaining': result['remaining']}
+
+
+@task()
+def release_expired_seat_holds():
+    """
+    Free the seats of pending registrations that didn't pay in time.
+
+    Meant to run every few minutes. Each lapsed registration is cancelled,
+    and the next waitlisted registration (if auto-promote is on) takes its
+    seat. A payment that still lands afterwards wins the seat back if one
+    is free, and is refunded otherwise.
+
+    Returns:
+        Number of holds released
+    """
+    from registrations.admission import seat_admission_service
+
+    return seat_admission_service.release_expired_holds()
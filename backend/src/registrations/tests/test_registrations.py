@@ -4,6 +4,7 @@ Tests for registration endpoints.
 Endpoints tested:
 - GET /api/v1/events/{event_uuid}/registrations/
 - POST /api/v1/events/{event_uuid}/registrations/
+- POST /api/v1/events/{event_uuid}/registrations/import/
 - PATCH /api/v1/events/{event_uuid}/registrations/{uuid}/
 - GET /api/v1/events/{event_uuid}/registrations/waitlist/
 - POST /api/v1/events/{event_uuid}/registrations/{uuid}/promote/
@@ -269,6 +270,523 @@ class TestAttendanceOverride:
         assert registration.can_receive_certificate is True
 
 
+# =============================================================================
+# Attendance Summary Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestIncrementalAttendanceSummary:
+    """Tests for incremental attendance summary maintenance."""
+
+    @pytest.fixture(autouse=True)
+    def start(self, registration):
+        from django.utils import timezone
+
+        # Attendance is clipped to the event window, so start the event now
+        start = timezone.now().replace(microsecond=0)
+        registration.event.starts_at = start
+        registration.event.save(update_fields=['starts_at'])
+        return start
+
+    def _record(self, registration, join_time):
+        from registrations.models import AttendanceRecord
+
+        return AttendanceRecord.objects.create(
+            event=registration.event,
+            registration=registration,
+            zoom_participant_id=f'p-{join_time.timestamp()}',
+            join_time=join_time,
+            is_matched=True,
+        )
+
+    def test_closing_records_applies_deltas(self, registration, start, django_assert_max_num_queries):
+        from django.utils import timezone
+
+        from contacts.models import ContactOutboxEntry
+
+        event = registration.event
+        event.minimum_attendance_minutes = 30
+        event.save(update_fields=['minimum_attendance_minutes'])
+
+        first = self._record(registration, start)
+        second = self._record(registration, start + timezone.timedelta(minutes=40))
+
+        first.participant_left(start + timezone.timedelta(minutes=20))
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 20
+        assert registration.attended is True
+        assert registration.attendance_eligible is False
+
+        # Record save, the registration's intervals, event rules, registration UPDATE and refresh,
+        # and the contact outbox entry for the eligibility it reaches
+        second.registration = registration
+        with django_assert_max_num_queries(6):
+            second.participant_left(start + timezone.timedelta(minutes=55))
+
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 35
+        assert registration.attendance_eligible is True
+        assert ContactOutboxEntry.objects.filter(registration=registration, kind=ContactOutboxEntry.Kind.ATTENDANCE).exists()
+        assert registration.first_join_at == start
+        assert registration.last_leave_at == start + timezone.timedelta(minutes=55)
+
+    def test_incremental_matches_full_rebuild(self, registration, start):
+        from django.utils import timezone
+
+        for offset in (0, 30, 90):
+            record = self._record(registration, start + timezone.timedelta(minutes=offset))
+            record.participant_left(start + timezone.timedelta(minutes=offset + 25))
+        # Re-closing a record only applies the difference
+        record.participant_left(start + timezone.timedelta(minutes=125))
+
+        registration.refresh_from_db()
+        incremental = (
+            registration.total_attendance_minutes,
+            registration.first_join_at,
+            registration.last_leave_at,
+            registration.attendance_eligible,
+        )
+        registration.update_attendance_summary()
+        registration.refresh_from_db()
+        rebuilt = (
+            registration.total_attendance_minutes,
+            registration.first_join_at,
+            registration.last_leave_at,
+            registration.attendance_eligible,
+        )
+        assert incremental == rebuilt
+        assert registration.total_attendance_minutes == 85
+
+    def test_overlapping_records_count_once(self, registration, start):
+        from django.utils import timezone
+
+        # Two devices: 0-60 and 30-90 cover 90 minutes, not 120
+        first = self._record(registration, start)
+        second = self._record(registration, start + timezone.timedelta(minutes=30))
+        first.participant_left(start + timezone.timedelta(minutes=60))
+        second.registration = registration
+        second.participant_left(start + timezone.timedelta(minutes=90))
+
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 90
+        registration.update_attendance_summary()
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 90
+
+    def test_multi_session_counts_every_session(self, registration, start):
+        from django.utils import timezone
+
+        from factories import EventSessionFactory
+        from integrations.services import attendance_matcher
+
+        event = registration.event
+        event.is_multi_session = True
+        event.duration_minutes = 60
+        event.save(update_fields=['is_multi_session', 'duration_minutes'])
+        second_day = start + timezone.timedelta(days=1)
+        EventSessionFactory(event=event, starts_at=start, duration_minutes=60)
+        EventSessionFactory(event=event, starts_at=second_day, duration_minutes=60)
+
+        # All of the second session, outside the event's own (first session) window
+        self._record(registration, second_day).participant_left(second_day + timezone.timedelta(minutes=60))
+        registration.refresh_from_db()
+        assert (registration.total_attendance_minutes, registration.attended) == (60, True)
+
+        registration.update_attendance_summary()
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 60
+
+        attendance_matcher.match_attendance(event, registrations=type(registration).objects.filter(pk=registration.pk))
+        registration.refresh_from_db()
+        assert (registration.total_attendance_minutes, registration.attended) == (60, True)
+
+    def test_override_is_preserved(self, registration, start):
+        from django.utils import timezone
+
+        registration.attendance_override = True
+        registration.attendance_eligible = False
+        registration.save(update_fields=['attendance_override', 'attendance_eligible', 'updated_at'])
+
+        self._record(registration, start).participant_left(start + timezone.timedelta(hours=2))
+
+        registration.refresh_from_db()
+        assert registration.total_attendance_minutes == 120
+        assert registration.attendance_eligible is False
+
+
+# =============================================================================
+# Event Counter Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestEventCounters:
+    """Tests for delta-maintained event registration counters."""
+
+    def test_unrelated_save_leaves_counters_alone(self, published_event, django_assert_num_queries):
+        """Saving fields no counter depends on is a single UPDATE."""
+        from factories import RegistrationFactory
+
+        registration = RegistrationFactory(event=published_event, waitlisted=True)
+        registration.zoom_registrant_join_url = 'https://zoom.us/w/123'
+        with django_assert_num_queries(1):
+            registration.save(update_fields=['zoom_registrant_join_url', 'updated_at'])
+
+    def test_transitions_apply_deltas(self, published_event, django_capture_on_commit_callbacks):
+        from factories import RegistrationFactory
+
+        with django_capture_on_commit_callbacks(execute=True):
+            confirmed = RegistrationFactory(event=published_event)
+            waitlisted = RegistrationFactory(event=published_event, waitlisted=True)
+        published_event.refresh_from_db()
+        assert (published_event.registration_count, published_event.waitlist_count) == (1, 1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            waitlisted.promote_from_waitlist()
+            confirmed.attended = True
+            confirmed.save(update_fields=['attended', 'updated_at'])
+            confirmed.soft_delete()
+        published_event.refresh_from_db()
+        assert published_event.registration_count == 1
+        assert published_event.waitlist_count == 0
+        assert published_event.attendance_count == 0
+
+    def test_deltas_coalesce_into_one_update_per_event(
+        self, published_event, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        from common.counters import counter_deltas
+        from events.models import Event
+
+        with (
+            django_assert_num_queries(1),
+            counter_deltas.coalesce(),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            for _ in range(3):
+                counter_deltas.add(Event, published_event.pk, registration_count=1)
+        published_event.refresh_from_db()
+        assert published_event.registration_count == 3
+
+    def test_recount_repairs_drift(self, registration, published_event):
+        from events.models import Event
+        from events.tasks import recount_event_counters
+
+        Event.objects.filter(pk=published_event.pk).update(registration_count=99, waitlist_count=4)
+
+        recount_event_counters()
+
+        published_event.refresh_from_db()
+        assert (published_event.registration_count, published_event.waitlist_count) == (1, 0)
+
+
+# =============================================================================
+# Seat Admission Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestSeatAdmission:
+    """Tests for atomic seat admission, payment holds and waitlist spillover."""
+
+    @pytest.fixture
+    def capped_event(self, organizer):
+        from factories import EventFactory
+
+        return EventFactory(owner=organizer, status='published', max_attendees=2, waitlist_enabled=True)
+
+    def test_stale_event_cannot_oversell(self, capped_event):
+        """Admission is decided by the database counter, not the caller's copy of the event."""
+        from registrations.models import Registration
+        from registrations.services import registration_service
+
+        stale = capped_event
+        with patch('registrations.tasks.add_zoom_registrant.delay'):
+            statuses = [
+                registration_service.register_participant(stale, {'email': f'seat{i}@example.com', 'full_name': 'Seat'})[
+                    'status'
+                ]
+                for i in range(4)
+            ]
+
+        assert statuses == ['confirmed', 'confirmed', 'waitlisted', 'waitlisted']
+        assert stale.seats_taken == 0
+        capped_event.refresh_from_db()
+        assert capped_event.seats_taken == 2
+        assert Registration.objects.filter(event=capped_event, status=Registration.Status.CONFIRMED).count() == 2
+
+    def test_stale_instances_admit_by_database_counter(self, capped_event):
+        """Each acquire re-checks seats_taken and max_attendees in its UPDATE, whatever the caller's copy says."""
+        from events.models import Event
+        from registrations.admission import seat_admission_service
+
+        copies = [Event.objects.get(pk=capped_event.pk) for _ in range(4)]
+        assert [seat_admission_service.acquire(copy) for copy in copies] == [True, True, False, False]
+        assert all(copy.seats_taken == 0 for copy in copies)
+
+        # A released seat goes to the next caller, even one whose copy predates the release
+        seat_admission_service.release(capped_event.pk)
+        assert seat_admission_service.acquire(copies[3]) is True
+        assert seat_admission_service.acquire(copies[2]) is False
+
+        # Capacity lowered after the copies were loaded: the UPDATE compares against the stored max_attendees
+        Event.objects.filter(pk=capped_event.pk).update(max_attendees=1, seats_taken=0)
+        assert [seat_admission_service.acquire(copy) for copy in copies] == [True, False, False, False]
+
+        capped_event.refresh_from_db()
+        assert capped_event.seats_taken == 1
+
+    def test_cancel_frees_seat(self, organizer):
+        """A cancelled registration gives its seat back, and each seat is counted once."""
+        from factories import EventFactory
+        from registrations.services import registration_service
+
+        event = EventFactory(owner=organizer, status='published', max_attendees=1, waitlist_enabled=True)
+        with patch('registrations.tasks.add_zoom_registrant.delay'):
+            first = registration_service.register_participant(event, {'email': 'a@example.com', 'full_name': 'A'})
+            event.refresh_from_db()
+            assert event.seats_taken == 1
+
+            first['registration'].cancel()
+            event.refresh_from_db()
+            assert event.seats_taken == 0
+
+            second = registration_service.register_participant(event, {'email': 'b@example.com', 'full_name': 'B'})
+
+        assert second['status'] == 'confirmed'
+        event.refresh_from_db()
+        assert event.seats_taken == 1
+
+    def test_expired_hold_releases_seat_to_waitlist(self, organizer):
+        from django.utils import timezone
+
+        from factories import EventFactory, RegistrationFactory
+        from registrations.models import Registration
+        from registrations.tasks import release_expired_seat_holds
+
+        event = EventFactory(
+            owner=organizer,
+            status='published',
+            price=Decimal('40.00'),
+            max_attendees=1,
+            waitlist_enabled=True,
+            waitlist_auto_promote=True,
+        )
+        held = RegistrationFactory(
+            event=event,
+            status=Registration.Status.PENDING,
+            payment_status=Registration.PaymentStatus.PENDING,
+            seat_hold_expires_at=timezone.now() - timezone.timedelta(minutes=1),
+        )
+        waiting = RegistrationFactory(event=event, waitlisted=True, waitlist_position=1)
+
+        assert release_expired_seat_holds() == 1
+
+        held.refresh_from_db()
+        waiting.refresh_from_db()
+        event.refresh_from_db()
+        assert held.hold_lapsed
+        assert waiting.status == Registration.Status.PENDING
+        assert waiting.seat_hold_expires_at > timezone.now()
+        assert event.seats_taken == 1
+
+    @pytest.mark.postgres
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_registrations_never_oversell(self, capped_event):
+        """Hundreds of simultaneous registrations fill exactly max_attendees and spill the rest to the waitlist."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from django.db import connections
+
+        from events.models import Event
+        from registrations.models import Registration
+        from registrations.services import registration_service
+
+        attempts = 400
+        Event.objects.filter(pk=capped_event.pk).update(max_attendees=50)
+
+        def register(i):
+            try:
+                event = Event.objects.get(pk=capped_event.pk)
+                data = {'email': f'load{i}@example.com', 'full_name': f'Load {i}'}
+                return registration_service.register_participant(event, data)['status']
+            finally:
+                connections.close_all()
+
+        with patch('registrations.tasks.add_zoom_registrant.delay'), ThreadPoolExecutor(max_workers=32) as pool:
+            statuses = list(pool.map(register, range(attempts)))
+
+        capped_event.refresh_from_db()
+        assert statuses.count('confirmed') == 50
+        assert statuses.count('waitlisted') == attempts - 50
+        assert capped_event.seats_taken == 50
+        assert Registration.objects.filter(event=capped_event, status=Registration.Status.CONFIRMED).count() == 50
+
+
+# =============================================================================
+# Registration Query Budget Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestRegistrationQueryBudget:
+    """Hard ceilings on the queries one public registration issues, signals included."""
+
+    @pytest.fixture
+    def event(self, published_event):
+        from events.models import Event
+
+        return Event.objects.select_related('owner').get(pk=published_event.pk)
+
+    def test_free_registration(self, event, django_assert_max_num_queries):
+        from registrations.services import registration_service
+
+        data = {'email': 'budget@example.com', 'full_name': 'Budget'}
+        with patch('registrations.tasks.add_zoom_registrant.delay'), django_assert_max_num_queries(6):
+            result = registration_service.register_participant(event, data)
+
+        assert result['status'] == 'confirmed'
+
+    def test_promo_code_registration(self, event, django_assert_max_num_queries):
+        from events.models import Event
+        from promo_codes.models import PromoCode
+        from registrations.services import registration_service
+
+        event.price = Decimal('50.00')
+        Event.objects.filter(pk=event.pk).update(price=event.price)
+        promo_code = PromoCode.objects.create(
+            owner=event.owner,
+            code='ONUS',
+            currency=event.currency,
+            discount_type='percentage',
+            discount_value=Decimal('100.00'),
+            first_time_only=True,
+        )
+        promo_code.events.add(event)
+
+        data = {'email': 'promo-budget@example.com', 'full_name': 'Budget', 'promo_code': 'onus'}
+        with patch('registrations.tasks.add_zoom_registrant.delay'), django_assert_max_num_queries(12):
+            result = registration_service.register_participant(event, data)
+
+        assert result['status'] == 'confirmed'
+        assert result['registration'].promo_code_usages.get().discount_amount == Decimal('50.00')
+
+
+# =============================================================================
+# Attendee Import Tests
+# =============================================================================
+
+
+@pytest.mark.django_db
+class TestRegistrationImport:
+    """Tests for the bulk attendee import."""
+
+    def get_endpoint(self, event):
+        return f'/api/v1/events/{event.uuid}/registrations/import/'
+
+    def test_csv_import_reports_per_row(
+        self, organizer_client, published_event, registration, django_capture_on_commit_callbacks
+    ):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from contacts.models import ContactOutboxEntry
+        from factories import EventCustomFieldFactory
+        from registrations.models import Registration
+
+        diet = EventCustomFieldFactory(event=published_event, label='Dietary Requirements', field_type='text')
+        published_event.refresh_from_db()
+        registration_count, seats_taken = published_event.registration_count, published_event.seats_taken
+        upload = SimpleUploadedFile(
+            'attendees.csv',
+            b'Email,Name,Title,Dietary Requirements\n'
+            b'new1@example.com,New One,Dr,Vegan\n'
+            b'NEW1@example.com,Dup,,\n'
+            b'test@example.com,Already,,\n'
+            b'not-an-email,Bad,,\n'
+            b'nameless@example.com,,,\n',
+            content_type='text/csv',
+        )
+
+        with (
+            patch('contacts.outbox.drain_contact_outbox.delay_for'),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            response = organizer_client.post(self.get_endpoint(published_event), {'file': upload}, format='multipart')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['created'], response.data['skipped'], response.data['failed']) == (1, 2, 2)
+        assert [(row['row'], row['reason']) for row in response.data['skipped_rows']] == [
+            (2, 'Duplicate email in file.'),
+            (3, 'Already registered.'),
+        ]
+        assert [(row['row'], row['errors']) for row in response.data['errors']] == [
+            (4, ['Enter a valid email address.']),
+            (5, ['Name is required.']),
+        ]
+
+        imported = Registration.objects.get(event=published_event, email='new1@example.com')
+        assert (imported.full_name, imported.professional_title, imported.status) == ('New One', 'Dr', 'confirmed')
+        assert imported.source == Registration.Source.MANUAL
+        assert imported.custom_field_responses.get(field=diet).value == 'Vegan'
+        assert ContactOutboxEntry.objects.filter(registration=imported, kind=ContactOutboxEntry.Kind.LINK).exists()
+
+        published_event.refresh_from_db()
+        assert published_event.registration_count == registration_count + 1
+        assert published_event.seats_taken == seats_taken + 1
+
+    def test_json_lines_import_in_chunks(self, organizer, published_event):
+        import json
+
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        from common.config import RegistrationImport
+        from registrations.imports import registration_import_service
+        from registrations.models import Registration
+
+        lines = '\n'.join(json.dumps({'email': f'j{i}@example.com', 'first_name': 'J', 'last_name': str(i)}) for i in range(5))
+        upload = SimpleUploadedFile('attendees.jsonl', lines.encode())
+
+        with patch.object(RegistrationImport, 'CHUNK_SIZE', 2), patch.object(RegistrationImport, 'MAX_ROWS', 4):
+            report = registration_import_service.import_file(published_event, upload, organizer)
+
+        assert report['created'] == 4
+        assert report['truncated'] is True
+        imported = Registration.objects.filter(event=published_event, email__startswith='j').order_by('email')
+        assert [r.full_name for r in imported] == ['J 0', 'J 1', 'J 2', 'J 3']
+
+    def test_rows_registered_during_the_import_are_skipped(self, organizer, published_event):
+        from factories import RegistrationFactory
+        from registrations.imports import registration_import_service
+
+        # Each write attempt races with a registration for one of the chunk's emails
+        write = registration_import_service._write
+        racing = ['race1@example.com', 'race2@example.com']
+
+        def write_after_race(event, to_create):
+            if racing:
+                RegistrationFactory(event=event, email=racing.pop(0), guest=True)
+            write(event, to_create)
+
+        rows = [(i, {'email': f'race{i}@example.com', 'name': f'Race {i}'}) for i in (1, 2, 3)]
+        with patch.object(registration_import_service, '_write', side_effect=write_after_race):
+            report = registration_import_service.import_rows(published_event, rows, organizer)
+
+        assert (report['created'], report['skipped'], report['failed']) == (1, 2, 0)
+        assert [(row['row'], row['reason']) for row in report['skipped_rows']] == [
+            (1, 'Already registered.'),
+            (2, 'Already registered.'),
+        ]
+
+    def test_rejects_unsupported_file(self, organizer_client, published_event):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile('attendees.xlsx', b'not a csv')
+        response = organizer_client.post(self.get_endpoint(published_event), {'file': upload}, format='multipart')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error']['code'] == 'INVALID_FILE_TYPE'
+
+
 # =============================================================================
 # Registration Summary Tests
 # =============================================================================
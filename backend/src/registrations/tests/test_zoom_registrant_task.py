@@ -172,13 +172,13 @@ class TestAddZoomRegistrantTask:
 
         with (
             patch('accounts.services.zoom_service.add_meeting_registrant', return_value=mock_result),
-            patch('registrations.tasks.add_zoom_registrant.delay') as mock_delay,
+            patch('registrations.tasks.add_zoom_registrant.delay_for') as mock_delay_for,
         ):
             result = add_zoom_registrant(registration.id, retry_count=0)
 
-        # Should return False and schedule retry
+        # Should return False and schedule retry after the first backoff step
         assert result is False
-        mock_delay.assert_called_once_with(registration.id, retry_count=1)
+        mock_delay_for.assert_called_once_with(60, registration.id, retry_count=1)
 
         # Registration should have error recorded
         registration.refresh_from_db()
@@ -210,14 +210,14 @@ class TestAddZoomRegistrantTask:
 
         with (
             patch('accounts.services.zoom_service.add_meeting_registrant', return_value=mock_result),
-            patch('registrations.tasks.add_zoom_registrant.delay') as mock_delay,
+            patch('registrations.tasks.add_zoom_registrant.delay_for') as mock_delay_for,
         ):
             # Simulate already at max retries (5)
             result = add_zoom_registrant(registration.id, retry_count=5)
 
         # Should return False and NOT schedule retry
         assert result is False
-        mock_delay.assert_not_called()
+        mock_delay_for.assert_not_called()
 
         # Should have final error message
         registration.refresh_from_db()
@@ -10,6 +10,7 @@ from django_filters import rest_framework as filters
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
@@ -102,7 +103,7 @@ class EventRegistrationViewSet(SoftDeleteModelViewSet):
             full_name = reg_data.get('full_name', reg_data.get('name', ''))
 
             # Check if already registered
-            if Registration.objects.filter(event=event, email__iexact=email).exists():
+            if Registration.objects.filter(event=event, email=email).exists():
                 skipped.append(email)
                 continue
 
@@ -136,6 +137,47 @@ class EventRegistrationViewSet(SoftDeleteModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @swagger_auto_schema(
+        operation_summary="Import attendees",
+        operation_description=(
+            "Import registrations from a .csv, .json or .jsonl file (multipart field `file`). "
+            "Columns: email, full_name (or name, or first_name + last_name), professional_title, "
+            "organization_name, and custom fields by label or UUID. Rows are imported as confirmed; "
+            "already-registered emails are skipped. Returns per-row skips and errors."
+        ),
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_registrations(self, request, event_uuid=None):
+        """Bulk import registrations from a file."""
+        from common.config import UploadLimits
+        from events.models import Event
+
+        from .imports import registration_import_service
+
+        try:
+            event = Event.objects.get(uuid=event_uuid, owner=self.request.user)
+        except Event.DoesNotExist:
+            return error_response('Event not found.', code='NOT_FOUND', status_code=status.HTTP_404_NOT_FOUND)
+
+        file = request.FILES.get('file')
+        if not file:
+            return error_response('No file provided.', code='MISSING_FILE', status_code=status.HTTP_400_BAD_REQUEST)
+
+        if not file.name.lower().endswith(('.csv', '.json', '.jsonl', '.ndjson')):
+            return error_response(
+                'Only .csv, .json and .jsonl files are allowed.',
+                code='INVALID_FILE_TYPE',
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if file.size > UploadLimits.MAX_DOCUMENT_SIZE_BYTES:
+            return error_response(
+                'File too large. Maximum size is 10MB.', code='FILE_TOO_LARGE', status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        report = registration_import_service.import_file(event, file, request.user)
+        return Response(report, status=status.HTTP_201_CREATED)
+
     def partial_update(self, request, *args, **kwargs):
         """Update attendance for single registration."""
         instance = self.get_object()
@@ -351,7 +393,7 @@ class EventRegistrationViewSet(SoftDeleteModelViewSet):
                 target_list = ContactList.objects.create(owner=organizer, name="Default", is_default=True)
 
         # Check if contact already exists
-        existing = Contact.objects.filter(contact_list__owner=organizer, email__iexact=registration.email).first()
+        existing = Contact.objects.filter(contact_list__owner=organizer, email=registration.email).first()
 
         if existing:
             return Response(
@@ -503,7 +545,9 @@ class PublicRegistrationView(generics.CreateAPIView):
         logger = logging.getLogger(__name__)
 
         try:
-            event = Event.objects.get(uuid=event_uuid, status='published', registration_enabled=True, deleted_at__isnull=True)
+            event = Event.objects.select_related('owner').get(
+                uuid=event_uuid, status='published', registration_enabled=True, deleted_at__isnull=True
+            )
         except Event.DoesNotExist:
             return error_response(
                 'Event not found or registration closed.', code='NOT_FOUND', status_code=status.HTTP_404_NOT_FOUND
@@ -539,6 +583,7 @@ class PublicRegistrationView(generics.CreateAPIView):
                 'currency': event.currency,  # Use event's currency setting
                 'stripe_account_id': stripe_account_id,
                 'waitlist_position': getattr(reg, 'waitlist_position', None),
+                'seat_hold_expires_at': reg.seat_hold_expires_at,
                 'message': result.get('message', 'Registration successful.'),
             }
             return Response(response_data, status=status.HTTP_201_CREATED)